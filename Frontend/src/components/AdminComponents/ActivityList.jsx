@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   DataTable,
@@ -18,35 +18,24 @@ import {
 } from '@carbon/react';
 import { Add, Edit, TrashCan } from '@carbon/icons-react';
 import activityService from '../../services/activityService';
+import { useCursorPages } from '../../hooks/useCursorPages';
+import { CursorPager } from './CursorPager';
+
+const fetchActivitiesPage = (cursor) =>
+  activityService.getActivitiesPage('activity_name,category,description,duration_weeks,effort_hours', cursor);
 
 export function ActivityList() {
   const navigate = useNavigate();
-  const [activities, setActivities] = useState([]);
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
-
-  useEffect(() => {
-    fetchActivities();
-  }, []);
-
-  const fetchActivities = async () => {
-    try {
-      setLoading(true);
-      const data = await activityService.getAllActivities();
-      setActivities(data);
-    } catch (err) {
-      setError('Failed to load activities');
-    } finally {
-      setLoading(false);
-    }
-  };
+  const pages = useCursorPages(fetchActivitiesPage, () => setError('Failed to load activities'));
+  const { items: activities, loading } = pages;
 
   const handleDelete = async (activityId) => {
     if (window.confirm('Are you sure you want to delete this activity? This will remove it from all offerings.')) {
       try {
         await activityService.deleteActivity(activityId);
-        fetchActivities();
+        pages.reload();
       } catch (err) {
         setError('Failed to delete activity');
       }
@@ -114,7 +103,7 @@ export function ActivityList() {
               <TableToolbarContent>
                 <TableToolbarSearch 
                   persistent 
-                  placeholder="Search activities..." 
+                  placeholder="Search activities on this page..." 
                   onChange={(e) => setSearchQuery(e.target.value)}
                   value={searchQuery}
                 />
@@ -188,6 +177,8 @@ export function ActivityList() {
           </>
         )}
       </DataTable>
+
+      <CursorPager pages={pages} />
     </div>
   );
 }
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   DataTable,
@@ -18,35 +18,23 @@ import {
 } from '@carbon/react';
 import { Add, Edit, TrashCan } from '@carbon/icons-react';
 import offeringService from '../../services/offeringService';
+import { useCursorPages } from '../../hooks/useCursorPages';
+import { CursorPager } from './CursorPager';
+
+const fetchBrandsPage = (cursor) => offeringService.getBrandsPage(cursor);
 
 export function BrandList() {
   const navigate = useNavigate();
-  const [brands, setBrands] = useState([]);
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
-
-  useEffect(() => {
-    fetchBrands();
-  }, []);
-
-  const fetchBrands = async () => {
-    try {
-      setLoading(true);
-      const data = await offeringService.getBrands();
-      setBrands(data);
-    } catch (err) {
-      setError('Failed to load brands');
-    } finally {
-      setLoading(false);
-    }
-  };
+  const pages = useCursorPages(fetchBrandsPage, () => setError('Failed to load brands'));
+  const { items: brands, loading } = pages;
 
   const handleDelete = async (brandId) => {
     if (window.confirm('Are you sure you want to delete this brand?')) {
       try {
         await offeringService.deleteBrand(brandId);
-        fetchBrands();
+        pages.reload();
       } catch (err) {
         setError('Failed to delete brand');
       }
@@ -108,7 +96,7 @@ export function BrandList() {
               <TableToolbarContent>
                 <TableToolbarSearch 
                   persistent 
-                  placeholder="Search brands..." 
+                  placeholder="Search brands on this page..." 
                   onChange={(e) => setSearchQuery(e.target.value)}
                   value={searchQuery}
                 />
@@ -167,6 +155,8 @@ export function BrandList() {
           </>
         )}
       </DataTable>
+
+      <CursorPager pages={pages} />
     </div>
   );
 }
\ No newline at end of file
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   DataTable,
@@ -18,35 +18,23 @@ import {
 } from '@carbon/react';
 import { Add, Edit, TrashCan } from '@carbon/icons-react';
 import countryService from '../../services/countryService';
+import { useCursorPages } from '../../hooks/useCursorPages';
+import { CursorPager } from './CursorPager';
+
+const fetchCountriesPage = (cursor) => countryService.getCountriesPage(cursor);
 
 export function CountryList() {
   const navigate = useNavigate();
-  const [countries, setCountries] = useState([]);
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
-
-  useEffect(() => {
-    fetchCountries();
-  }, []);
-
-  const fetchCountries = async () => {
-    try {
-      setLoading(true);
-      const data = await countryService.getCountries();
-      setCountries(data);
-    } catch (err) {
-      setError('Failed to load countries');
-    } finally {
-      setLoading(false);
-    }
-  };
+  const pages = useCursorPages(fetchCountriesPage, () => setError('Failed to load countries'));
+  const { items: countries, loading } = pages;
 
   const handleDelete = async (countryId) => {
     if (window.confirm('Are you sure you want to delete this country?')) {
       try {
         await countryService.deleteCountry(countryId);
-        fetchCountries();
+        pages.reload();
       } catch (err) {
         setError('Failed to delete country');
       }
@@ -105,7 +93,7 @@ export function CountryList() {
               <TableToolbarContent>
                 <TableToolbarSearch 
                   persistent 
-                  placeholder="Search countries..." 
+                  placeholder="Search countries on this page..." 
                   onChange={(e) => setSearchQuery(e.target.value)}
                   value={searchQuery}
                 />
@@ -164,6 +152,8 @@ export function CountryList() {
           </>
         )}
       </DataTable>
+
+      <CursorPager pages={pages} />
     </div>
   );
 }
\ No newline at end of file
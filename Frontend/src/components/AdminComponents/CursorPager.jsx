@@ -0,0 +1,33 @@
+import { Button } from '@carbon/react';
+import { ChevronLeft, ChevronRight } from '@carbon/icons-react';
+
+// Previous / Next controls for a list shown with useCursorPages
+export function CursorPager({ pages }) {
+  if (!pages.hasPrevious && !pages.hasNext) {
+    return null;
+  }
+
+  return (
+    <div style={{ display: 'flex', justifyContent: 'flex-end', alignItems: 'center', gap: '0.5rem', marginTop: '1rem' }}>
+      <span style={{ color: '#525252', marginRight: '0.5rem' }}>Page {pages.page + 1}</span>
+      <Button
+        kind="ghost"
+        size="sm"
+        renderIcon={ChevronLeft}
+        disabled={!pages.hasPrevious || pages.loading}
+        onClick={pages.previousPage}
+      >
+        Previous
+      </Button>
+      <Button
+        kind="ghost"
+        size="sm"
+        renderIcon={ChevronRight}
+        disabled={!pages.hasNext || pages.loading}
+        onClick={pages.nextPage}
+      >
+        Next
+      </Button>
+    </div>
+  );
+}
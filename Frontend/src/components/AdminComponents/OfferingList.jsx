@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   DataTable,
@@ -19,35 +19,23 @@ import {
 } from '@carbon/react';
 import { Add, Edit, TrashCan, View } from '@carbon/icons-react';
 import offeringService from '../../services/offeringService';
+import { useCursorPages } from '../../hooks/useCursorPages';
+import { CursorPager } from './CursorPager';
+
+const fetchOfferingsPage = (cursor) => offeringService.searchOfferingsPage({ fields: 'summary' }, cursor);
 
 export function OfferingsList() {
   const navigate = useNavigate();
-  const [offerings, setOfferings] = useState([]);
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
-
-  useEffect(() => {
-    fetchOfferings();
-  }, []);
-
-  const fetchOfferings = async () => {
-    try {
-      setLoading(true);
-      const data = await offeringService.searchOfferings({});
-      setOfferings(data);
-    } catch (err) {
-      setError('Failed to load offerings');
-    } finally {
-      setLoading(false);
-    }
-  };
+  const pages = useCursorPages(fetchOfferingsPage, () => setError('Failed to load offerings'));
+  const { items: offerings, loading } = pages;
 
   const handleDelete = async (offeringId) => {
     if (window.confirm('Are you sure you want to delete this offering?')) {
       try {
         await offeringService.deleteOffering(offeringId);
-        fetchOfferings();
+        pages.reload();
       } catch (err) {
         setError('Failed to delete offering');
       }
@@ -117,7 +105,7 @@ export function OfferingsList() {
               <TableToolbarContent>
                 <TableToolbarSearch 
                   persistent 
-                  placeholder="Search offerings..." 
+                  placeholder="Search offerings on this page..." 
                   onChange={(e) => setSearchQuery(e.target.value)}
                   value={searchQuery}
                 />
@@ -191,6 +179,8 @@ export function OfferingsList() {
           </>
         )}
       </DataTable>
+
+      <CursorPager pages={pages} />
     </div>
   );
 }
\ No newline at end of file
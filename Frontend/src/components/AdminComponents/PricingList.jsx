@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   DataTable,
@@ -17,67 +17,25 @@ import {
 } from '@carbon/react';
 import { Add, Edit, TrashCan } from '@carbon/icons-react';
 import pricingService from '../../services/pricingService';
-import staffingService from '../../services/staffingService';
+import { useCursorPages } from '../../hooks/useCursorPages';
+import { CursorPager } from './CursorPager';
+
+// Pricing rows come with their staffing role, band and country
+const fetchPricingPage = (cursor) => pricingService.getPricingPage(cursor);
 
 export function PricingList() {
   const navigate = useNavigate();
 
-  const [pricingList, setPricingList] = useState([]);
-  const [staffingMap, setStaffingMap] = useState({}); // Map staffing_id -> staffing details
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
-
-  useEffect(() => {
-    fetchData();
-  }, []);
-
-  const fetchData = async () => {
-    try {
-      setLoading(true);
-      
-      // Fetch both pricing and staffing data
-      const [pricingData, staffingData] = await Promise.all([
-        pricingService.getAllPricing(),
-        staffingService.getAllStaffing()
-      ]);
-
-      console.log("Pricing data:", pricingData);
-      console.log("Staffing data:", staffingData);
-
-      // Create a map of staffing_id -> staffing details
-      const staffingLookup = {};
-      staffingData.forEach(staffing => {
-        staffingLookup[staffing.staffing_id] = staffing;
-      });
-      setStaffingMap(staffingLookup);
-
-      // Merge pricing with staffing details
-      const enrichedPricing = pricingData.map(pricing => {
-        const staffing = staffingLookup[pricing.staffing_id];
-        return {
-          ...pricing,
-          role: staffing?.role || 'Unknown',
-          band: staffing?.band || '-',
-          country: staffing?.country || 'Unknown'
-        };
-      });
-
-      // console.log("Enriched pricing:", enrichedPricing);
-      setPricingList(enrichedPricing);
-    } catch (err) {
-      console.error("Error fetching data:", err);
-      setError('Failed to load pricing');
-    } finally {
-      setLoading(false);
-    }
-  };
+  const pages = useCursorPages(fetchPricingPage, () => setError('Failed to load pricing'));
+  const { items: pricingList, loading } = pages;
 
   const handleDelete = async (pricingId) => {
     if (window.confirm('Are you sure you want to delete this pricing detail?')) {
       try {
         await pricingService.deletePricing(pricingId);
-        fetchData();
+        pages.reload();
       } catch (err) {
         setError('Failed to delete pricing');
       }
@@ -121,7 +79,7 @@ export function PricingList() {
       <div style={{ marginBottom: '2rem' }}>
         <h2 style={{ fontSize: '1.5rem', fontWeight: 600 }}>Pricing Management</h2>
         <p style={{ color: '#525252', marginTop: '0.5rem' }}>
-          Manage pricing for staffing roles ({pricingList.length} total)
+          Manage pricing for staffing roles
         </p>
       </div>
 
@@ -141,7 +99,7 @@ export function PricingList() {
             <TableToolbar>
               <TableToolbarContent>
                 <TableToolbarSearch
-                  placeholder="Search pricing..."
+                  placeholder="Search pricing on this page..."
                   onChange={(e) => setSearchQuery(e.target.value)}
                 />
                 <Button
@@ -211,6 +169,8 @@ export function PricingList() {
           </>
         )}
       </DataTable>
+
+      <CursorPager pages={pages} />
     </div>
   );
 }
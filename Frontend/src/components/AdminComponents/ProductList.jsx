@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   DataTable,
@@ -19,29 +19,30 @@ import {
 import { Add, Edit, TrashCan } from '@carbon/icons-react';
 import offeringService from '../../services/offeringService';
 import productService from '../../services/productService';
+import { useCursorPages } from '../../hooks/useCursorPages';
+import { CursorPager } from './CursorPager';
 
 export function ProductList() {
   const navigate = useNavigate();
-  const [products, setProducts] = useState([]);
   const [brands, setBrands] = useState([]);
   const [selectedBrand, setSelectedBrand] = useState(null);
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
 
+  // One brand's products come in a single response; all products one page at a time
+  const fetchProductsPage = useCallback(
+    (cursor) => (selectedBrand
+      ? productService.getProductsByBrand(selectedBrand).then((items) => ({ items, nextCursor: null }))
+      : productService.getProductsPage(cursor)),
+    [selectedBrand]
+  );
+  const pages = useCursorPages(fetchProductsPage, () => setError('Failed to load products'));
+  const { items: products, loading } = pages;
+
   useEffect(() => {
     fetchBrands();
-    fetchAllProducts();
   }, []);
 
-  useEffect(() => {
-    if (selectedBrand) {
-      fetchProducts();
-    } else {
-      fetchAllProducts();
-    }
-  }, [selectedBrand]);
-
   const fetchBrands = async () => {
     try {
       const data = await offeringService.getBrands();
@@ -51,39 +52,11 @@ export function ProductList() {
     }
   };
 
-  const fetchAllProducts = async () => {
-    try {
-      setLoading(true);
-      const data = await productService.getAllProducts();
-      setProducts(data);
-    } catch (err) {
-      setError('Failed to load products');
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  const fetchProducts = async () => {
-    try {
-      setLoading(true);
-      const data = await productService.getProductsByBrand(selectedBrand);
-      setProducts(data);
-    } catch (err) {
-      setError('Failed to load products');
-    } finally {
-      setLoading(false);
-    }
-  };
-
   const handleDelete = async (productId) => {
     if (window.confirm('Are you sure you want to delete this product?')) {
       try {
         await productService.deleteProduct(productId);
-        if (selectedBrand) {
-          fetchProducts();
-        } else {
-          fetchAllProducts();
-        }
+        pages.reload();
       } catch (err) {
         setError('Failed to delete product');
       }
@@ -188,7 +161,7 @@ export function ProductList() {
               <TableToolbarContent>
                 <TableToolbarSearch
                   persistent
-                  placeholder="Search products..."
+                  placeholder="Search products on this page..."
                   onChange={(e) => setSearchQuery(e.target.value)}
                   value={searchQuery}
                 />
@@ -252,6 +225,8 @@ export function ProductList() {
           </>
         )}
       </DataTable>
+
+      <CursorPager pages={pages} />
     </div>
   );
 }
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   DataTable,
@@ -17,36 +17,24 @@ import {
 } from '@carbon/react';
 import { Add, Edit, TrashCan } from '@carbon/icons-react';
 import staffingService from '../../services/staffingService';
+import { useCursorPages } from '../../hooks/useCursorPages';
+import { CursorPager } from './CursorPager';
+
+const fetchStaffingPage = (cursor) => staffingService.getStaffingPage(cursor);
 
 export function StaffingList() {
   const navigate = useNavigate();
 
-  const [staffingList, setStaffingList] = useState([]);
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
-
-  useEffect(() => {
-    fetchAllStaffing();
-  }, []);
-
-  const fetchAllStaffing = async () => {
-    try {
-      setLoading(true);
-      const data = await staffingService.getAllStaffing();
-      setStaffingList(data);
-    } catch (err) {
-      setError('Failed to load staffing');
-    } finally {
-      setLoading(false);
-    }
-  };
+  const pages = useCursorPages(fetchStaffingPage, () => setError('Failed to load staffing'));
+  const { items: staffingList, loading } = pages;
 
   const handleDelete = async (staffingId) => {
     if (window.confirm('Are you sure you want to delete this staffing role?')) {
       try {
         await staffingService.deleteStaffing(staffingId);
-        fetchAllStaffing();
+        pages.reload();
       } catch (err) {
         setError('Failed to delete staffing');
       }
@@ -106,7 +94,7 @@ export function StaffingList() {
             <TableToolbar>
               <TableToolbarContent>
                 <TableToolbarSearch
-                  placeholder="Search staffing..."
+                  placeholder="Search staffing on this page..."
                   onChange={(e) => setSearchQuery(e.target.value)}
                 />
                 <Button renderIcon={Add} onClick={() => navigate('/admin/staffing/create')}>
@@ -161,6 +149,8 @@ export function StaffingList() {
           </>
         )}
       </DataTable>
+
+      <CursorPager pages={pages} />
     </div>
   );
 }
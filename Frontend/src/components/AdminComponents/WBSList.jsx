@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   DataTable,
@@ -18,35 +18,23 @@ import {
 } from '@carbon/react';
 import { Add, Edit, TrashCan, User } from '@carbon/icons-react';
 import wbsService from '../../services/wbsService';
+import { useCursorPages } from '../../hooks/useCursorPages';
+import { CursorPager } from './CursorPager';
+
+const fetchWBSPage = (cursor) => wbsService.getWBSPage(cursor);
 
 export function WBSList() {
   const navigate = useNavigate();
-  const [wbsList, setWbsList] = useState([]);
-  const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
-
-  useEffect(() => {
-    fetchWBS();
-  }, []);
-
-  const fetchWBS = async () => {
-    try {
-      setLoading(true);
-      const data = await wbsService.getAllWBS();
-      setWbsList(data);
-    } catch (err) {
-      setError('Failed to load WBS');
-    } finally {
-      setLoading(false);
-    }
-  };
+  const pages = useCursorPages(fetchWBSPage, () => setError('Failed to load WBS'));
+  const { items: wbsList, loading } = pages;
 
   const handleDelete = async (wbsId) => {
     if (window.confirm('Are you sure you want to delete this WBS?')) {
       try {
         await wbsService.deleteWBS(wbsId);
-        fetchWBS();
+        pages.reload();
       } catch (err) {
         setError('Failed to delete WBS');
       }
@@ -108,7 +96,7 @@ export function WBSList() {
               <TableToolbarContent>
                 <TableToolbarSearch 
                   persistent 
-                  placeholder="Search WBS..." 
+                  placeholder="Search WBS on this page..." 
                   onChange={(e) => setSearchQuery(e.target.value)}
                   value={searchQuery}
                 />
@@ -175,6 +163,8 @@ export function WBSList() {
           </>
         )}
       </DataTable>
+
+      <CursorPager pages={pages} />
     </div>
   );
 }
\ No newline at end of file
@@ -81,6 +81,7 @@ export function SolutionBuilder() {
   const [offerings, setOfferings] = useState([]);
   const [availableActivities, setAvailableActivities] = useState([]);
   const [pricingData, setPricingData] = useState([]);
+  const [solutionPrice, setSolutionPrice] = useState(null);
 
   // Loading states
   const [loadingCountries, setLoadingCountries] = useState(true);
@@ -165,6 +166,23 @@ export function SolutionBuilder() {
     }
   }, [selectedOffering]);
 
+  // Price the selection server-side whenever it changes
+  useEffect(() => {
+    if (selectedActivities.length === 0) {
+      setSolutionPrice(null);
+      return;
+    }
+    let cancelled = false;
+    pricingService.priceSolution(selectedActivities.map(getOriginalActivityId))
+      .then(price => {
+        if (!cancelled) setSolutionPrice(price);
+      })
+      .catch(err => console.error('Error pricing solution:', err));
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedActivities]);
+
   const fetchCountries = async () => {
     try {
       setLoadingCountries(true);
@@ -224,7 +242,7 @@ export function SolutionBuilder() {
     try {
       setLoadingOfferings(true);
       setError(null);
-      const data = await offeringService.getOfferings(productId);
+      const data = await offeringService.getOfferings(productId, 'summary');
       const formattedOfferings = data.map(o => ({
         id: o.offering_id,
         name: o.offering_name,
@@ -482,38 +500,20 @@ const cancelRemoveActivity = () => {
     text += '='.repeat(80) + '\n\n';
     text += 'BUDGET AND PLANNING ESTIMATED CHARGES:\n\n';
 
-    const combinedStaffing = {};
-    
-    selectedActivities.forEach(activity => {
-      if (activity.staffing) {
-        activity.staffing.forEach(staff => {
-          const key = `${staff.role} B${staff.band} (${staff.country})`;
-          if (!combinedStaffing[key]) {
-            combinedStaffing[key] = {
-              role: staff.role,
-              band: staff.band,
-              country: staff.country,
-              hours: 0,
-              rate: 200
-            };
-          }
-          combinedStaffing[key].hours += staff.hours;
-        });
-      }
-    });
+    // Combined per-role hours and rates from POST /solutions/price
+    const combinedStaffing = solutionPrice ? solutionPrice.breakdown : [];
 
-    let grandTotal = 0;
-    Object.values(combinedStaffing).forEach(staff => {
-      const total = staff.hours * staff.rate;
-      grandTotal += total;
+    combinedStaffing.forEach(staff => {
+      const rate = staff.sale_price_per_hour;
+      const total = staff.total_sale_price;
       text += `Resource: ${staff.role} B${staff.band} (${staff.country})\n`;
       text += `  Estimated Hours: ${staff.hours}\n`;
-      text += `  Rate/Hour: $${staff.rate}\n`;
-      text += `  Total: ${staff.hours} x $${staff.rate} = $${total.toLocaleString()}\n\n`;
+      text += `  Rate/Hour: $${rate}\n`;
+      text += `  Total: ${staff.hours} x $${rate} = $${total.toLocaleString()}\n\n`;
     });
 
     text += '-'.repeat(80) + '\n';
-    text += `TOTAL CHARGES: $${grandTotal.toLocaleString()}\n`;
+    text += `TOTAL CHARGES: $${(solutionPrice ? solutionPrice.total_sale_price : 0).toLocaleString()}\n`;
     text += '='.repeat(80) + '\n';
 
     return text;
@@ -603,7 +603,17 @@ const cancelRemoveActivity = () => {
     { weeks: 0, hours: 0, cost: 0 }
   );
 
-  const salesPrice = totals.cost;
+  // Sale price of the selected activity at index, from POST /solutions/price once it answers for this selection
+  const selectedActivityCost = (activity, index) => {
+    const priced = solutionPrice?.activities[index];
+    return priced && priced.activity_id === getOriginalActivityId(activity) ? priced.total_sale_price : activity.cost;
+  };
+
+  // Server-side prices once the selection is priced; the client estimate until then
+  if (solutionPrice) {
+    totals.cost = solutionPrice.total_cost;
+  }
+  const salesPrice = solutionPrice ? solutionPrice.total_sale_price : totals.cost;
 
   const selectedCountryName = countries.find(c => c.id === selectedCountry)?.name || '';
   const selectedBrandName = brands.find(b => b.id === selectedBrand)?.name || '';
@@ -1229,7 +1239,7 @@ const cancelRemoveActivity = () => {
                               <div style={{ textAlign: 'center' }}>
                                 <div style={{ display: 'flex', flexDirection: 'column', alignItems: 'center' }}>
                                   <Currency size={16} style={{ color: '#525252', marginBottom: '0.25rem' }} />
-                                  <span style={{ fontSize: '0.875rem', fontWeight: 600 }}>${activity.cost.toLocaleString()}</span>
+                                  <span style={{ fontSize: '0.875rem', fontWeight: 600 }}>${selectedActivityCost(activity, index).toLocaleString()}</span>
                                 </div>
                               </div>
 
@@ -1,3 +1,4 @@
 export { useOfferings } from './useOfferings';
 export { useOfferingDetail } from './useOfferingDetail';
-export { useBrandsAndProducts } from './useBrandsAndProducts';
\ No newline at end of file
+export { useBrandsAndProducts } from './useBrandsAndProducts';
+export { useCursorPages } from './useCursorPages';
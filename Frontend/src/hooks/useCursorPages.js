@@ -0,0 +1,47 @@
+import { useState, useEffect, useCallback, useRef } from 'react';
+
+// Shows a cursor-paginated list one page at a time, fetching a page only when asked for.
+// fetchPage(cursor) resolves to { items, nextCursor } (see services/api getPage) and must
+// keep its identity between renders; a new fetchPage starts again from the first page.
+export const useCursorPages = (fetchPage, onError) => {
+  const [items, setItems] = useState([]);
+  const [loading, setLoading] = useState(true);
+  const [page, setPage] = useState(0);
+  // Cursor of every page up to the current one, then the next page's if there is one
+  const [cursors, setCursors] = useState([null]);
+  const onErrorRef = useRef(onError);
+  onErrorRef.current = onError;
+
+  const load = useCallback(async (index, cursor) => {
+    try {
+      setLoading(true);
+      const data = await fetchPage(cursor);
+      setItems(data.items);
+      setPage(index);
+      setCursors((previous) => {
+        const visited = [...previous.slice(0, index), cursor];
+        return data.nextCursor ? [...visited, data.nextCursor] : visited;
+      });
+    } catch (err) {
+      console.error('Error fetching page:', err);
+      onErrorRef.current?.(err);
+    } finally {
+      setLoading(false);
+    }
+  }, [fetchPage]);
+
+  useEffect(() => {
+    load(0, null);
+  }, [load]);
+
+  return {
+    items,
+    loading,
+    page,
+    hasPrevious: page > 0,
+    hasNext: cursors.length > page + 1,
+    previousPage: () => load(page - 1, cursors[page - 1]),
+    nextPage: () => load(page + 1, cursors[page + 1]),
+    reload: () => load(page, cursors[page])
+  };
+};
@@ -1,9 +1,13 @@
-import api from './api';
+import api, { getAllPages, getPage } from './api';
 
 class ActivityService {
-  async getAllActivities(skip = 0, limit = 100) {
-    const response = await api.get(`/library?skip=${skip}&limit=${limit}`);
-    return response.data;
+  // fields: 'summary' or a comma-separated column list for a sparse list; omit for full activities
+  async getAllActivities(fields) {
+    return getAllPages('/library', fields ? { fields } : {});
+  }
+
+  async getActivitiesPage(fields, cursor) {
+    return getPage('/library', fields ? { fields } : {}, cursor);
   }
 
   async getActivitiesByOffering(offeringId) {
@@ -21,4 +21,25 @@ api.interceptors.response.use(
   }
 );
 
+// List endpoints return one page at a time; while there are more, the response
+// carries an X-Next-Cursor header to send back as ?cursor= for the next page.
+// Resolves to { items, nextCursor }, nextCursor null on the last page
+export const getPage = async (path, params = {}, cursor = null) => {
+  const response = await api.get(path, { params: cursor ? { ...params, cursor } : params });
+  return { items: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+};
+
+// Every page of a list; only for short reference lists such as dropdown options.
+// Screens listing a table should show one page at a time (see hooks/useCursorPages)
+export const getAllPages = async (path, params = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const page = await getPage(path, params, cursor);
+    items.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+};
+
 export default api;
@@ -1,9 +1,13 @@
-import api from './api';
+import api, { getAllPages, getPage } from './api';
 
 class CountryService {
   async getCountries() {
-    const response = await api.get('/countries');
-    return response.data;
+    return getAllPages('/countries');
+  }
+
+  async getCountriesPage(cursor) {
+    // /countries returns every country unless asked for a page
+    return getPage('/countries', { limit: 100 }, cursor);
   }
 
   async getCountryById(countryId) {
@@ -1,9 +1,12 @@
-import api from './api';
+import api, { getAllPages, getPage } from './api';
 
 class OfferingService {
   async getBrands() {
-    const response = await api.get('/brands');
-    return response.data;
+    return getAllPages('/brands');
+  }
+
+  async getBrandsPage(cursor) {
+    return getPage('/brands', {}, cursor);
   }
 
   async getBrandById(brandId) {
@@ -31,14 +34,18 @@ class OfferingService {
     return response.data;
   }
 
-  async getOfferings(productId) {
-    const response = await api.get(`/offerings?product_id=${productId}`);
+  // fields: 'summary' or a comma-separated column list for a sparse list; omit for full offerings
+  async getOfferings(productId, fields) {
+    const response = await api.get('/offerings', { params: { product_id: productId, fields } });
     return response.data;
   }
 
   async searchOfferings(params) {
-    const response = await api.get('/offerings/search/', { params });
-    return response.data;
+    return getAllPages('/offerings/search/', params);
+  }
+
+  async searchOfferingsPage(params, cursor) {
+    return getPage('/offerings/search/', params, cursor);
   }
 
   async getOfferingById(offeringId) {
@@ -1,4 +1,4 @@
-import api from './api';
+import api, { getPage } from './api';
 
 class PricingService {
   async getPricingDetails(staffingId, country) {
@@ -37,9 +37,9 @@ class PricingService {
     }
   }
 
-  async getAllPricing() {
-    const response = await api.get('/pricing/all');
-    return response.data;
+  // Pricing rows carry their staffing role, band and country
+  async getPricingPage(cursor) {
+    return getPage('/pricing/all', {}, cursor);
   }
 
   async getPricingByCountry(country) {
@@ -52,6 +52,13 @@ class PricingService {
     return response.data;
   }
 
+  async priceSolution(activityIds) {
+    const response = await api.post('/solutions/price', {
+      activities: activityIds.map(activityId => ({ activity_id: activityId }))
+    });
+    return response.data;
+  }
+
   async createPricing(pricingData) {
     const response = await api.post('/pricing', pricingData);
     return response.data;
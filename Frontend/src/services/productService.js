@@ -1,9 +1,12 @@
-import api from './api';
+import api, { getAllPages, getPage } from './api';
 
 class ProductService {
   async getAllProducts() {
-    const response = await api.get(`/products/all`);
-    return response.data;
+    return getAllPages('/products/all');
+  }
+
+  async getProductsPage(cursor) {
+    return getPage('/products/all', {}, cursor);
   }
 
   async getProductsByBrand(brandId) {
@@ -1,9 +1,12 @@
-import api from './api';
+import api, { getAllPages, getPage } from './api';
 
 class StaffingService {
   async getAllStaffing() {
-    const response = await api.get('/staffing/all');
-    return response.data; 
+    return getAllPages('/staffing/all');
+  }
+
+  async getStaffingPage(cursor) {
+    return getPage('/staffing/all', {}, cursor);
   }
 
   async getStaffingByOffering(offeringId) {
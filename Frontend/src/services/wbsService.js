@@ -1,9 +1,12 @@
-import api from './api';
+import api, { getAllPages, getPage } from './api';
 
 class WBSService {
-  async getAllWBS(skip = 0, limit = 100) {
-    const response = await api.get(`/wbs?skip=${skip}&limit=${limit}`);
-    return response.data;
+  async getAllWBS() {
+    return getAllPages('/wbs/');
+  }
+
+  async getWBSPage(cursor) {
+    return getPage('/wbs/', {}, cursor);
   }
 
   async getWBSById(wbsId) {
@@ -43,6 +43,18 @@ if config.config_file_name is not None:
 # The metadata object from your Base (for autogenerate)
 target_metadata = Base.metadata
 
+# Indexes created by migrations but left out of the models, as they need the
+# pg_trgm extension (b7d41c9e2f60). Autogenerate must not drop them.
+MIGRATION_ONLY_INDEXES = {
+    "ix_offerings_offering_name_trgm",
+    "ix_offerings_tag_line_trgm",
+    "ix_offerings_offering_summary_trgm",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "index" and reflected and name in MIGRATION_ONLY_INDEXES)
+
 # --------------------------------------------------------
 # Offline migrations
 # --------------------------------------------------------
@@ -54,6 +66,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -74,6 +87,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
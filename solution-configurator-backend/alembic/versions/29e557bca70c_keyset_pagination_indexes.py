@@ -0,0 +1,42 @@
+"""keyset pagination indexes
+
+Revision ID: 29e557bca70c
+Revises: 654b545b73a3
+Create Date: 2026-10-17 10:00:00.000000
+
+Composite (name, id) indexes matching the sort keys of the paginated list
+endpoints whose names are not unique. Brands, countries and staffing sort
+on keys that already have unique indexes.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '29e557bca70c'
+down_revision: Union[str, Sequence[str], None] = '654b545b73a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_products_product_name_product_id', 'products', ['product_name', 'product_id']),
+    ('ix_offerings_offering_name_offering_id', 'offerings', ['offering_name', 'offering_id']),
+    ('ix_activities_activity_name_activity_id', 'activities', ['activity_name', 'activity_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
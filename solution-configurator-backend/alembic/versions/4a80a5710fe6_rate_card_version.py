@@ -0,0 +1,57 @@
+"""rate card version
+
+Revision ID: 4a80a5710fe6
+Revises: b7d41c9e2f60
+Create Date: 2026-10-17 12:00:00.000000
+
+A one-row rate_card_version table whose version statement-level triggers bump
+on every write to staffing_details or pricing_details. Workers keep the rate
+card in memory (crud.pricing.get_rate_card) and compare this version before
+using it, so a price written through any worker is picked up by every other
+one. The bump is part of the writing transaction and becomes visible when it
+commits; concurrent rate card writes queue on the row until then.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a80a5710fe6'
+down_revision: Union[str, Sequence[str], None] = 'b7d41c9e2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['staffing_details', 'pricing_details']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rate_card_version',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.CheckConstraint('id = 1', name='ck_rate_card_version_one_row'),
+    )
+    op.execute("INSERT INTO rate_card_version (id, version) VALUES (1, 0)")
+    op.execute(
+        "CREATE FUNCTION bump_rate_card_version() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN UPDATE rate_card_version SET version = version + 1 WHERE id = 1; RETURN NULL; END $$"
+    )
+    for table in TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_rate_card_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_rate_card_version()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_rate_card_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_rate_card_version()")
+    op.drop_table('rate_card_version')
@@ -0,0 +1,88 @@
+"""foreign key and filter indexes
+
+Revision ID: 654b545b73a3
+Revises: e0d81c60fb62
+Create Date: 2026-10-17 09:00:00.000000
+
+Indexes every foreign key the catalogue and pricing queries filter or join on.
+They are built with CREATE INDEX CONCURRENTLY, outside the migration
+transaction, so the tables stay writable while the indexes build.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '654b545b73a3'
+down_revision: Union[str, Sequence[str], None] = 'e0d81c60fb62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, options)
+INDEXES = [
+    ('ix_products_brand_id', 'products', ['brand_id'], {}),
+    ('ix_offerings_product_id', 'offerings', ['product_id'], {}),
+    ('ix_activities_brand_id', 'activities', ['brand_id'], {}),
+    ('ix_activities_product_id', 'activities', ['product_id'], {}),
+    ('ix_activities_offering_id', 'activities', ['offering_id'], {}),
+    # Activities of an offering in display order
+    ('ix_offering_activities_offering_id_sequence', 'offering_activities', ['offering_id', 'sequence'], {}),
+    # The primary keys below lead with the other column, so they do not serve these lookups
+    ('ix_offering_activities_activity_id', 'offering_activities', ['activity_id'], {}),
+    ('ix_activity_wbs_wbs_id', 'activity_wbs', ['wbs_id'], {}),
+    ('ix_wbs_staffing_staffing_id', 'wbs_staffing', ['staffing_id'], {}),
+    # staffing_details.activity_id (added by e0d81c60fb62) is left unindexed: the
+    # Staffing model does not map it and no query reads it, so autogenerate
+    # would only drop an index on it again
+    # Pricing is 1:1 with staffing; the included columns let the pricing/staffing
+    # join read prices from the index alone
+    (
+        'uq_pricing_details_staffing_id', 'pricing_details', ['staffing_id'],
+        {'unique': True, 'postgresql_include': ['pricing_id', 'cost', 'sale_price']}
+    ),
+]
+
+
+def _drop_invalid_index(name: str) -> None:
+    """An interrupted concurrent build leaves an INVALID index behind; drop it so the build can be retried"""
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {'name': name}
+    ).scalar()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM (SELECT staffing_id FROM pricing_details "
+        "GROUP BY staffing_id HAVING count(*) > 1) d"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} staffing record(s) have more than one pricing_details row; "
+            "remove the duplicates before creating uq_pricing_details_staffing_id"
+        )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            _drop_invalid_index(name)
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True, **options
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,94 @@
+"""offering search indexes
+
+Revision ID: b7d41c9e2f60
+Revises: 29e557bca70c
+Create Date: 2026-10-17 11:00:00.000000
+
+Full-text and trigram search of offerings. Adds offerings.search_vector, a
+stored generated tsvector over the searchable fields weighted A (name) to D
+(scenario, industry), with a GIN index. Adds pg_trgm GIN indexes on the name,
+tag line and summary for substring and typo-tolerant matching.
+
+Adding the generated column rewrites the offerings table under an exclusive
+lock. The table is one row per catalogue offering, so that takes moments. The
+indexes are then built with CREATE INDEX CONCURRENTLY, outside the migration
+transaction, so the table stays writable while they build.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d41c9e2f60'
+down_revision: Union[str, Sequence[str], None] = '29e557bca70c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match SEARCH_VECTOR in app/models/offering.py
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(offering_name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(tag_line, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(offering_summary, '') || ' ' || coalesce(offering_tags, '')), 'C') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(scenario, '') || ' ' || coalesce(industry, '')), 'D')"
+)
+
+# (name, column, options)
+INDEXES = [
+    ('ix_offerings_search_vector', 'search_vector', {'postgresql_using': 'gin'}),
+    (
+        'ix_offerings_offering_name_trgm', 'offering_name',
+        {'postgresql_using': 'gin', 'postgresql_ops': {'offering_name': 'gin_trgm_ops'}}
+    ),
+    (
+        'ix_offerings_tag_line_trgm', 'tag_line',
+        {'postgresql_using': 'gin', 'postgresql_ops': {'tag_line': 'gin_trgm_ops'}}
+    ),
+    (
+        'ix_offerings_offering_summary_trgm', 'offering_summary',
+        {'postgresql_using': 'gin', 'postgresql_ops': {'offering_summary': 'gin_trgm_ops'}}
+    ),
+]
+
+
+def _drop_invalid_index(name: str) -> None:
+    """An interrupted concurrent build leaves an INVALID index behind; drop it so the build can be retried"""
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {'name': name}
+    ).scalar()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        'offerings',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True)
+    )
+
+    with op.get_context().autocommit_block():
+        for name, column, options in INDEXES:
+            _drop_invalid_index(name)
+            op.create_index(
+                name, 'offerings', [column],
+                postgresql_concurrently=True, if_not_exists=True, **options
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, column, options in reversed(INDEXES):
+            op.drop_index(name, table_name='offerings', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('offerings', 'search_vector')
+    # pg_trgm stays installed: other objects in the database may use it
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from app.api.v1.endpoints import (
     auth,
     countries,
@@ -12,8 +12,9 @@ from app.api.v1.endpoints import (
     admin_stats,
     wbs_staffing
 )
+from app.database import track_endpoint
 
-api_router = APIRouter()
+api_router = APIRouter(dependencies=[Depends(track_endpoint)])
 
 # Auth routes (no prefix, available at /api/v1/login, /api/v1/auth/callback, etc.)
 api_router.include_router(auth.router, tags=["authentication"])
@@ -1,7 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from typing import List, Optional
-from app.database import get_db
+from app.database import DBSession, get_read_session, get_session
 from app.schemas.activity import (
     Activity,
     ActivityCreate,
@@ -13,82 +12,78 @@ from app.schemas.activity import (
 )
 from app.crud import activity as crud_activity
 from app.crud import offering as crud_offering
+from app.models.activity import Activity as ActivityModel
+from app.pagination import PageRequest, page_request, paged
+from app.fieldsets import field_selection, sparse
 from app.auth.dependencies import get_current_active_user
 from app.auth.permissions import require_admin, require_solution_architect
 
 router = APIRouter()
 
+activity_fields = field_selection(ActivityModel, Activity, crud_activity.ACTIVITY_FIELDSETS, ["activity_id"])
+
 # ==================== Activity Library Management ====================
 # READ operations - Available to all authenticated users (catalog access)
 
 @router.get("/library", response_model=List[Activity])
 async def get_activity_library(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="OFFSET paging; use cursor instead"),
+    page: PageRequest = Depends(page_request(crud_activity.ACTIVITY_SORTS, "activity_name")),
+    fields: Optional[List[str]] = Depends(activity_fields),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)  # All authenticated users
 ):
     """
-    Get all activities in the library (not filtered by offering)
-    This is the activity catalog that can be used across offerings
+    Get all activities in the library (not filtered by offering), one page at a time
+    This is the activity catalog that can be used across offerings; ?fields= returns a sparse list
     """
-    activities = crud_activity.get_all_activities(db, skip=skip, limit=limit)
-    return activities
+    activities = await db.run(crud_activity.get_all_activities, page, skip=0 if page.after else skip, fields=fields)
+    return sparse(response, paged(response, activities), fields)
 
 @router.get("/library/unassigned", response_model=List[Activity])
 async def get_unassigned_activities(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageRequest = Depends(page_request(crud_activity.ACTIVITY_SORTS, "activity_name", unpaged=True)),
+    fields: Optional[List[str]] = Depends(activity_fields),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)  # All authenticated users
 ):
-    """Get activities that are not assigned to any offering"""
-    activities = crud_activity.get_unassigned_activities(db)
-    return activities
+    """
+    Get activities that are not assigned to any offering
+    Returns all of them unless ?limit= or ?cursor= asks for one page at a time
+    """
+    activities = await db.run(crud_activity.get_unassigned_activities, page, fields)
+    return sparse(response, paged(response, activities), fields)
 
 @router.get("/library/{activity_id}", response_model=ActivityWithOfferings)
 async def get_activity_detail(
     activity_id: str,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)  # All authenticated users
 ):
     """Get a single activity with all offerings using it"""
-    activity = crud_activity.get_activity_by_id(db, activity_id)
+    activity = await db.run(crud_activity.get_activity_with_offerings, activity_id)
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
     
-    # Get all offerings using this activity
-    offerings = crud_activity.get_offerings_for_activity(db, activity_id)
-    
-    activity_dict = {
-        "activity_id": activity.activity_id,
-        "activity_name": activity.activity_name,
-        "brand": activity.brand,
-        "product_name": activity.product_name,
-        "category": activity.category,
-        "part_numbers": activity.part_numbers,
-        "duration_weeks": activity.duration_weeks,
-        "duration_hours": activity.duration_hours,
-        "outcome": activity.outcome,
-        "description": activity.description,
-        "effort_hours": activity.effort_hours,
-        "fixed_price": activity.fixed_price,
-        "client_responsibilities": activity.client_responsibilities,
-        "ibm_responsibilities": activity.ibm_responsibilities,
-        "assumptions": activity.assumptions,
-        "deliverables": activity.deliverables,
-        "completion_criteria": activity.completion_criteria,
-        "wbs": activity.wbs,
-        "week": activity.week,
-        "created_on": activity.created_on,
-        "updated_on": activity.updated_on,
-        "offerings": offerings
-    }
+    activity_dict = Activity.model_validate(activity).model_dump()
+    activity_dict["offerings"] = [
+        {
+            "offering_id": link.offering.offering_id,
+            "offering_name": link.offering.offering_name,
+            "sequence": link.sequence,
+            "is_mandatory": link.is_mandatory
+        }
+        for link in activity.offerings
+    ]
     
     return activity_dict
 
 @router.get("/activities", response_model=List[ActivityWithRelation])
 async def get_activities_for_offering(
     offering_id: str = Query(..., description="Offering ID to get activities for"),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)  # All authenticated users
 ):
     """
@@ -96,11 +91,11 @@ async def get_activities_for_offering(
     Includes offering-specific fields like sequence and is_mandatory
     """
     # Verify offering exists
-    offering = crud_offering.get_offering_by_id(db, offering_id)
+    offering = await db.run(crud_offering.get_offering_by_id, offering_id)
     if not offering:
         raise HTTPException(status_code=404, detail="Offering not found")
     
-    activities = crud_activity.get_activities_by_offering(db, offering_id)
+    activities = await db.run(crud_activity.get_activities_by_offering, offering_id)
     return activities
 
 # ==================== ADMIN ONLY - Modify Activity Library ====================
@@ -108,7 +103,7 @@ async def get_activities_for_offering(
 @router.post("/library", response_model=Activity, status_code=status.HTTP_201_CREATED)
 async def create_activity(
     activity: ActivityCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)  # ADMIN ONLY
 ):
     """
@@ -116,21 +111,21 @@ async def create_activity(
     This activity can later be linked to one or more offerings
     **Requires Administrator access**
     """
-    new_activity = crud_activity.create_activity(db, activity)
+    new_activity = await db.run(crud_activity.create_activity, activity)
     return new_activity
 
 @router.put("/library/{activity_id}", response_model=Activity)
 async def update_activity(
     activity_id: str,
     activity_update: ActivityUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)  # ADMIN ONLY
 ):
     """
     Update an existing activity
     **Requires Administrator access**
     """
-    updated_activity = crud_activity.update_activity(db, activity_id, activity_update)
+    updated_activity = await db.run(crud_activity.update_activity, activity_id, activity_update)
     if not updated_activity:
         raise HTTPException(status_code=404, detail="Activity not found")
     return updated_activity
@@ -138,7 +133,7 @@ async def update_activity(
 @router.delete("/library/{activity_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_activity(
     activity_id: str,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)  # ADMIN ONLY
 ):
     """
@@ -146,7 +141,7 @@ async def delete_activity(
     This will also remove it from all offerings (CASCADE)
     **Requires Administrator access**
     """
-    success = crud_activity.delete_activity(db, activity_id)
+    success = await db.run(crud_activity.delete_activity, activity_id)
     if not success:
         raise HTTPException(status_code=404, detail="Activity not found")
     return None
@@ -156,7 +151,7 @@ async def delete_activity(
 @router.post("/link", status_code=status.HTTP_201_CREATED)
 async def link_activity_to_offering(
     link_data: OfferingActivityCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_solution_architect)  # SOLUTION ARCHITECT
 ):
     """
@@ -165,24 +160,21 @@ async def link_activity_to_offering(
     **Requires Solution Architect access**
     """
     # Verify offering exists
-    offering = crud_offering.get_offering_by_id(db, link_data.offering_id)
+    offering = await db.run(crud_offering.get_offering_by_id, link_data.offering_id)
     if not offering:
         raise HTTPException(status_code=404, detail="Offering not found")
     
     # Verify activity exists
-    activity = crud_activity.get_activity_by_id(db, link_data.activity_id)
+    activity = await db.run(crud_activity.get_activity_by_id, link_data.activity_id)
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
     
-    # Check if already linked
-    existing_activities = crud_activity.get_activities_by_offering(db, link_data.offering_id)
-    if any(a['activity_id'] == link_data.activity_id for a in existing_activities):
+    link = await db.run(crud_activity.link_activity_to_offering, link_data)
+    if not link:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Activity already linked to this offering"
         )
-    
-    link = crud_activity.link_activity_to_offering(db, link_data)
     return {
         "message": "Activity linked to offering successfully",
         "offering_id": link.offering_id,
@@ -195,14 +187,14 @@ async def link_activity_to_offering(
 async def unlink_activity_from_offering(
     offering_id: str = Query(..., description="Offering ID"),
     activity_id: str = Query(..., description="Activity ID"),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_solution_architect)  # SOLUTION ARCHITECT
 ):
     """
     Remove an activity from an offering (doesn't delete the activity itself)
     **Requires Solution Architect access**
     """
-    success = crud_activity.unlink_activity_from_offering(db, offering_id, activity_id)
+    success = await db.run(crud_activity.unlink_activity_from_offering, offering_id, activity_id)
     if not success:
         raise HTTPException(
             status_code=404,
@@ -215,15 +207,15 @@ async def update_activity_sequence_in_offering(
     offering_id: str = Query(..., description="Offering ID"),
     activity_id: str = Query(..., description="Activity ID"),
     update_data: OfferingActivityUpdate = None,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_solution_architect)  # SOLUTION ARCHITECT
 ):
     """
     Update sequence and mandatory flag for an activity in a specific offering
     **Requires Solution Architect access**
     """
-    updated_link = crud_activity.update_activity_sequence(
-        db,
+    updated_link = await db.run(
+        crud_activity.update_activity_sequence,
         offering_id,
         activity_id,
         update_data.sequence if update_data and update_data.sequence is not None else None,
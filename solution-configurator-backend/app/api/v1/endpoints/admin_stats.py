@@ -1,26 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Dict
-from app.database import get_db
+from typing import Any, Dict
+from app.database import DBSession, get_read_session
 from app.auth.dependencies import get_current_active_user
 from app.auth.permissions import require_admin
-
-# Import your models
-from app.models.brand import Brand
-from app.models.product import Product
-from app.models.offering import Offering
-from app.models.country import Country
-from app.models.activity import Activity
-from app.models.pricing import PricingDetail
-from app.models.staffing import Staffing
-from app.models.wbs import WBS
+from app.bluegroups_auth import get_membership_cache_stats, purge_user_membership
+from app.crud import admin_stats as crud_admin_stats
+from app.metrics import metrics
 
 router = APIRouter()
 
 @router.get("/admin/stats", response_model=Dict[str, int])
 async def get_admin_stats(
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(require_admin)
 ):
     """
@@ -30,19 +21,7 @@ async def get_admin_stats(
     significantly faster than making multiple API calls.
     """
     try:
-        # Execute all count queries in a single database round-trip
-        stats = {
-            "totalBrands": db.query(func.count(Brand.brand_id)).scalar() or 0,
-            "totalProducts": db.query(func.count(Product.product_id)).scalar() or 0,
-            "totalOfferings": db.query(func.count(Offering.offering_id)).scalar() or 0,
-            "totalCountries": db.query(func.count(Country.country_id)).scalar() or 0,
-            "totalActivities": db.query(func.count(Activity.activity_id)).scalar() or 0,
-            "totalPricing": db.query(func.count(PricingDetail.pricing_id)).scalar() or 0,
-            "totalStaffing": db.query(func.count(Staffing.staffing_id)).scalar() or 0,
-            "totalWBS": db.query(func.count(WBS.wbs_id)).scalar() or 0,
-        }
-        
-        return stats
+        return await db.run(crud_admin_stats.get_admin_stats)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -52,7 +31,7 @@ async def get_admin_stats(
 
 @router.get("/admin/stats/detailed", response_model=Dict[str, Dict])
 async def get_detailed_admin_stats(
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(require_admin)
 ):
     """
@@ -62,53 +41,55 @@ async def get_detailed_admin_stats(
     recent additions, etc.
     """
     try:
-        # Basic counts
-        total_brands = db.query(func.count(Brand.brand_id)).scalar() or 0
-        total_products = db.query(func.count(Product.product_id)).scalar() or 0
-        total_offerings = db.query(func.count(Offering.offering_id)).scalar() or 0
-        total_countries = db.query(func.count(Country.country_id)).scalar() or 0
-        total_activities = db.query(func.count(Activity.activity_id)).scalar() or 0
-        total_pricing = db.query(func.count(PricingDetail.country)).scalar() or 0
-        total_staffing = db.query(func.count(Staffing.staffing_id)).scalar() or 0
-        total_wbs = db.query(func.count(WBS.wbs_id)).scalar() or 0
-        
-        # Additional breakdowns (customize based on your models)
-        # Example: Count offerings by type
-        offerings_by_saas_type = db.query(
-            Offering.saas_type,
-            func.count(Offering.offering_id)
-        ).group_by(Offering.saas_type).all()
-        
-        # Example: Count products by brand
-        products_by_brand = db.query(
-            Product.brand_id,
-            func.count(Product.product_id)
-        ).group_by(Product.brand_id).all()
-        
-        return {
-            "catalog": {
-                "brands": total_brands,
-                "products": total_products,
-                "offerings": total_offerings,
-                "countries": total_countries
-            },
-            "configuration": {
-                "activities": total_activities,
-                "pricing": total_pricing,
-                "staffing": total_staffing,
-                "wbs": total_wbs
-            },
-            "breakdowns": {
-                "offeringsBySaasType": {
-                    saas_type: count for saas_type, count in offerings_by_saas_type
-                },
-                "productsByBrand": {
-                    brand_id: count for brand_id, count in products_by_brand
-                }
-            }
-        }
+        return await db.run(crud_admin_stats.get_detailed_admin_stats)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching detailed admin statistics: {str(e)}"
         )
+
+
+@router.get("/admin/bluegroups/cache", response_model=Dict[str, int])
+async def get_bluegroups_cache_stats(
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get BlueGroups membership cache counters - **Requires Administrator access**
+    """
+    return get_membership_cache_stats()
+
+
+@router.delete("/admin/bluegroups/cache/{email}")
+async def purge_bluegroups_cache(
+    email: str,
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Purge cached BlueGroups decisions for a user - **Requires Administrator access**
+
+    Use after changing a user's group membership so the change applies
+    immediately instead of after the cache TTL. Role claims the user's session
+    carries from before the purge are resolved again on their next request.
+
+    The purge is per pod: it clears the cache of the worker that receives it.
+    Other workers keep their cached group list (up to BLUEGROUPS_CACHE_POSITIVE_TTL)
+    and honour older role claims (up to ROLE_CLAIM_TTL) until they expire, so
+    send it to every pod for the change to apply everywhere at once.
+    """
+    removed = purge_user_membership(email)
+    return {
+        "email": email,
+        "removed": removed,
+        "scope": "pod",
+        "detail": "Purged on this pod only; other pods pick up the change when their cached entries expire"
+    }
+
+
+@router.get("/admin/metrics", response_model=Dict[str, Any])
+async def get_metrics(
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get in-process counters, latency timers and gauges for this worker - **Requires Administrator access**
+    """
+    return metrics.snapshot()
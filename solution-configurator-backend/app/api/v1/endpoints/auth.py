@@ -2,10 +2,9 @@ from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import RedirectResponse, JSONResponse
 from typing import Dict
 import logging
-from app.bluegroups_auth import is_user_in_group
 from app.config import settings
 from app.auth.dependencies import get_current_active_user, get_current_user
-from app.auth.permissions import get_user_roles
+from app.auth.permissions import get_role_claim, get_user_roles, resolve_role_claim
 import logging
 
 router = APIRouter()
@@ -49,12 +48,6 @@ async def auth_callback(request: Request):
         # Get user info from ID token or userinfo endpoint
         try:
             user = await oauth.appid.parse_id_token(request, token)
-            email = user.get("email")
-            roles = []
-            if is_user_in_group(email, "Solution_Architect"):
-                roles.append("Solution_Architect")
-            if is_user_in_group(email, "Administration"):
-                roles.append("Administration")
             logger.info("ID token parsed successfully")
         except Exception as e:
             logger.warning(f"Failed to parse ID token, using userinfo endpoint: {e}")
@@ -70,6 +63,11 @@ async def auth_callback(request: Request):
             'identities': user.get('identities'),
         }
         
+        # Resolve BlueGroups roles once; protected routes read this claim
+        # from the session until it is due for refresh
+        if user.get('email'):
+            request.session['roles'] = await resolve_role_claim(user.get('email'))
+
         # Optionally store token for API calls
         request.session['token'] = {
             'access_token': token.get('access_token'),
@@ -101,7 +99,7 @@ async def get_user_profile(request: Request):
             status_code=401,
             content={'error': 'Not authenticated'}
         )
-    roles: dict = Depends(get_user_roles)
+    roles = await get_role_claim(request, user.get('email')) if user.get('email') else None
     
     return {
         'user': {
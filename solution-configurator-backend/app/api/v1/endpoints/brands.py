@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import List
-from app.database import get_db
+from app.database import DBSession, get_read_session, get_session
 from app.schemas.brand import Brand, BrandCreate, BrandUpdate
 from app.crud import brand as crud_brand
+from app.pagination import PageRequest, page_request, paged
 from app.auth.dependencies import get_current_active_user
 from app.auth.permissions import require_admin
 
@@ -12,20 +12,22 @@ router = APIRouter()
 # READ - Available to all authenticated users
 @router.get("/brands", response_model=List[Brand])
 async def get_brands(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageRequest = Depends(page_request(crud_brand.BRAND_SORTS, "brand_name")),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Get list of all brands - Available to all authenticated users"""
-    return crud_brand.get_brands(db)
+    """Get list of all brands, one page at a time - Available to all authenticated users"""
+    return paged(response, await db.run(crud_brand.get_brands, page))
 
 @router.get("/brands/{brand_id}", response_model=Brand)
 async def get_brand(
     brand_id: str,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get a specific brand - Available to all authenticated users"""
-    brand = crud_brand.get_brand_by_id(db, brand_id)
+    brand = await db.run(crud_brand.get_brand_by_id, brand_id)
     if not brand:
         raise HTTPException(status_code=404, detail="Brand not found")
     return brand
@@ -34,21 +36,21 @@ async def get_brand(
 @router.post("/brands", response_model=Brand, status_code=status.HTTP_201_CREATED)
 async def create_brand(
     brand: BrandCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Create a new brand - **Requires Administrator access**"""
-    return crud_brand.create_brand(db, brand)
+    return await db.run(crud_brand.create_brand, brand)
 
 @router.put("/brands/{brand_id}", response_model=Brand)
 async def update_brand(
     brand_id: str,
     brand_update: BrandUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Update a brand - **Requires Administrator access**"""
-    updated_brand = crud_brand.update_brand(db, brand_id, brand_update)
+    updated_brand = await db.run(crud_brand.update_brand, brand_id, brand_update)
     if not updated_brand:
         raise HTTPException(status_code=404, detail="Brand not found")
     return updated_brand
@@ -56,11 +58,11 @@ async def update_brand(
 @router.delete("/brands/{brand_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_brand(
     brand_id: str,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Delete a brand - **Requires Administrator access**"""
-    success = crud_brand.delete_brand(db, brand_id)
+    success = await db.run(crud_brand.delete_brand, brand_id)
     if not success:
         raise HTTPException(status_code=404, detail="Brand not found")
     return None
\ No newline at end of file
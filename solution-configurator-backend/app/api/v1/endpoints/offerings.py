@@ -1,77 +1,93 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response, status
 from typing import List, Optional
-from app.database import get_db
+from app.database import DBSession, get_read_session, get_session
 from app.schemas.offering import Offering, OfferingCreate, OfferingUpdate
 from app.crud import offering as crud_offering
+from app.models.offering import Offering as OfferingModel
+from app.pagination import PageRequest, page_request, paged
+from app.fieldsets import field_selection, sparse
 from app.auth.dependencies import get_current_active_user
 from app.auth.permissions import require_admin
 
 router = APIRouter()
 
+offering_fields = field_selection(OfferingModel, Offering, crud_offering.OFFERING_FIELDSETS, ["offering_id"])
+
 # READ - Available to all authenticated users
 @router.get("/offerings", response_model=List[Offering])
 async def get_offerings(
+    response: Response,
     product_id: str = Query(..., description="Product ID to filter offerings"),
-    db: Session = Depends(get_db),
+    fields: Optional[List[str]] = Depends(offering_fields),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Get offerings by product ID - Available to all authenticated users"""
-    offerings = crud_offering.get_offerings_by_product(db, product_id)
-    return offerings
+    """Get offerings by product ID (?fields= for a sparse list) - Available to all authenticated users"""
+    offerings = await db.run(crud_offering.get_offerings_by_product, product_id, fields)
+    return sparse(response, offerings, fields)
 
 @router.get("/offerings/{offering_id}", response_model=Offering)
 async def get_offering_by_id(
     offering_id: str = Path(..., description="Offering ID"),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get offering by offering ID - Available to all authenticated users"""
-    offering = crud_offering.get_offering_by_id(db, offering_id)
+    offering = await db.run(crud_offering.get_offering_by_id, offering_id)
     if not offering:
         raise HTTPException(status_code=404, detail="Offering not found")
     return offering
 
 @router.get("/offerings/search/", response_model=List[Offering])
 async def search_offerings(
-    query: Optional[str] = Query(None, description="Search query"),
+    response: Response,
+    query: Optional[str] = Query(None, description="Search query (words, \"phrases\", -excluded; substrings and typos match too)"),
     saas_type: Optional[str] = Query(None, description="Filter by SaaS type"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
     client_type: Optional[str] = Query(None, description="Filter by client type"),
     framework_category: Optional[str] = Query(None, description="Filter by framework category"),
-    db: Session = Depends(get_db),
+    page: PageRequest = Depends(page_request(crud_offering.OFFERING_SORTS, "offering_name", "relevance")),
+    fields: Optional[List[str]] = Depends(offering_fields),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Search offerings with multiple filters - Available to all authenticated users"""
-    offerings = crud_offering.search_offerings(
-        db=db,
+    """
+    Search offerings with multiple filters, one page at a time; with a query the
+    best matches come first - Available to all authenticated users
+    """
+    if page.sort == "relevance" and not query:
+        raise HTTPException(status_code=400, detail="Sorting by relevance needs a search query")
+    offerings = await db.run(
+        crud_offering.search_offerings,
         query=query,
         saas_type=saas_type,
         industry=industry,
         client_type=client_type,
-        framework_category=framework_category
+        framework_category=framework_category,
+        page=page,
+        fields=fields
     )
-    return offerings
+    return sparse(response, paged(response, offerings), fields)
 
 # WRITE - Administrator only
 @router.post("/offerings", response_model=Offering, status_code=status.HTTP_201_CREATED)
 async def create_offering(
     offering: OfferingCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Create a new offering - **Requires Administrator access**"""
-    return crud_offering.create_offering(db, offering)
+    return await db.run(crud_offering.create_offering, offering)
 
 @router.put("/offerings/{offering_id}", response_model=Offering)
 async def update_offering(
     offering_id: str,
     offering_update: OfferingUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Update an offering - **Requires Administrator access**"""
-    updated_offering = crud_offering.update_offering(db, offering_id, offering_update)
+    updated_offering = await db.run(crud_offering.update_offering, offering_id, offering_update)
     if not updated_offering:
         raise HTTPException(status_code=404, detail="Offering not found")
     return updated_offering
@@ -79,11 +95,11 @@ async def update_offering(
 @router.delete("/offerings/{offering_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_offering(
     offering_id: str,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Delete an offering - **Requires Administrator access**"""
-    success = crud_offering.delete_offering(db, offering_id)
+    success = await db.run(crud_offering.delete_offering, offering_id)
     if not success:
         raise HTTPException(status_code=404, detail="Offering not found")
     return None
\ No newline at end of file
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, Path, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Path, HTTPException, Response, status, Query
 from typing import List
-from app.database import get_db
+from app.database import DBSession, get_read_session, get_session
 from app.schemas.staffing import Staffing, StaffingCreate, StaffingUpdate
 from app.crud import staffing as crud_staffing
+from app.pagination import PageRequest, page_request, paged
 from app.auth.dependencies import get_current_active_user
 from app.auth.permissions import require_admin
 
@@ -11,21 +11,22 @@ router = APIRouter()
 
 @router.get("/staffing/all", response_model=List[Staffing])
 async def get_all_staffing(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageRequest = Depends(page_request(crud_staffing.STAFFING_SORTS, "country")),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Get all staffing master records - Available to all authenticated users"""
-    staffing_list = crud_staffing.get_all_staffing(db)
-    return staffing_list
+    """Get all staffing master records, one page at a time - Available to all authenticated users"""
+    return paged(response, await db.run(crud_staffing.get_all_staffing, page))
 
 @router.get("/staffing/{staffing_id}", response_model=Staffing)
 async def get_staffing_by_id(
     staffing_id: str = Path(..., description="Staffing ID"),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get a specific staffing record by ID - Available to all authenticated users"""
-    staffing = crud_staffing.get_staffing_by_id(db, staffing_id)
+    staffing = await db.run(crud_staffing.get_staffing_by_id, staffing_id)
     if not staffing:
         raise HTTPException(status_code=404, detail="Staffing record not found")
     return staffing
@@ -35,11 +36,11 @@ async def get_staffing_by_criteria(
     country: str = Query(..., description="Country"),
     role: str = Query(..., description="Role"),
     band: int = Query(..., description="Band"),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get staffing by country, role, and band - Available to all authenticated users"""
-    staffing = crud_staffing.get_staffing_by_criteria(db, country, role, band)
+    staffing = await db.run(crud_staffing.get_staffing_by_criteria, country, role, band)
     if not staffing:
         raise HTTPException(status_code=404, detail="Staffing record not found")
     return staffing
@@ -49,7 +50,7 @@ from typing import List, Dict, Any
 @router.get("/staffing/offering/{offering_id}", response_model=List[Dict[str, Any]])
 async def get_staffing_by_offering(
     offering_id: str = Path(..., description="Offering ID"),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
     current_user: dict = Depends(get_current_active_user)
 ):
     """
@@ -57,7 +58,7 @@ async def get_staffing_by_offering(
     Returns staffing with activity_id associations for frontend filtering.
     Available to all authenticated users.
     """
-    staffing_details = crud_staffing.get_staffing_by_offering(db, offering_id)
+    staffing_details = await db.run(crud_staffing.get_staffing_by_offering, offering_id)
     return staffing_details
 
 
@@ -66,21 +67,21 @@ async def get_staffing_by_offering(
 @router.post("/staffing", response_model=Staffing, status_code=status.HTTP_201_CREATED)
 async def create_staffing(
     staffing: StaffingCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Create a new staffing record - **Requires Administrator access**"""
-    return crud_staffing.create_staffing(db, staffing)
+    return await db.run(crud_staffing.create_staffing, staffing)
 
 @router.put("/staffing/{staffing_id}", response_model=Staffing)
 async def update_staffing(
     staffing_id: str,
     staffing_update: StaffingUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Update a staffing record - **Requires Administrator access**"""
-    updated_staffing = crud_staffing.update_staffing(db, staffing_id, staffing_update)
+    updated_staffing = await db.run(crud_staffing.update_staffing, staffing_id, staffing_update)
     if not updated_staffing:
         raise HTTPException(status_code=404, detail="Staffing record not found")
     return updated_staffing
@@ -88,11 +89,11 @@ async def update_staffing(
 @router.delete("/staffing/{staffing_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_staffing(
     staffing_id: str,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Delete a staffing record - **Requires Administrator access**"""
-    success = crud_staffing.delete_staffing(db, staffing_id)
+    success = await db.run(crud_staffing.delete_staffing, staffing_id)
     if not success:
         raise HTTPException(status_code=404, detail="Staffing record not found")
     return None
\ No newline at end of file
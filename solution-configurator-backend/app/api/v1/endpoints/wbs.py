@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from typing import List
 from uuid import UUID
+from sqlalchemy.exc import IntegrityError
 
-from app.database import get_db
+from app.database import DBSession, get_session
 from app.schemas.wbs import WBSCreate, WBSUpdate, WBSResponse, ActivityWBSCreate
 from app.crud import wbs as crud_wbs
+from app.pagination import PageRequest, page_request, paged
 from app.auth.dependencies import get_current_active_user
 from app.auth.permissions import require_admin
 
@@ -13,92 +14,96 @@ router = APIRouter(prefix="/wbs", tags=["WBS"])
 
 # READ operations - Available to all authenticated users
 @router.get("/", response_model=List[WBSResponse])
-def get_all_wbs(
-    skip: int = 0, 
-    limit: int = 100, 
-    db: Session = Depends(get_db),
+async def get_all_wbs(
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="OFFSET paging; use cursor instead"),
+    page: PageRequest = Depends(page_request(crud_wbs.WBS_SORTS, "wbs_id")),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Get all WBS items (catalog access)"""
-    return crud_wbs.get_all_wbs(db, skip, limit)
+    """Get all WBS items, one page at a time (catalog access)"""
+    return paged(response, await db.run(crud_wbs.get_all_wbs, page, skip=0 if page.after else skip))
 
 @router.get("/{wbs_id}", response_model=WBSResponse)
-def get_wbs(
+async def get_wbs(
     wbs_id: UUID, 
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get a specific WBS item (catalog access)"""
-    db_wbs = crud_wbs.get_wbs(db, wbs_id)
+    db_wbs = await db.run(crud_wbs.get_wbs, wbs_id)
     if not db_wbs:
         raise HTTPException(status_code=404, detail="WBS not found")
     return db_wbs
 
 @router.get("/activity/{activity_id}/wbs", response_model=List[WBSResponse])
-def get_wbs_for_activity(
+async def get_wbs_for_activity(
     activity_id: UUID, 
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get all WBS items for an activity (catalog access)"""
-    return crud_wbs.get_wbs_for_activity(db, activity_id)
+    return await db.run(crud_wbs.get_wbs_for_activity, activity_id)
 
 # WRITE operations - ADMIN ONLY
 @router.post("/", response_model=WBSResponse)
-def create_wbs(
+async def create_wbs(
     wbs: WBSCreate, 
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Create a new WBS item - **Requires Administrator access**"""
-    return crud_wbs.create_wbs(db, wbs)
+    return await db.run(crud_wbs.create_wbs, wbs)
 
 @router.put("/{wbs_id}", response_model=WBSResponse)
-def update_wbs(
+async def update_wbs(
     wbs_id: UUID, 
     wbs: WBSUpdate, 
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Update a WBS item - **Requires Administrator access**"""
-    db_wbs = crud_wbs.update_wbs(db, wbs_id, wbs)
+    db_wbs = await db.run(crud_wbs.update_wbs, wbs_id, wbs)
     if not db_wbs:
         raise HTTPException(status_code=404, detail="WBS not found")
     return db_wbs
 
 @router.delete("/{wbs_id}")
-def delete_wbs(
+async def delete_wbs(
     wbs_id: UUID, 
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Delete a WBS item - **Requires Administrator access**"""
-    if not crud_wbs.delete_wbs(db, wbs_id):
+    if not await db.run(crud_wbs.delete_wbs, wbs_id):
         raise HTTPException(status_code=404, detail="WBS not found")
     return {"message": "WBS deleted successfully"}
 
 @router.post("/activity/{activity_id}/wbs/{wbs_id}")
-def add_wbs_to_activity(
+async def add_wbs_to_activity(
     activity_id: UUID, 
     wbs_id: UUID, 
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Add WBS to activity - **Requires Administrator access**"""
     try:
-        crud_wbs.add_wbs_to_activity(db, activity_id, wbs_id)
-        return {"message": "WBS added to activity successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        link = await db.run(crud_wbs.add_wbs_to_activity, activity_id, wbs_id)
+    except IntegrityError:
+        # An existing link is skipped, so the only constraints left to violate are its foreign keys
+        raise HTTPException(status_code=404, detail="Activity or WBS not found")
+    if not link:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="WBS already added to this activity")
+    return {"message": "WBS added to activity successfully"}
 
 @router.delete("/activity/{activity_id}/wbs/{wbs_id}")
-def remove_wbs_from_activity(
+async def remove_wbs_from_activity(
     activity_id: UUID, 
     wbs_id: UUID, 
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: dict = Depends(require_admin)
 ):
     """Remove WBS from activity - **Requires Administrator access**"""
-    if not crud_wbs.remove_wbs_from_activity(db, activity_id, wbs_id):
+    if not await db.run(crud_wbs.remove_wbs_from_activity, activity_id, wbs_id):
         raise HTTPException(status_code=404, detail="Association not found")
     return {"message": "WBS removed from activity successfully"}
\ No newline at end of file
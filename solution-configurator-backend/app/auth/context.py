@@ -0,0 +1,25 @@
+from fastapi import Request
+from typing import Dict, Optional
+
+
+class AuthContext:
+    """
+    Per-request memo of authentication and permission decisions, kept on request.state.
+    Every auth dependency evaluated for the same request reads and fills the same
+    context, so the user is extracted once and each membership is resolved once.
+    """
+
+    def __init__(self):
+        self.user: Optional[Dict] = None
+        # email -> role claim (see permissions.resolve_role_claim)
+        self.role_claims: Dict[str, Dict] = {}
+        # (email, group) -> is_member, None if the lookup failed (see dependencies.resolve_memberships)
+        self.group_decisions: Dict[tuple, Optional[bool]] = {}
+
+
+def get_auth_context(request: Request) -> AuthContext:
+    """Return the request's AuthContext, creating it on first use"""
+    context = getattr(request.state, "auth", None)
+    if context is None:
+        context = request.state.auth = AuthContext()
+    return context
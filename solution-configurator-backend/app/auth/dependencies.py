@@ -1,6 +1,12 @@
 from fastapi import Request, HTTPException, status
-from typing import Dict, Optional
-from app.bluegroups_auth import is_user_in_group
+from typing import Dict, Iterable, Optional, Set
+from app.auth.context import get_auth_context
+from app.auth.ibm_auth import ibm_auth
+from app.bluegroups_auth import lookup_groups, register_access_groups
+
+# Every group a permission check has asked about. The first membership question of a
+# request asks about all of them in one lookup, so later dependencies find theirs answered.
+_known_groups: Set[str] = set()
 
 
 def get_current_user(request: Request) -> Dict:
@@ -17,14 +23,39 @@ def get_current_user(request: Request) -> Dict:
 
 from fastapi import Request, HTTPException, Depends
 
-def get_current_active_user(request: Request):
+def _user_from_claims(claims: Dict) -> Dict:
+    """Shape verified AppID token claims like the session user"""
+    return {
+        "sub": claims.get("sub"),
+        "name": claims.get("name") or f"{claims.get('given_name', '')} {claims.get('family_name', '')}".strip(),
+        "email": claims.get("email"),
+        "given_name": claims.get("given_name"),
+        "family_name": claims.get("family_name"),
+    }
+
+
+async def get_current_active_user(request: Request):
     """
     Extracts the currently active user from session.
-    This replaces old JWT token-based `get_current_active_user`.
+    Service callers may instead send an AppID access token as
+    `Authorization: Bearer <token>`; verified claims are cached until the token expires.
+    The result is memoized on the request's AuthContext.
     """
-    user = request.session.get("user")
-    if not user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+    context = get_auth_context(request)
+    if context.user is not None:
+        return context.user
+
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token.strip():
+        claims = await ibm_auth.verify_token_cached(token.strip())
+        user = _user_from_claims(claims)
+    else:
+        user = request.session.get("user")
+        if not user:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+
+    context.user = user
     return user
 
 
@@ -36,22 +67,41 @@ def get_current_user_optional(request: Request) -> Optional[Dict]:
     return request.session.get('user')
 
 
+async def resolve_memberships(request: Request, email: str, group_names: Iterable[str]) -> Dict[str, Optional[bool]]:
+    """
+    {group: is_member} for one user, None for every group if the lookup failed.
+    Answers are memoized on the request's AuthContext, so a request resolves
+    group membership at most once however many permission dependencies ask.
+    """
+    group_names = list(group_names)
+    _known_groups.update(group_names)
+    register_access_groups(group_names)
+    decisions = get_auth_context(request).group_decisions
+    if any((email, group) not in decisions for group in group_names):
+        for group, in_group in (await lookup_groups(email, sorted(_known_groups))).items():
+            decisions.setdefault((email, group), in_group)
+    return {group: decisions[(email, group)] for group in group_names}
+
+
 def require_groups(*allowed_groups):
     """
     Dependency factory to enforce BlueGroup-based access control.
     Usage: Depends(require_groups("Administrators", "Solution Architects"))
     """
-    def dependency(current_user: dict = Depends(get_current_active_user)):
+    _known_groups.update(allowed_groups)
+    register_access_groups(allowed_groups)
+
+    async def dependency(request: Request, current_user: dict = Depends(get_current_active_user)):
         email = current_user.get("email")
 
         # If no specific group is required (default catalog access)
         if not allowed_groups:
             return current_user
 
-        # Check BlueGroups membership
-        for group in allowed_groups:
-            if is_user_in_group(email, group):
-                return current_user
+        # Check BlueGroups membership (one cached group-list lookup answers every group);
+        # a failed lookup counts as not a member
+        if any((await resolve_memberships(request, email, allowed_groups)).values()):
+            return current_user
 
         # If user not in any of the required groups
         raise HTTPException(
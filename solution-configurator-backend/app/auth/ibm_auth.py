@@ -1,12 +1,24 @@
+import asyncio
+import hashlib
 import httpx
+import time
 from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from typing import Dict, Optional
+from app.cache import TTLCache
+from app.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.config import settings
+from app.metrics import metrics
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx when installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class IBMAuth:
     def __init__(self):
@@ -14,80 +26,163 @@ class IBMAuth:
         self.client_secret = settings.IBM_CLIENT_SECRET
         self.discovery_endpoint = settings.IBM_DISCOVERY_ENDPOINT
         self.oauth_server_url = settings.IBM_OAUTH_SERVER_URL
+        self._client: Optional[httpx.AsyncClient] = None
         self._jwks_cache: Optional[Dict] = None
+        self._jwks_expires_at: float = 0
+        self._jwks_refreshed_at: float = 0
+        self._jwks_lock = asyncio.Lock()
         self._discovery_cache: Optional[Dict] = None
+        self._discovery_expires_at: float = 0
+        # sha256(token) -> verified claims, kept until the token's exp
+        self._verified_tokens = TTLCache(max_entries=settings.IBM_TOKEN_CACHE_MAX_ENTRIES)
+        metrics.gauge("appid.token_cache", self._verified_tokens.stats)
+        self._breaker = CircuitBreaker(
+            "appid",
+            failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+            latency_threshold=settings.IBM_LATENCY_THRESHOLD,
+            reset_timeout=settings.BREAKER_RESET_TIMEOUT
+        )
+        metrics.gauge("appid.breaker", self._breaker.stats)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """App-lifetime pooled client (keep-alive, HTTP/2 when h2 is installed)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(settings.IBM_HTTP_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.IBM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.IBM_HTTP_MAX_CONNECTIONS
+                )
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send an outbound request, recording latency and errors under appid.<name>.
+        Raises CircuitOpenError without calling AppID while the circuit is open;
+        callers fall back to their last cached document.
+        """
+        if not self._breaker.allow_request():
+            metrics.incr(f"appid.{name}.rejected")
+            raise CircuitOpenError(f"AppID circuit is {self._breaker.state}")
+
+        start = time.perf_counter()
+        try:
+            response = await self._get_client().request(method, url, **kwargs)
+            response.raise_for_status()
+        except Exception as e:
+            metrics.incr(f"appid.{name}.errors")
+            # Client errors (bad token, bad credentials) say nothing about AppID's health
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500:
+                self._breaker.record_success()
+            else:
+                self._breaker.record_failure()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.observe(f"appid.{name}.latency", elapsed)
+
+        self._breaker.record_success(elapsed)
+        return response
 
     async def get_discovery_document(self) -> Dict:
         """Fetch the OpenID Connect discovery document"""
-        if self._discovery_cache:
+        if self._discovery_cache and time.monotonic() < self._discovery_expires_at:
             return self._discovery_cache
-        
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.discovery_endpoint)
-                response.raise_for_status()
-                self._discovery_cache = response.json()
-                return self._discovery_cache
+            response = await self._request("discovery", "GET", self.discovery_endpoint)
+            self._discovery_cache = response.json()
+            self._discovery_expires_at = time.monotonic() + settings.IBM_DISCOVERY_TTL
+            return self._discovery_cache
         except Exception as e:
             logger.error(f"Failed to fetch discovery document: {e}")
+            if self._discovery_cache:
+                # Keep serving the previous document rather than failing every login
+                return self._discovery_cache
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Authentication service unavailable"
             )
 
-    async def get_jwks(self) -> Dict:
+    async def get_jwks(self, force_refresh: bool = False) -> Dict:
         """Fetch JSON Web Key Set for token validation"""
-        if self._jwks_cache:
+        if self._jwks_cache and not force_refresh and time.monotonic() < self._jwks_expires_at:
             return self._jwks_cache
-        
+
         try:
             discovery = await self.get_discovery_document()
             jwks_uri = discovery.get("jwks_uri")
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(jwks_uri)
-                response.raise_for_status()
-                self._jwks_cache = response.json()
-                return self._jwks_cache
+
+            response = await self._request("jwks", "GET", jwks_uri)
+            self._jwks_cache = response.json()
+            self._jwks_refreshed_at = time.monotonic()
+            self._jwks_expires_at = self._jwks_refreshed_at + settings.IBM_JWKS_TTL
+            return self._jwks_cache
         except Exception as e:
             logger.error(f"Failed to fetch JWKS: {e}")
+            if self._jwks_cache:
+                return self._jwks_cache
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Authentication service unavailable"
             )
 
+    async def _refresh_jwks_for_unknown_kid(self, kid: Optional[str]) -> Dict:
+        """
+        Re-fetch the JWKS once after a signing-key rotation.
+        Refreshes are rate-limited so tokens with bogus kids cannot hammer AppID.
+        """
+        async with self._jwks_lock:
+            since_refresh = time.monotonic() - self._jwks_refreshed_at
+            if since_refresh < settings.IBM_JWKS_MIN_REFRESH_INTERVAL:
+                return self._jwks_cache or {}
+            logger.info(f"Unknown signing key '{kid}', refreshing JWKS")
+            metrics.incr("appid.jwks.kid_miss_refreshes")
+            return await self.get_jwks(force_refresh=True)
+
+    @staticmethod
+    def _find_key(jwks: Dict, kid: Optional[str]) -> Dict:
+        for key in jwks.get("keys", []):
+            if key.get("kid") == kid:
+                return {
+                    "kty": key.get("kty"),
+                    "kid": key.get("kid"),
+                    "use": key.get("use"),
+                    "n": key.get("n"),
+                    "e": key.get("e")
+                }
+        return {}
+
     async def verify_token(self, token: str) -> Dict:
         """Verify and decode the IBM AppID token"""
         try:
             # Get the discovery document to get issuer
             discovery = await self.get_discovery_document()
             issuer = discovery.get("issuer")
-            
+
             # Decode without verification first to get the header
             unverified_header = jwt.get_unverified_header(token)
-            
-            # Get JWKS
-            jwks = await self.get_jwks()
-            
-            # Find the right key
-            rsa_key = {}
-            for key in jwks.get("keys", []):
-                if key.get("kid") == unverified_header.get("kid"):
-                    rsa_key = {
-                        "kty": key.get("kty"),
-                        "kid": key.get("kid"),
-                        "use": key.get("use"),
-                        "n": key.get("n"),
-                        "e": key.get("e")
-                    }
-                    break
-            
+            kid = unverified_header.get("kid")
+
+            # Find the right key, refreshing the JWKS once if the key was rotated
+            rsa_key = self._find_key(await self.get_jwks(), kid)
+            if not rsa_key:
+                rsa_key = self._find_key(await self._refresh_jwks_for_unknown_kid(kid), kid)
+
             if not rsa_key:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Unable to find appropriate key"
                 )
-            
+
             # Verify and decode the token
             payload = jwt.decode(
                 token,
@@ -96,9 +191,11 @@ class IBMAuth:
                 audience=self.client_id,
                 issuer=issuer
             )
-            
+
             return payload
-            
+
+        except HTTPException:
+            raise
         except JWTError as e:
             logger.error(f"JWT verification failed: {e}")
             raise HTTPException(
@@ -113,32 +210,48 @@ class IBMAuth:
                 detail="Authentication failed"
             )
 
+    async def verify_token_cached(self, token: str) -> Dict:
+        """
+        verify_token with a cache of verified claims keyed by the token's hash.
+        Repeat calls with the same token skip discovery and signature checks until it expires.
+        """
+        key = hashlib.sha256(token.encode()).hexdigest()
+        claims = self._verified_tokens.get(key)
+        if claims is not None:
+            return claims
+
+        claims = await self.verify_token(token)
+        ttl = claims.get("exp", 0) - time.time()
+        if ttl > 0:
+            self._verified_tokens.set(key, claims, ttl)
+        return claims
+
     async def introspect_token(self, token: str) -> Dict:
         """Introspect token using IBM AppID introspection endpoint"""
         try:
             discovery = await self.get_discovery_document()
             introspection_endpoint = discovery.get("introspection_endpoint")
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    introspection_endpoint,
-                    data={
-                        "token": token,
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret
-                    }
+
+            response = await self._request(
+                "introspect",
+                "POST",
+                introspection_endpoint,
+                data={
+                    "token": token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret
+                }
+            )
+            result = response.json()
+
+            if not result.get("active"):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token is not active"
                 )
-                response.raise_for_status()
-                result = response.json()
-                
-                if not result.get("active"):
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token is not active"
-                    )
-                
-                return result
-                
+
+            return result
+
         except HTTPException:
             raise
         except Exception as e:
@@ -149,4 +262,4 @@ class IBMAuth:
             )
 
 
-ibm_auth = IBMAuth()
\ No newline at end of file
+ibm_auth = IBMAuth()
@@ -1,17 +1,75 @@
-from fastapi import Depends, HTTPException, status
-from app.auth.dependencies import get_current_active_user
-from app.bluegroups_auth import is_user_in_group
+from fastapi import Depends, HTTPException, Request, status
+from typing import Dict, Optional
+from app.auth.context import get_auth_context
+from app.auth.dependencies import get_current_active_user, resolve_memberships
+from app.bluegroups_auth import lookup_groups, membership_purged_at
 import logging
+import time
 from app.config import settings
+from app.metrics import metrics
 
 ADMIN_GROUP = settings.ADMIN_BLUEGROUP
 SOLUTION_ARCHITECT_GROUP = settings.SOLUTION_ARCHITECT_BLUEGROUP
+ROLE_GROUPS = [ADMIN_GROUP, SOLUTION_ARCHITECT_GROUP]
 
 logger = logging.getLogger(__name__)
 
 # BlueGroup names - Update these with your actual BlueGroup names
 
-async def require_admin(current_user: dict = Depends(get_current_active_user)):
+
+def _role_claim(email: str, memberships: Dict[str, Optional[bool]]) -> Dict:
+    """
+    Role claim from admin and solution-architect memberships.
+    The claim carries a refresh_after timestamp; if the lookup failed it is
+    already stale so the next request retries instead of trusting a denial.
+    resolved_at lets a membership purge retire claims issued before it.
+    """
+    metrics.incr("auth.role_resolutions")
+    is_admin = bool(memberships[ADMIN_GROUP])
+    complete = memberships[ADMIN_GROUP] is not None
+    return {
+        "email": email,
+        "is_admin": is_admin,
+        "is_solution_architect": is_admin or bool(memberships[SOLUTION_ARCHITECT_GROUP]),
+        "resolved_at": time.time(),
+        "refresh_after": time.time() + settings.ROLE_CLAIM_TTL if complete else 0
+    }
+
+
+async def resolve_role_claim(email: str) -> Dict:
+    """Resolve the user's role claim from a single group-list lookup (used at login)"""
+    return _role_claim(email, await lookup_groups(email, ROLE_GROUPS))
+
+
+async def get_role_claim(request: Request, email: str) -> Dict:
+    """
+    Return the role claim stored in the (signed) session cookie at login.
+    BlueGroups is only consulted again once the claim is stale or the user's
+    membership was purged after it was resolved, and at most once per request
+    however many permission dependencies ask.
+    """
+    context = get_auth_context(request)
+    claim = context.role_claims.get(email)
+    if claim is not None:
+        return claim
+
+    claim = request.session.get("roles")
+    fresh = (
+        claim and claim.get("email") == email
+        and claim.get("refresh_after", 0) > time.time()
+        and claim.get("resolved_at", 0) >= membership_purged_at(email)
+    )
+    if not fresh:
+        claim = _role_claim(email, await resolve_memberships(request, email, ROLE_GROUPS))
+        if request.session.get("user"):
+            # Bearer-token callers have no session to carry the claim
+            request.session["roles"] = claim
+
+    context.role_claims[email] = claim
+    return claim
+
+
+async def require_admin(request: Request, current_user: dict = Depends(get_current_active_user)):
     """
     Require user to be in Administrators BlueGroup.
     Grants full access to modify offerings, activities, pricing, etc.
@@ -23,7 +81,8 @@ async def require_admin(current_user: dict = Depends(get_current_active_user)):
             detail="Email not found in user profile"
         )
     
-    if not is_user_in_group(email, ADMIN_GROUP):
+    roles = await get_role_claim(request, email)
+    if not roles["is_admin"]:
         logger.warning(f"User {email} attempted admin action without permission")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -33,7 +92,7 @@ async def require_admin(current_user: dict = Depends(get_current_active_user)):
     logger.info(f"Admin access granted to {email}")
     return current_user
 
-async def require_solution_architect(current_user: dict = Depends(get_current_active_user)):
+async def require_solution_architect(request: Request, current_user: dict = Depends(get_current_active_user)):
     """
     Require user to be in Solution Architects BlueGroup or Administrators.
     Grants access to solution builder (link/unlink activities, update sequences).
@@ -47,11 +106,12 @@ async def require_solution_architect(current_user: dict = Depends(get_current_ac
         )
     
     # Admins have all permissions including solution architect
-    if is_user_in_group(email, ADMIN_GROUP):
+    roles = await get_role_claim(request, email)
+    if roles["is_admin"]:
         logger.info(f"Solution Architect access granted to {email} (via Admin role)")
         return current_user
     
-    if not is_user_in_group(email, SOLUTION_ARCHITECT_GROUP):
+    if not roles["is_solution_architect"]:
         logger.warning(f"User {email} attempted solution architect action without permission")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -61,7 +121,7 @@ async def require_solution_architect(current_user: dict = Depends(get_current_ac
     logger.info(f"Solution Architect access granted to {email}")
     return current_user
 
-async def get_user_roles(current_user: dict = Depends(get_current_active_user)):
+async def get_user_roles(request: Request, current_user: dict = Depends(get_current_active_user)):
     """
     Get user roles for UI display.
     Returns a dict with role flags.
@@ -75,15 +135,11 @@ async def get_user_roles(current_user: dict = Depends(get_current_active_user)):
             "has_catalog_access": True
         }
     
-    is_admin = is_user_in_group(email, ADMIN_GROUP)
-    # is_admin = False
-    is_solution_architect = is_admin or is_user_in_group(email, SOLUTION_ARCHITECT_GROUP)
-    
-    
+    roles = await get_role_claim(request, email)
 
     return {
-        "is_admin": is_admin,
-        "is_solution_architect": is_solution_architect,
+        "is_admin": roles["is_admin"],
+        "is_solution_architect": roles["is_solution_architect"],
         "has_catalog_access": True,
         "email": email
     }
\ No newline at end of file
@@ -1,23 +1,257 @@
+import asyncio
+import weakref
+import httpx
 import requests
 import xmltodict
 import logging
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+from app.cache import TTLCache
+from app.circuit_breaker import CircuitBreaker
+from app.config import settings
+from app.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+# email -> frozenset of group names, shared by every permission check in this process.
+# One listGroups call answers any number of membership questions for that user.
+# Expired lists are kept for BLUEGROUPS_STALE_GRACE so an outage serves the last known answer.
+_groups_cache = TTLCache(
+    max_entries=settings.BLUEGROUPS_CACHE_MAX_ENTRIES,
+    stale_grace=settings.BLUEGROUPS_STALE_GRACE
+)
+metrics.gauge("bluegroups.cache", _groups_cache.stats)
+
+# Stops piling requests onto BluePages while it is failing or slow
+_breaker = CircuitBreaker(
+    "bluegroups",
+    failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+    latency_threshold=settings.BLUEGROUPS_LATENCY_THRESHOLD,
+    reset_timeout=settings.BREAKER_RESET_TIMEOUT
+)
+metrics.gauge("bluegroups.breaker", _breaker.stats)
+
+# Shared pooled client for the async path, created on first use
+_async_client: Optional[httpx.AsyncClient] = None
+
+# email -> when its membership was last purged, so role claims resolved before that are
+# refreshed. Kept for ROLE_CLAIM_TTL, after which any older claim is stale anyway.
+_purged_at = TTLCache(max_entries=settings.BLUEGROUPS_CACHE_MAX_ENTRIES)
+
+# Groups the app grants access by: the role groups, plus every group a permission check
+# names (register_access_groups). A list matching none of them is cached for the
+# negative TTL, so a newly granted role is picked up as soon as for a user in no group.
+_access_groups: Set[str] = {settings.ADMIN_BLUEGROUP, settings.SOLUTION_ARCHITECT_BLUEGROUP}
+
+# Lookups currently on the wire, per event loop, so concurrent checks for the same user
+# share one request. A future belongs to the loop that created it; another loop has its own.
+_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _cache_key(email: str) -> str:
+    return (email or "").lower()
+
+
+def _parse_group_list(xml_text: str) -> FrozenSet[str]:
+    """Extract group names from a groupsxml listGroups response"""
+    data = xmltodict.parse(xml_text) or {}
+    root = next(iter(data.values()), None)
+    entries = root.get("group", []) if isinstance(root, dict) else []
+    if not isinstance(entries, list):
+        entries = [entries]
+
+    names = set()
+    for entry in entries:
+        if isinstance(entry, dict):
+            entry = entry.get("name") or entry.get("#text")
+        if entry:
+            names.add(entry.strip())
+    return frozenset(names)
+
+
+def register_access_groups(group_names: Iterable[str]) -> None:
+    """Add groups a permission check grants access by (see _remember)"""
+    _access_groups.update(group_names)
+
+
+def _remember(email: str, groups: FrozenSet[str]) -> None:
+    """Cache a user's groups: for the positive TTL if they grant any access, else the negative one"""
+    granted = not _access_groups.isdisjoint(groups)
+    ttl = settings.BLUEGROUPS_CACHE_POSITIVE_TTL if granted else settings.BLUEGROUPS_CACHE_NEGATIVE_TTL
+    _groups_cache.set(_cache_key(email), groups, ttl)
+
+
+def _last_known_groups(email: str) -> Optional[FrozenSet[str]]:
+    """Fallback while BlueGroups is unavailable: the expired cached list, if still within the grace period"""
+    groups = _groups_cache.get_stale(_cache_key(email))
+    if groups is not None:
+        logger.warning(f"[BlueGroups] Serving last known groups for {email} ({_breaker.state})")
+    return groups
+
+
+def _record_outcome(email: str, start: float, error: Optional[Exception]) -> None:
+    elapsed = time.perf_counter() - start
+    metrics.observe("bluegroups.latency", elapsed)
+    if error is None:
+        _breaker.record_success(elapsed)
+    else:
+        metrics.incr("bluegroups.errors")
+        _breaker.record_failure()
+        logger.error(f"Error listing BlueGroups for {email}: {error}")
+
+
+def get_user_groups(email: str) -> Optional[FrozenSet[str]]:
+    """
+    Return every BlueGroup the user belongs to.
+    While BlueGroups is failing (or its circuit is open) the last known list is
+    served for BLUEGROUPS_STALE_GRACE seconds; after that the result is None.
+    Results are cached; lookup errors are not.
+
+    Blocking - use get_user_groups_async from async code.
+    """
+    cached = _groups_cache.get(_cache_key(email))
+    if cached is not None:
+        return cached
+
+    if not _breaker.allow_request():
+        return _last_known_groups(email)
+
+    start = time.perf_counter()
+    try:
+        response = requests.get(
+            settings.BLUEGROUPS_URL,
+            params={"task": "listGroups", "email": email},
+            timeout=settings.BLUEGROUPS_TIMEOUT
+        )
+        response.raise_for_status()
+        groups = _parse_group_list(response.text)
+        logger.info(f"[BlueGroups] {email} belongs to {len(groups)} group(s)")
+    except Exception as e:
+        _record_outcome(email, start, e)
+        return _last_known_groups(email)
+
+    _record_outcome(email, start, None)
+    _remember(email, groups)
+    return groups
+
+
 def is_user_in_group(email: str, group_name: str) -> bool:
     """
     Check if an IBM user belongs to a given BlueGroup.
-    Returns True if rc=0 (user in group).
+    Answered from the user's cached group list; False if BlueGroups is unreachable.
+
+    Blocking - use is_user_in_group_async from async code.
     """
-    url = f"https://bluepages.ibm.com/tools/groups/groupsxml.wss?task=inAGroup&email={email}&group={group_name}"
+    groups = get_user_groups(email)
+    return groups is not None and group_name in groups
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client used for BlueGroups lookups"""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.BLUEGROUPS_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.BLUEGROUPS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.BLUEGROUPS_MAX_CONNECTIONS
+            )
+        )
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """Close the pooled client (called on application shutdown)"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+async def _fetch_user_groups(email: str) -> Optional[FrozenSet[str]]:
+    if not _breaker.allow_request():
+        return _last_known_groups(email)
+
+    start = time.perf_counter()
     try:
-        response = requests.get(url, timeout=10)
+        response = await get_async_client().get(
+            settings.BLUEGROUPS_URL,
+            params={"task": "listGroups", "email": email}
+        )
         response.raise_for_status()
-        data = xmltodict.parse(response.text)
-        rc_value = data.get("group", {}).get("rc")
-        in_group = rc_value == "0"
-        logger.info(f"[BlueGroups] {email} in '{group_name}': {in_group}")
-        return in_group
+        groups = _parse_group_list(response.text)
+        logger.info(f"[BlueGroups] {email} belongs to {len(groups)} group(s)")
     except Exception as e:
-        logger.error(f"Error checking BlueGroup membership for {email}: {e}")
-        return False
\ No newline at end of file
+        _record_outcome(email, start, e)
+        return _last_known_groups(email)
+
+    _record_outcome(email, start, None)
+    _remember(email, groups)
+    return groups
+
+
+async def get_user_groups_async(email: str) -> Optional[FrozenSet[str]]:
+    """
+    Non-blocking variant of get_user_groups sharing the same cache.
+    Concurrent calls for the same user wait on a single request.
+    """
+    key = _cache_key(email)
+    cached = _groups_cache.get(key)
+    if cached is not None:
+        return cached
+
+    inflight = _inflight.setdefault(asyncio.get_running_loop(), {})
+    pending = inflight.get(key)
+    if pending is None:
+        pending = asyncio.ensure_future(_fetch_user_groups(email))
+        inflight[key] = pending
+        pending.add_done_callback(lambda _: inflight.pop(key, None))
+    return await asyncio.shield(pending)
+
+
+async def is_user_in_group_async(email: str, group_name: str) -> bool:
+    """Non-blocking variant of is_user_in_group"""
+    groups = await get_user_groups_async(email)
+    return groups is not None and group_name in groups
+
+
+async def lookup_groups(email: str, group_names: Iterable[str]) -> Dict[str, Optional[bool]]:
+    """
+    Check several groups for one user with at most one BlueGroups call.
+    Returns {group: is_member}, with None for every group if the lookup failed.
+    """
+    groups = await get_user_groups_async(email)
+    return {
+        group: None if groups is None else group in groups
+        for group in group_names
+    }
+
+
+async def check_groups(email: str, group_names: Iterable[str]) -> Dict[str, bool]:
+    """Check several groups for one user; a failed lookup counts as not a member"""
+    memberships = await lookup_groups(email, group_names)
+    return {group: bool(in_group) for group, in_group in memberships.items()}
+
+
+def purge_user_membership(email: str) -> int:
+    """
+    Drop the cached group list for a user and retire the role claims resolved
+    before now; returns the number of group lists removed.
+    Only this process's caches are touched.
+    """
+    removed = int(_groups_cache.delete(_cache_key(email)))
+    _purged_at.set(_cache_key(email), time.time(), settings.ROLE_CLAIM_TTL)
+    logger.info(f"[BlueGroups] Purged {removed} cached group list(s) for {email}")
+    return removed
+
+
+def membership_purged_at(email: str) -> float:
+    """time.time() of the last purge_user_membership for the user in this process, or 0"""
+    return _purged_at.get(_cache_key(email), 0)
+
+
+def get_membership_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters and size of the membership cache"""
+    return _groups_cache.stats()
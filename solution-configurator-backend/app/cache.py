@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache with a per-entry time-to-live.
+    Used to keep the results of slow outbound lookups in process.
+
+    With stale_grace > 0, expired entries are kept that much longer so
+    get_stale can serve a last-known value while the source is unavailable.
+    """
+
+    def __init__(self, max_entries: int = 10000, stale_grace: float = 0):
+        self.max_entries = max_entries
+        self.stale_grace = stale_grace
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None and entry[1] + self.stale_grace <= now:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for key even if expired, as long as it is within stale_grace"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] + self.stale_grace <= now:
+                return default
+            self.stale_hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds, evicting the least recently used entry if full"""
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a single entry"""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def purge(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches predicate; returns the number removed"""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Dict, Union
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for an outbound dependency.
+
+    closed    - calls go through; failures and slow calls (over latency_threshold)
+                are counted, and failure_threshold in a row opens the circuit.
+    open      - calls are refused for reset_timeout seconds.
+    half_open - a single probe call is let through; success closes the circuit,
+                failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        latency_threshold: float = 2.0,
+        reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may proceed now"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float = 0.0) -> None:
+        """Record a completed call; one slower than latency_threshold counts as a failure"""
+        if latency > self.latency_threshold:
+            self.record_failure()
+            return
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
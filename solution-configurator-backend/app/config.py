@@ -4,7 +4,21 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
-    SSL_CERT_PATH: str
+    SSL_CERT_PATH: str | None = None      # required unless DATABASE_SSLMODE is relaxed
+    DATABASE_SSLMODE: str = "verify-full"
+    DATABASE_ASYNC: bool = False          # asyncpg engine for request handlers (needs asyncpg)
+    DATABASE_REPLICA_URL: str | None = None   # read replica for catalogue GET handlers
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0  # reads stay on the primary this long after a write
+    DB_LAZY_LOADS: str = "raise"          # relationship lazy loads in requests: "raise", or "log" to allow and report them
+
+    # Database connection pool, per engine and per worker (read by app/database.py)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800           # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = True         # reuse the most recent connection; idle ones age out
+    DB_POOL_WARM: int | None = None       # connections opened at startup; DB_POOL_SIZE if unset
     
     # IBM AppID
     IBM_CLIENT_ID: str
@@ -13,21 +27,68 @@ class Settings(BaseSettings):
     IBM_OAUTH_SERVER_URL: str
     IBM_DISCOVERY_ENDPOINT: str
     IBM_PROFILES_URL: str | None = None   # 👈 Add this line
+    IBM_HTTP_TIMEOUT: float = 10.0
+    IBM_HTTP_MAX_CONNECTIONS: int = 20
+    IBM_DISCOVERY_TTL: int = 3600
+    IBM_JWKS_TTL: int = 3600
+    IBM_JWKS_MIN_REFRESH_INTERVAL: int = 60   # seconds between kid-miss JWKS refreshes
+    IBM_TOKEN_CACHE_MAX_ENTRIES: int = 10000  # verified bearer-token claims kept until exp
     
     # Application
     PROJECT_NAME: str = "Solution Offering API"
     API_V1_PREFIX: str = "/api/v1"
     DEBUG: bool = False
-    
+
+    # Keyset pagination for list endpoints (next page cursor in X-Next-Cursor)
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+
+    # Offering totals cache (seconds / entries); writes invalidate it in process,
+    # the TTL bounds staleness after a write handled by another worker
+    OFFERING_TOTALS_CACHE_TTL: int = 300
+    OFFERING_TOTALS_CACHE_MAX_ENTRIES: int = 5000
+    # Solution prices (POST /solutions/price), memoized per selection; any pricing write retires them
+    SOLUTION_PRICE_CACHE_TTL: int = 300
+    SOLUTION_PRICE_CACHE_MAX_ENTRIES: int = 2000
+
     # Frontend
     FRONTEND_URL: str
     
     # Session
     SESSION_SECRET: str
+    SESSION_MAX_AGE: int = 3600 * 24  # 24 hours
+    # "cookie" keeps the whole session in the signed cookie; "memory" / "redis"
+    # store it server-side and the cookie only carries an opaque session id
+    SESSION_BACKEND: str = "cookie"
+    REDIS_URL: str | None = None
 
     # Groups
     ADMIN_BLUEGROUP: str
     SOLUTION_ARCHITECT_BLUEGROUP: str
+
+    # BlueGroups lookups (point BLUEGROUPS_URL at app.stubs.bluepages for offline use)
+    BLUEGROUPS_URL: str = "https://bluepages.ibm.com/tools/groups/groupsxml.wss"
+    BLUEGROUPS_TIMEOUT: float = 10.0
+    BLUEGROUPS_MAX_CONNECTIONS: int = 20
+
+    # BlueGroups membership cache (seconds / entries). A user's group list is kept for the
+    # positive TTL if it holds a group the app grants access by (the role groups or one a
+    # permission check names), else for the negative TTL, so newly granted access shows sooner
+    BLUEGROUPS_CACHE_POSITIVE_TTL: int = 300
+    BLUEGROUPS_CACHE_NEGATIVE_TTL: int = 60
+    BLUEGROUPS_CACHE_MAX_ENTRIES: int = 10000
+
+    # Circuit breakers around BlueGroups and AppID: open after this many consecutive
+    # failures or slow calls, probe again after BREAKER_RESET_TIMEOUT seconds
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_TIMEOUT: float = 30.0
+    BLUEGROUPS_LATENCY_THRESHOLD: float = 2.0
+    IBM_LATENCY_THRESHOLD: float = 3.0
+    # How long past its TTL a cached group list may still be served during an outage
+    BLUEGROUPS_STALE_GRACE: int = 3600
+
+    # Roles resolved at login are re-checked against BlueGroups after this many seconds
+    ROLE_CLAIM_TTL: int = 900
     
     class Config:
         env_file = ".env"
@@ -1,12 +1,36 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import and_
 from app.models.activity import Activity, OfferingActivity
+from app.models.offering import Offering
 from app.schemas.activity import ActivityCreate, ActivityUpdate, OfferingActivityCreate
 from typing import List, Optional
+from app.pagination import Page, PageRequest, paginate
+from app.fieldsets import load_fields
+from app.crud.writes import insert_on_conflict, insert_returning, update_returning
+from app.crud.rollups import affected_offerings, offering_totals
 
-def get_all_activities(db: Session, skip: int = 0, limit: int = 100) -> List[Activity]:
-    """Get all activities regardless of offering association"""
-    return db.query(Activity).offset(skip).limit(limit).all()
+# ?sort= keys for the activity library (each key unique and indexed)
+ACTIVITY_SORTS = {"activity_name": (Activity.activity_name, Activity.activity_id)}
+
+# ?fields= presets for the activity library: what the library grid shows
+ACTIVITY_FIELDSETS = {
+    "summary": (
+        "activity_id", "activity_name", "category", "brand_id", "product_id",
+        "duration_weeks", "effort_hours", "fixed_price"
+    )
+}
+
+def _library_query(db: Session, page: Optional[PageRequest], fields: Optional[List[str]]):
+    return db.query(Activity).options(*load_fields(Activity, fields, *(page.columns if page else ())))
+
+def get_all_activities(
+    db: Session,
+    page: Optional[PageRequest] = None,
+    skip: int = 0,
+    fields: Optional[List[str]] = None
+) -> Page[Activity]:
+    """Get all activities regardless of offering association (skip is the legacy OFFSET paging)"""
+    return paginate(_library_query(db, page, fields), page, skip)
 
 def get_activities_by_offering(db: Session, offering_id: str) -> List[dict]:
     """Get all activities for a specific offering with relationship data"""
@@ -51,12 +75,16 @@ def get_activities_by_offering(db: Session, offering_id: str) -> List[dict]:
     
     return activities
 
-def get_unassigned_activities(db: Session) -> List[Activity]:
+def get_unassigned_activities(
+    db: Session,
+    page: Optional[PageRequest] = None,
+    fields: Optional[List[str]] = None
+) -> Page[Activity]:
     """Get activities that are not assigned to any offering"""
     subquery = db.query(OfferingActivity.activity_id).distinct()
-    return db.query(Activity).filter(
+    return paginate(_library_query(db, page, fields).filter(
         ~Activity.activity_id.in_(subquery)
-    ).all()
+    ), page)
 
 def get_activity_by_id(db: Session, activity_id: str) -> Optional[Activity]:
     """Get a single activity by ID"""
@@ -64,25 +92,12 @@ def get_activity_by_id(db: Session, activity_id: str) -> Optional[Activity]:
 
 def create_activity(db: Session, activity: ActivityCreate) -> Activity:
     """Create a new standalone activity"""
-    db_activity = Activity(**activity.dict())
-    db.add(db_activity)
-    db.commit()
-    db.refresh(db_activity)
-    return db_activity
+    return insert_returning(db, Activity, activity.dict())
 
 def update_activity(db: Session, activity_id: str, activity_update: ActivityUpdate) -> Optional[Activity]:
     """Update an existing activity"""
-    db_activity = get_activity_by_id(db, activity_id)
-    if not db_activity:
-        return None
-    
     update_data = activity_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_activity, field, value)
-    
-    db.commit()
-    db.refresh(db_activity)
-    return db_activity
+    return update_returning(db, Activity, update_data, Activity.activity_id == activity_id)
 
 def delete_activity(db: Session, activity_id: str) -> bool:
     """Delete an activity (will also remove all offering associations due to CASCADE)"""
@@ -90,20 +105,22 @@ def delete_activity(db: Session, activity_id: str) -> bool:
     if not db_activity:
         return False
     
+    # Found before the delete cascades away the links
+    offering_ids = affected_offerings(db, activity_id=activity_id)
     db.delete(db_activity)
     db.commit()
+    offering_totals.invalidate(offering_ids)
     return True
 
 def link_activity_to_offering(
     db: Session, 
     offering_activity: OfferingActivityCreate
-) -> OfferingActivity:
-    """Create a relationship between an offering and an activity"""
-    db_link = OfferingActivity(**offering_activity.dict())
-    db.add(db_link)
-    db.commit()
-    db.refresh(db_link)
-    return db_link
+) -> Optional[OfferingActivity]:
+    """Create a relationship between an offering and an activity; None if they are already linked"""
+    created = insert_on_conflict(db, OfferingActivity, offering_activity.dict(), ["offering_id", "activity_id"])
+    if created:
+        offering_totals.invalidate([created.offering_id])
+    return created
 
 def unlink_activity_from_offering(
     db: Session,
@@ -118,6 +135,8 @@ def unlink_activity_from_offering(
         )
     ).delete()
     db.commit()
+    if result:
+        offering_totals.invalidate([offering_id])
     return result > 0
 
 def update_activity_sequence(
@@ -128,42 +147,20 @@ def update_activity_sequence(
     is_mandatory: Optional[bool] = None
 ) -> Optional[OfferingActivity]:
     """Update sequence and mandatory flag for an activity in a specific offering"""
-    db_link = db.query(OfferingActivity).filter(
-        and_(
-            OfferingActivity.offering_id == offering_id,
-            OfferingActivity.activity_id == activity_id
-        )
-    ).first()
-    
-    if not db_link:
-        return None
-    
-    db_link.sequence = sequence
+    update_data = {"sequence": sequence}
     if is_mandatory is not None:
-        db_link.is_mandatory = is_mandatory
-    
-    db.commit()
-    db.refresh(db_link)
-    return db_link
-
-def get_offerings_for_activity(db: Session, activity_id: str) -> List[dict]:
-    """Get all offerings that use a specific activity"""
-    from app.models.offering import Offering
+        update_data["is_mandatory"] = is_mandatory
     
-    results = db.query(Offering, OfferingActivity).join(
-        OfferingActivity, Offering.offering_id == OfferingActivity.offering_id
-    ).filter(
+    return update_returning(
+        db, OfferingActivity, update_data,
+        OfferingActivity.offering_id == offering_id,
         OfferingActivity.activity_id == activity_id
-    ).all()
-    
-    offerings = []
-    for offering, offering_activity in results:
-        offering_dict = {
-            "offering_id": offering.offering_id,
-            "offering_name": offering.offering_name,
-            "sequence": offering_activity.sequence,
-            "is_mandatory": offering_activity.is_mandatory
-        }
-        offerings.append(offering_dict)
-    
-    return offerings
\ No newline at end of file
+    )
+
+def get_activity_with_offerings(db: Session, activity_id: str) -> Optional[Activity]:
+    """Get a single activity with its offering links (and each offering's id and name) loaded"""
+    return db.query(Activity).options(
+        selectinload(Activity.offerings).joinedload(OfferingActivity.offering).load_only(
+            Offering.offering_id, Offering.offering_name
+        )
+    ).filter(Activity.activity_id == activity_id).first()
\ No newline at end of file
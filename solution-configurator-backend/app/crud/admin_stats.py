@@ -0,0 +1,64 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import Dict
+
+from app.models.brand import Brand
+from app.models.product import Product
+from app.models.offering import Offering
+from app.models.country import Country
+from app.models.activity import Activity
+from app.models.pricing import PricingDetail
+from app.models.staffing import Staffing
+from app.models.wbs import WBS
+
+
+def get_admin_stats(db: Session) -> Dict[str, int]:
+    """Get the number of rows of each admin entity"""
+    return {
+        "totalBrands": db.query(func.count(Brand.brand_id)).scalar() or 0,
+        "totalProducts": db.query(func.count(Product.product_id)).scalar() or 0,
+        "totalOfferings": db.query(func.count(Offering.offering_id)).scalar() or 0,
+        "totalCountries": db.query(func.count(Country.country_id)).scalar() or 0,
+        "totalActivities": db.query(func.count(Activity.activity_id)).scalar() or 0,
+        "totalPricing": db.query(func.count(PricingDetail.pricing_id)).scalar() or 0,
+        "totalStaffing": db.query(func.count(Staffing.staffing_id)).scalar() or 0,
+        "totalWBS": db.query(func.count(WBS.wbs_id)).scalar() or 0,
+    }
+
+
+def get_detailed_admin_stats(db: Session) -> Dict[str, Dict]:
+    """Get the admin entity counts grouped by area, with offerings by SaaS type and products by brand"""
+    counts = get_admin_stats(db)
+
+    offerings_by_saas_type = db.query(
+        Offering.saas_type,
+        func.count(Offering.offering_id)
+    ).group_by(Offering.saas_type).all()
+
+    products_by_brand = db.query(
+        Product.brand_id,
+        func.count(Product.product_id)
+    ).group_by(Product.brand_id).all()
+
+    return {
+        "catalog": {
+            "brands": counts["totalBrands"],
+            "products": counts["totalProducts"],
+            "offerings": counts["totalOfferings"],
+            "countries": counts["totalCountries"]
+        },
+        "configuration": {
+            "activities": counts["totalActivities"],
+            "pricing": counts["totalPricing"],
+            "staffing": counts["totalStaffing"],
+            "wbs": counts["totalWBS"]
+        },
+        "breakdowns": {
+            "offeringsBySaasType": {
+                saas_type: count for saas_type, count in offerings_by_saas_type
+            },
+            "productsByBrand": {
+                brand_id: count for brand_id, count in products_by_brand
+            }
+        }
+    }
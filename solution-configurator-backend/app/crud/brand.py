@@ -1,14 +1,21 @@
 from sqlalchemy.orm import Session
 from app.models.brand import Brand
 from app.schemas.brand import BrandCreate, BrandUpdate
-from typing import List, Optional
+from typing import Optional
+from app.pagination import Page, PageRequest, paginate
+from app.crud.writes import insert_returning, update_returning
+from app.crud.rollups import offering_totals
 from datetime import datetime
 import uuid
 
 
-def get_brands(db: Session) -> List[Brand]:
-    """Get all brands"""
-    return db.query(Brand).all()
+# ?sort= keys for get_brands (each key unique and indexed)
+BRAND_SORTS = {"brand_name": (Brand.brand_name,)}
+
+
+def get_brands(db: Session, page: Optional[PageRequest] = None) -> Page[Brand]:
+    """Get all brands, or one page of them"""
+    return paginate(db.query(Brand), page)
 
 
 def get_brand_by_id(db: Session, brand_id: str) -> Optional[Brand]:
@@ -18,31 +25,17 @@ def get_brand_by_id(db: Session, brand_id: str) -> Optional[Brand]:
 
 def create_brand(db: Session, brand: BrandCreate) -> Brand:
     """Create a new brand"""
-    db_brand = Brand(
+    return insert_returning(db, Brand, dict(
         brand_id=uuid.uuid4(),
         brand_name=brand.brand_name,
         description=brand.description
-    )
-    db.add(db_brand)
-    db.commit()
-    db.refresh(db_brand)
-    return db_brand
+    ))
 
 
 def update_brand(db: Session, brand_id: str, brand: BrandUpdate) -> Optional[Brand]:
     """Update an existing brand"""
-    db_brand = db.query(Brand).filter(Brand.brand_id == brand_id).first()
-    
-    if not db_brand:
-        return None
-    
     update_data = brand.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_brand, field, value)
-    
-    db.commit()
-    db.refresh(db_brand)
-    return db_brand
+    return update_returning(db, Brand, update_data, Brand.brand_id == brand_id)
 
 
 def delete_brand(db: Session, brand_id: str) -> bool:
@@ -54,4 +47,6 @@ def delete_brand(db: Session, brand_id: str) -> bool:
     
     db.delete(db_brand)
     db.commit()
+    # The delete cascades through offerings and activities; rare enough to drop every rollup
+    offering_totals.clear()
     return True
\ No newline at end of file
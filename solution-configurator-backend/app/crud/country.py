@@ -1,13 +1,19 @@
 from sqlalchemy.orm import Session
 from app.models.country import Country
 from app.schemas.country import CountryCreate, CountryUpdate
-from typing import List, Optional
+from typing import Optional
+from app.pagination import Page, PageRequest, paginate
+from app.crud.writes import insert_returning, update_returning
 import uuid
 
 
-def get_countries(db: Session) -> List[Country]:
-    """Get all countries"""
-    return db.query(Country).all()
+# ?sort= keys for get_countries (each key unique and indexed)
+COUNTRY_SORTS = {"country_name": (Country.country_name,)}
+
+
+def get_countries(db: Session, page: Optional[PageRequest] = None) -> Page[Country]:
+    """Get all countries, or one page of them"""
+    return paginate(db.query(Country), page)
 
 
 def get_country_by_id(db: Session, country_id: str) -> Optional[Country]:
@@ -17,30 +23,16 @@ def get_country_by_id(db: Session, country_id: str) -> Optional[Country]:
 
 def create_country(db: Session, country: CountryCreate) -> Country:
     """Create a new country"""
-    db_country = Country(
+    return insert_returning(db, Country, dict(
         country_id=uuid.uuid4(),
         country_name=country.country_name
-    )
-    db.add(db_country)
-    db.commit()
-    db.refresh(db_country)
-    return db_country
+    ))
 
 
 def update_country(db: Session, country_id: str, country: CountryUpdate) -> Optional[Country]:
     """Update an existing country"""
-    db_country = db.query(Country).filter(Country.country_id == country_id).first()
-    
-    if not db_country:
-        return None
-    
     update_data = country.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_country, field, value)
-    
-    db.commit()
-    db.refresh(db_country)
-    return db_country
+    return update_returning(db, Country, update_data, Country.country_id == country_id)
 
 
 def delete_country(db: Session, country_id: str) -> bool:
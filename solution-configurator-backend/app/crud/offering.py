@@ -1,14 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Numeric, cast, func, literal_column, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session, with_expression
 from typing import List, Optional
 from app.models.offering import Offering
 from app.schemas.offering import OfferingCreate, OfferingUpdate
+from app.pagination import Page, PageRequest, paginate
+from app.fieldsets import load_fields
+from app.crud.writes import insert_returning, update_returning
+from app.crud.rollups import offering_totals
+from app.cache import TTLCache
 from datetime import datetime
 import uuid
 
 
-def get_offerings_by_product(db: Session, product_id: str) -> List[Offering]:
-    """Get all offerings for a specific product"""
-    return db.query(Offering).filter(Offering.product_id == product_id).all()
+# ?fields= presets for the offering lists: what the catalogue grid and solution builder show
+OFFERING_FIELDSETS = {
+    "summary": ("offering_id", "product_id", "offering_name", "saas_type", "brand", "industry", "duration", "sale_price")
+}
+
+
+def get_offerings_by_product(db: Session, product_id: str, fields: Optional[List[str]] = None) -> List[Offering]:
+    """Get all offerings for a specific product, loading only the given columns if fields is set"""
+    return db.query(Offering).options(*load_fields(Offering, fields)).filter(
+        Offering.product_id == product_id
+    ).all()
 
 
 def get_offering_by_id(db: Session, offering_id: str) -> Optional[Offering]:
@@ -16,24 +31,94 @@ def get_offering_by_id(db: Session, offering_id: str) -> Optional[Offering]:
     return db.query(Offering).filter(Offering.offering_id == offering_id).first()
 
 
+# ?sort= keys for search_offerings (each key unique and indexed). "relevance"
+# needs a query: search_offerings puts the rank in place of the placeholder.
+OFFERING_SORTS = {
+    "offering_name": (Offering.offering_name, Offering.offering_id),
+    "relevance": (literal_column("0", Numeric).label("search_rank"), Offering.offering_id),
+}
+
+# ts_rank weights of the D, C, B and A parts of Offering.search_vector
+SEARCH_WEIGHTS = literal_column("'{0.1, 0.2, 0.4, 1.0}'::real[]")
+
+
+def _like_pattern(query: str) -> str:
+    """ILIKE pattern matching query anywhere, with its own %, _ and \\ taken literally"""
+    return "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+# Whether pg_trgm is installed, per database URL. Rechecked now and then, so
+# installing the extension (migration b7d41c9e2f60) takes effect without a restart.
+_trigram_support = TTLCache(max_entries=16)
+TRIGRAM_CHECK_TTL = 300
+
+
+def _has_trigrams(db: Session) -> bool:
+    """Whether the database has the pg_trgm extension"""
+    url = str(db.get_bind().url)
+    installed = _trigram_support.get(url)
+    if installed is None:
+        installed = db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar() is not None
+        _trigram_support.set(url, installed, ttl=TRIGRAM_CHECK_TTL)
+    return installed
+
+
+def _search(db: Session, query: str):
+    """
+    (filter, sort key) for a search. Rows match on full text (stemmed words,
+    websearch syntax), on a substring of the name, tag line or summary, or, with
+    pg_trgm, on a name word close to the query (typos); the pg_trgm indexes
+    serve the last two. Relevance is ts_rank over the weighted fields, plus,
+    with pg_trgm, a D-weight share of the name's trigram similarity so typo-only
+    matches still order sensibly. Without pg_trgm there are no typo matches and
+    the substring matches are unindexed. The key is the negated relevance, so
+    ascending puts the best match first, as numeric so a cursor holds it exactly.
+    """
+    tsquery = func.websearch_to_tsquery(cast("english", REGCONFIG), query)
+    pattern = _like_pattern(query)
+    matches = (
+        Offering.search_vector.op("@@")(tsquery) |
+        Offering.offering_name.ilike(pattern) |
+        Offering.tag_line.ilike(pattern) |
+        Offering.offering_summary.ilike(pattern)
+    )
+    relevance = func.ts_rank(SEARCH_WEIGHTS, Offering.search_vector, tsquery)
+    if _has_trigrams(db):
+        matches = matches | Offering.offering_name.op("%>")(query)
+        relevance = relevance + func.word_similarity(query, Offering.offering_name) * 0.1
+    return matches, cast(-relevance, Numeric)
+
+
 def search_offerings(
     db: Session,
     query: Optional[str] = None,
     saas_type: Optional[str] = None,
     industry: Optional[str] = None,
     client_type: Optional[str] = None,
-    framework_category: Optional[str] = None
-) -> List[Offering]:
-    """Search offerings with multiple filters"""
+    framework_category: Optional[str] = None,
+    page: Optional[PageRequest] = None,
+    fields: Optional[List[str]] = None
+) -> Page[Offering]:
+    """
+    Search offerings with multiple filters, returning all matches or one page of
+    them. With sort "relevance" (which needs a query) the best matches come first.
+    """
     db_query = db.query(Offering)
-    
+    sort_columns = page.columns if page else ()
+
     if query:
-        db_query = db_query.filter(
-            (Offering.offering_name.ilike(f"%{query}%")) |
-            (Offering.offering_summary.ilike(f"%{query}%")) |
-            (Offering.tag_line.ilike(f"%{query}%"))
-        )
-    
+        matches, rank = _search(db, query)
+        db_query = db_query.filter(matches)
+        if page and page.sort == "relevance":
+            # The rank replaces the placeholder key; the next cursor reads it from search_rank
+            page = PageRequest(
+                page.sort, [rank.label("search_rank"), Offering.offering_id], page.limit, page.descending, page.after
+            )
+            db_query = db_query.options(with_expression(Offering.search_rank, rank))
+            sort_columns = [Offering.offering_id]
+
+    db_query = db_query.options(*load_fields(Offering, fields, *sort_columns))
+
     if saas_type:
         db_query = db_query.filter(Offering.saas_type == saas_type)
     
@@ -46,14 +131,14 @@ def search_offerings(
     if framework_category:
         db_query = db_query.filter(Offering.framework_category == framework_category)
     
-    return db_query.all()
+    return paginate(db_query, page)
 
 
 # ✅ ADD THESE NEW FUNCTIONS
 
 def create_offering(db: Session, offering: OfferingCreate) -> Offering:
     """Create a new offering"""
-    db_offering = Offering(
+    return insert_returning(db, Offering, dict(
         offering_id=uuid.uuid4(),
         offering_name=offering.offering_name,
         product_id=offering.product_id,
@@ -92,32 +177,15 @@ def create_offering(db: Session, offering: OfferingCreate) -> Offering:
         part_numbers=offering.part_numbers,
         created_on=datetime.utcnow(),
         updated_on=datetime.utcnow()
-    )
-    
-    db.add(db_offering)
-    db.commit()
-    db.refresh(db_offering)
-    return db_offering
+    ))
 
 
 def update_offering(db: Session, offering_id: str, offering: OfferingUpdate) -> Optional[Offering]:
     """Update an existing offering"""
-    db_offering = db.query(Offering).filter(Offering.offering_id == offering_id).first()
-    
-    if not db_offering:
-        return None
-    
     # Update only the fields that are provided (not None)
     update_data = offering.dict(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(db_offering, field, value)
-    
-    db_offering.updated_on = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(db_offering)
-    return db_offering
+    update_data["updated_on"] = datetime.utcnow()
+    return update_returning(db, Offering, update_data, Offering.offering_id == offering_id)
 
 
 def delete_offering(db: Session, offering_id: str) -> bool:
@@ -129,4 +197,5 @@ def delete_offering(db: Session, offering_id: str) -> bool:
     
     db.delete(db_offering)
     db.commit()
+    offering_totals.invalidate([offering_id])
     return True
\ No newline at end of file
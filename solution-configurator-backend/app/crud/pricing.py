@@ -1,10 +1,308 @@
+from collections import defaultdict
+import numpy as np
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
-from app.models.pricing import PricingDetail
-from app.schemas.pricing import PricingDetailCreate, PricingDetailUpdate
-from typing import Optional, List
+from app.models.activity import Activity, OfferingActivity
+from app.models.activity_wbs import ActivityWBS
+from app.models.pricing import PricingDetail, RateCardVersion
+from app.models.staffing import Staffing
+from app.models.wbs_staffing import WBSStaffing
+from app.schemas.pricing import PricingDetailCreate, PricingDetailUpdate, SolutionPriceRequest
+from typing import Any, Dict, Iterable, Optional, List, Sequence, Tuple
+from app.pagination import Page, PageRequest, paginate
+from app.crud.writes import insert_on_conflict, update_returning
+from app.crud.rollups import affected_offerings, offering_totals, solution_prices
+from app.rate_card import RateCard
+import hashlib
+import json
 import uuid
 
 
+def _pricing_with_staffing_query(db: Session):
+    """Pricing joined with the staffing role, band and country it prices"""
+    return db.query(
+        PricingDetail.pricing_id,
+        PricingDetail.staffing_id,
+        PricingDetail.cost,
+        PricingDetail.sale_price,
+        Staffing.country,
+        Staffing.role,
+        Staffing.band
+    ).join(
+        Staffing,
+        PricingDetail.staffing_id == Staffing.staffing_id
+    )
+
+
+def _pricing_row_to_dict(row) -> Dict[str, Any]:
+    return {
+        "pricing_id": str(row.pricing_id),
+        "staffing_id": str(row.staffing_id),
+        "cost": float(row.cost) if row.cost else None,
+        "sale_price": float(row.sale_price) if row.sale_price else None,
+        "country": row.country,
+        "role": row.role,
+        "band": row.band
+    }
+
+
+# ?sort= keys for get_all_pricing_with_staffing, in the order of the (1:1) staffing records priced
+PRICING_SORTS = {"country": (Staffing.country, Staffing.role, Staffing.band)}
+
+
+def get_all_pricing_with_staffing(db: Session, page: Optional[PageRequest] = None) -> Page[Dict[str, Any]]:
+    """Get all pricing details with staffing information (role, band, country), or one page of them"""
+    result = paginate(_pricing_with_staffing_query(db), page)
+    return Page([_pricing_row_to_dict(row) for row in result.items], result.next_cursor)
+
+
+def get_pricing_with_staffing(db: Session, pricing_id: str) -> Optional[Dict[str, Any]]:
+    """Get one pricing detail with staffing information"""
+    row = _pricing_with_staffing_query(db).filter(PricingDetail.pricing_id == pricing_id).first()
+    return _pricing_row_to_dict(row) if row else None
+
+
+def _offering_totals_rows(db: Session, offering_ids: Sequence, country: Optional[str] = None):
+    """
+    The rollup of offering_ids in one statement: it walks offering_activities ->
+    activity_wbs -> wbs_staffing -> staffing_details -> pricing_details and sums
+    hours x rate in numeric, so the totals are exact. GROUPING SETS gives a row
+    per offering and staffing role (country, role, band) and a totals row per
+    offering (is_total). Offerings with nothing staffed have no rows.
+    """
+    hours = func.coalesce(WBSStaffing.hours, 0)
+    group = (
+        Staffing.staffing_id, Staffing.country, Staffing.role, Staffing.band,
+        PricingDetail.pricing_id, PricingDetail.cost, PricingDetail.sale_price
+    )
+    query = db.query(
+        OfferingActivity.offering_id,
+        *group,
+        func.grouping(Staffing.staffing_id).label("is_total"),
+        func.sum(hours).label("hours"),
+        func.sum(hours * PricingDetail.cost).label("total_cost"),
+        func.sum(hours * PricingDetail.sale_price).label("total_sale_price")
+    ).select_from(OfferingActivity).join(
+        ActivityWBS, OfferingActivity.activity_id == ActivityWBS.activity_id
+    ).join(
+        WBSStaffing, ActivityWBS.wbs_id == WBSStaffing.wbs_id
+    ).join(
+        Staffing, WBSStaffing.staffing_id == Staffing.staffing_id
+    ).outerjoin(
+        PricingDetail, Staffing.staffing_id == PricingDetail.staffing_id
+    ).filter(
+        OfferingActivity.offering_id.in_(offering_ids)
+    )
+    if country:
+        query = query.filter(Staffing.country == country)
+    return query.group_by(
+        func.grouping_sets(tuple_(OfferingActivity.offering_id, *group), tuple_(OfferingActivity.offering_id))
+    ).order_by(
+        OfferingActivity.offering_id, Staffing.country, Staffing.role, Staffing.band
+    ).all()
+
+
+def _totals(offering_id, rows) -> Dict[str, Any]:
+    """Response for one offering from its rollup rows; unpriced roles count towards total_hours only"""
+    totals = next((row for row in rows if row.is_total), None)
+    return {
+        "offering_id": offering_id,
+        "total_hours": int(totals.hours or 0) if totals else 0,
+        "total_cost": float(totals.total_cost or 0) if totals else 0,
+        "total_sale_price": float(totals.total_sale_price or 0) if totals else 0,
+        "breakdown": [
+            {
+                "staffing_id": row.staffing_id,
+                "country": row.country,
+                "role": row.role,
+                "band": row.band,
+                "hours": int(row.hours),
+                "cost_per_hour": float(row.cost) if row.cost else 0,
+                "sale_price_per_hour": float(row.sale_price) if row.sale_price else 0,
+                "total_cost": float(row.total_cost or 0),
+                "total_sale_price": float(row.total_sale_price or 0)
+            }
+            for row in rows if not row.is_total and row.pricing_id is not None
+        ]
+    }
+
+
+def get_offerings_totals(
+    db: Session, offering_ids: Sequence[uuid.UUID], country: Optional[str] = None
+) -> Dict[uuid.UUID, Dict[str, Any]]:
+    """
+    Total hours, cost and sale price of each offering, with a breakdown per
+    staffing role, keyed by the offering ids as given; one query for any number.
+    With country, only that country's roles are counted.
+    """
+    rows_by_offering = defaultdict(list)
+    for row in _offering_totals_rows(db, offering_ids, country):
+        rows_by_offering[row.offering_id].append(row)
+    return {
+        offering_id: _totals(offering_id, rows_by_offering[offering_id])
+        for offering_id in offering_ids
+    }
+
+
+def get_offering_totals(db: Session, offering_id: uuid.UUID) -> Dict[str, Any]:
+    """Total hours, cost and sale price of an offering, with a breakdown per staffing role"""
+    return get_offerings_totals(db, [offering_id])[offering_id]
+
+
+def get_cached_offering_totals(db: Session, offering_id: uuid.UUID) -> Dict[str, Any]:
+    """get_offering_totals, served from the offering totals cache when it holds them"""
+    return offering_totals.get(offering_id, lambda: get_offering_totals(db, offering_id))
+
+
+def get_cached_offerings_totals(
+    db: Session, offering_ids: Sequence[uuid.UUID], country: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Totals of each offering (in the order given, duplicates dropped): cached
+    ones from the offering totals cache, the rest from one get_offerings_totals
+    query. The cache holds whole-offering totals, so a country filter bypasses it.
+    """
+    offering_ids = list(dict.fromkeys(offering_ids))
+    if country:
+        totals = get_offerings_totals(db, offering_ids, country)
+    else:
+        totals = offering_totals.get_many(offering_ids, lambda missing: get_offerings_totals(db, missing))
+    return [totals[offering_id] for offering_id in offering_ids]
+
+
+# (rate_card_version.version, RateCard) of the rate card last loaded; see get_rate_card
+_rate_card: Tuple[Optional[int], Optional[RateCard]] = (None, None)
+
+
+def get_rate_card(db: Session, staffing_ids: Iterable = ()) -> RateCard:
+    """
+    Every staffing role with its pricing, as a RateCard in breakdown order
+    (country, role, band). Loaded in one query and kept while the database's
+    rate_card_version stays the same: its triggers bump it on every write to
+    staffing_details or pricing_details, through this worker or any other.
+    Checking it is one primary key lookup. Also reloaded if the card lacks one
+    of staffing_ids.
+    """
+    global _rate_card
+    version = db.query(RateCardVersion.version).scalar()
+    loaded, card = _rate_card
+    if card is None or loaded != version or any(staffing_id not in card for staffing_id in staffing_ids):
+        card = RateCard(db.query(
+            Staffing.staffing_id, Staffing.country, Staffing.role, Staffing.band,
+            PricingDetail.pricing_id, PricingDetail.cost, PricingDetail.sale_price
+        ).outerjoin(
+            PricingDetail, Staffing.staffing_id == PricingDetail.staffing_id
+        ).order_by(
+            Staffing.country, Staffing.role, Staffing.band, Staffing.staffing_id
+        ).all())
+        _rate_card = (version, card)
+    return card
+
+
+def _solution_totals(card: RateCard, hours: int, cost: int, sale_price: int, items) -> Dict[str, Any]:
+    """Totals (hours, and cost and sale price in cents) with a breakdown of the line items of one row"""
+    return {
+        "total_hours": int(hours),
+        "total_cost": int(cost) / 100,
+        "total_sale_price": int(sale_price) / 100,
+        "breakdown": [
+            {
+                "staffing_id": role.staffing_id,
+                "country": role.country,
+                "role": role.role,
+                "band": role.band,
+                "hours": role_hours,
+                "priced": role.pricing_id is not None,
+                "cost_per_hour": float(role.cost) if role.cost else 0,
+                "sale_price_per_hour": float(role.sale_price) if role.sale_price else 0,
+                "total_cost": role_cost / 100,
+                "total_sale_price": role_sale_price / 100
+            }
+            for role, role_hours, role_cost, role_sale_price in (
+                (card.roles[position], role_hours, role_cost, role_sale_price)
+                for position, role_hours, role_cost, role_sale_price in items
+            ) if role_hours
+        ]
+    }
+
+
+def get_solution_price(db: Session, selection: SolutionPriceRequest) -> Optional[Dict[str, Any]]:
+    """
+    Price a selection of activities at the pricing_details rates: totals per
+    activity (in the order selected) and combined, each with a breakdown per
+    staffing role; unpriced roles cost nothing. An activity's hours per role
+    are those its WBS items staff, with the selection's overrides replacing
+    them (0 drops the role). One query for the hours and one to check the rate
+    card version, plus one to reload the card when it changed (see
+    get_rate_card); the hours are priced in integer cents by the RateCard kernel.
+    None if the selection names an activity or staffing role that does not exist.
+    """
+    activity_ids = {activity.activity_id for activity in selection.activities}
+    staffed = {}
+    for row in db.query(
+        Activity.activity_id,
+        WBSStaffing.staffing_id,
+        func.sum(func.coalesce(WBSStaffing.hours, 0)).label("hours")
+    ).select_from(Activity).outerjoin(
+        ActivityWBS, Activity.activity_id == ActivityWBS.activity_id
+    ).outerjoin(
+        WBSStaffing, ActivityWBS.wbs_id == WBSStaffing.wbs_id
+    ).filter(
+        Activity.activity_id.in_(activity_ids)
+    ).group_by(Activity.activity_id, WBSStaffing.staffing_id):
+        # Every activity that exists has a row, an unstaffed one with staffing_id NULL
+        hours = staffed.setdefault(row.activity_id, {})
+        if row.staffing_id is not None:
+            hours[row.staffing_id] = int(row.hours)
+    if len(staffed) < len(activity_ids):
+        return None
+
+    selected = [{**staffed[activity.activity_id], **activity.hours} for activity in selection.activities]
+    card = get_rate_card(db, set().union(*selected))
+    if any(staffing_id not in card for hours_by_role in selected for staffing_id in hours_by_role):
+        return None
+    if selection.country:
+        selected = [
+            {
+                staffing_id: hours for staffing_id, hours in hours_by_role.items()
+                if card.roles[card.index[staffing_id]].country == selection.country
+            }
+            for hours_by_role in selected
+        ]
+
+    hours = card.staffed_from_dicts(selected)
+    total_hours, cost, sale_price = card.totals(hours)
+    items = [[] for _ in selected]
+    for row, *item in zip(*(column.tolist() for column in card.line_items(hours))):
+        items[row].append(item)
+    # The whole selection is one row
+    combined = card.line_items(hours._replace(row=np.zeros_like(hours.row), rows=1))
+
+    activities = [
+        {"activity_id": activity.activity_id, **_solution_totals(card, total_hours[n], cost[n], sale_price[n], items[n])}
+        for n, activity in enumerate(selection.activities)
+    ]
+    return {
+        "activities": activities,
+        **_solution_totals(
+            card, total_hours.sum(), cost.sum(), sale_price.sum(),
+            zip(*(column.tolist() for column in combined[1:]))
+        )
+    }
+
+
+def get_cached_solution_price(db: Session, selection: SolutionPriceRequest) -> Optional[Dict[str, Any]]:
+    """
+    get_solution_price, memoized by a hash of the selection. The hash covers the
+    offering totals cache generation, which every pricing-relevant write bumps,
+    so a write retires every memoized price at once.
+    """
+    key = hashlib.sha256(json.dumps(
+        [offering_totals.generation, selection.model_dump(mode="json")], sort_keys=True
+    ).encode()).hexdigest()
+    return solution_prices.get(key, lambda: get_solution_price(db, selection))
+
+
 def get_pricing_by_id(db: Session, pricing_id: str) -> Optional[PricingDetail]:
     """Get pricing detail by ID"""
     return db.query(PricingDetail).filter(PricingDetail.pricing_id == pricing_id).first()
@@ -20,18 +318,17 @@ def get_all_pricing(db: Session) -> List[PricingDetail]:
     return db.query(PricingDetail).all()
 
 
-def create_pricing(db: Session, pricing: PricingDetailCreate) -> PricingDetail:
-    """Create a new pricing detail"""
-    db_pricing = PricingDetail(
+def create_pricing(db: Session, pricing: PricingDetailCreate) -> Optional[PricingDetail]:
+    """Create a new pricing detail; None if the staffing record already has pricing"""
+    created = insert_on_conflict(db, PricingDetail, dict(
         pricing_id=uuid.uuid4(),
         staffing_id=pricing.staffing_id,
         cost=pricing.cost,
         sale_price=pricing.sale_price
-    )
-    db.add(db_pricing)
-    db.commit()
-    db.refresh(db_pricing)
-    return db_pricing
+    ), ["staffing_id"])
+    if created:
+        offering_totals.invalidate(affected_offerings(db, staffing_id=created.staffing_id))
+    return created
 
 
 def update_pricing(
@@ -40,20 +337,18 @@ def update_pricing(
     pricing: PricingDetailUpdate
 ) -> Optional[PricingDetail]:
     """Update an existing pricing detail"""
-    db_pricing = db.query(PricingDetail).filter(
-        PricingDetail.pricing_id == pricing_id
-    ).first()
-    
-    if not db_pricing:
-        return None
-    
     update_data = pricing.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_pricing, field, value)
-    
-    db.commit()
-    db.refresh(db_pricing)
-    return db_pricing
+    # Moving the price to another staffing role changes the rollups that use either role
+    moved_from = None
+    if "staffing_id" in update_data:
+        moved_from = db.query(PricingDetail.staffing_id).filter(PricingDetail.pricing_id == pricing_id).scalar()
+    updated = update_returning(db, PricingDetail, update_data, PricingDetail.pricing_id == pricing_id)
+    if updated and update_data:
+        affected = affected_offerings(db, staffing_id=updated.staffing_id)
+        if moved_from is not None and moved_from != updated.staffing_id:
+            affected += affected_offerings(db, staffing_id=moved_from)
+        offering_totals.invalidate(affected)
+    return updated
 
 
 def delete_pricing(db: Session, pricing_id: str) -> bool:
@@ -67,4 +362,5 @@ def delete_pricing(db: Session, pricing_id: str) -> bool:
     
     db.delete(db_pricing)
     db.commit()
+    offering_totals.invalidate(affected_offerings(db, staffing_id=db_pricing.staffing_id))
     return True
\ No newline at end of file
@@ -2,12 +2,19 @@ from sqlalchemy.orm import Session
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
 from typing import List, Optional
+from app.pagination import Page, PageRequest, paginate
+from app.crud.writes import insert_returning, update_returning
+from app.crud.rollups import offering_totals
 import uuid
 
 
-def get_all_products(db: Session) -> List[Product]:
-    """Get all products"""
-    return db.query(Product).all()
+# ?sort= keys for get_all_products (each key unique and indexed)
+PRODUCT_SORTS = {"product_name": (Product.product_name, Product.product_id)}
+
+
+def get_all_products(db: Session, page: Optional[PageRequest] = None) -> Page[Product]:
+    """Get all products, or one page of them"""
+    return paginate(db.query(Product), page)
 
 
 def get_products_by_brand(db: Session, brand_id: str) -> List[Product]:
@@ -20,39 +27,20 @@ def get_product_by_id(db: Session, product_id: str) -> Optional[Product]:
     return db.query(Product).filter(Product.product_id == product_id).first()
 
 
-def get_all_products(db: Session) -> List[Product]:
-    """Get all products"""
-    return db.query(Product).all()
-
-
 def create_product(db: Session, product: ProductCreate) -> Product:
     """Create a new product"""
-    db_product = Product(
+    return insert_returning(db, Product, dict(
         product_id=uuid.uuid4(),
         product_name=product.product_name,
         description=product.description,
         brand_id=product.brand_id
-    )
-    db.add(db_product)
-    db.commit()
-    db.refresh(db_product)
-    return db_product
+    ))
 
 
 def update_product(db: Session, product_id: str, product: ProductUpdate) -> Optional[Product]:
     """Update an existing product"""
-    db_product = db.query(Product).filter(Product.product_id == product_id).first()
-    
-    if not db_product:
-        return None
-    
     update_data = product.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_product, field, value)
-    
-    db.commit()
-    db.refresh(db_product)
-    return db_product
+    return update_returning(db, Product, update_data, Product.product_id == product_id)
 
 
 def delete_product(db: Session, product_id: str) -> bool:
@@ -64,4 +52,6 @@ def delete_product(db: Session, product_id: str) -> bool:
     
     db.delete(db_product)
     db.commit()
+    # The delete cascades through offerings and activities; rare enough to drop every rollup
+    offering_totals.clear()
     return True
\ No newline at end of file
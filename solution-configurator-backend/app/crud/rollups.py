@@ -0,0 +1,128 @@
+import threading
+import uuid
+from typing import Any, Callable, Dict, Hashable, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+from app.config import settings
+from app.metrics import metrics
+from app.models.activity import OfferingActivity
+from app.models.activity_wbs import ActivityWBS
+from app.models.wbs_staffing import WBSStaffing
+
+
+def _key(offering_id: Hashable) -> str:
+    """offering_id in canonical UUID form, however the caller spelled it"""
+    try:
+        return str(uuid.UUID(str(offering_id)))
+    except ValueError:
+        return str(offering_id)
+
+
+class RollupCache:
+    """
+    Computed pricing rollups: offering totals (crud.pricing.get_offering_totals)
+    keyed by offering_id, or solution prices keyed by a hash of the selection.
+
+    The CRUD writes to pricing_details, wbs_staffing, activity_wbs and
+    offering_activities (and the deletes that cascade into them) invalidate
+    the offerings they affect once committed; see affected_offerings. A rollup
+    computed while such a write commits may predate it, so it is returned but
+    not stored. The TTL bounds how long another worker's write can go unseen.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.ttl = ttl
+        self._entries = TTLCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.recomputes = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every invalidate and clear, i.e. by every write a rollup can depend on"""
+        with self._lock:
+            return self._generation
+
+    def get(self, offering_id: Hashable, compute: Callable[[], Any]) -> Any:
+        """The cached rollup of offering_id, or compute() it and cache the result"""
+        return self.get_many([offering_id], lambda missing: {offering_id: compute()})[offering_id]
+
+    def get_many(self, offering_ids: Iterable[Hashable], compute: Callable[[List], Dict]) -> Dict[Hashable, Any]:
+        """
+        Rollups of offering_ids, keyed as given. Those not cached come from one
+        compute(missing ids) call, which returns them keyed the same way, and
+        are cached.
+        """
+        found, missing = {}, []
+        for offering_id in offering_ids:
+            value = self._entries.get(_key(offering_id))
+            if value is None:
+                missing.append(offering_id)
+            else:
+                found[offering_id] = value
+        if missing:
+            with self._lock:
+                generation = self._generation
+            computed = compute(missing)
+            with self._lock:
+                self.recomputes += len(missing)
+                if generation == self._generation:
+                    for offering_id, value in computed.items():
+                        self._entries.set(_key(offering_id), value, self.ttl)
+            found.update(computed)
+        return found
+
+    def invalidate(self, offering_ids: Iterable[Hashable]) -> None:
+        """Drop the rollups of offering_ids; call after the write is committed"""
+        with self._lock:
+            self._generation += 1
+        for offering_id in set(map(_key, offering_ids)):
+            if self._entries.delete(offering_id):
+                with self._lock:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        lookups = stats["hits"] + stats["misses"]
+        with self._lock:
+            return {
+                **stats,
+                "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+                "recomputes": self.recomputes,
+                "invalidations": self.invalidations,
+            }
+
+
+offering_totals = RollupCache(settings.OFFERING_TOTALS_CACHE_MAX_ENTRIES, settings.OFFERING_TOTALS_CACHE_TTL)
+metrics.gauge("pricing.offering_totals_cache", offering_totals.stats)
+# Keyed with offering_totals.generation (see crud.pricing.get_cached_solution_price), so
+# the writes that invalidate offering totals retire these too
+solution_prices = RollupCache(settings.SOLUTION_PRICE_CACHE_MAX_ENTRIES, settings.SOLUTION_PRICE_CACHE_TTL)
+metrics.gauge("pricing.solution_price_cache", solution_prices.stats)
+
+
+def affected_offerings(db: Session, *, activity_id=None, wbs_id=None, staffing_id=None) -> List:
+    """
+    Offerings whose rollup includes the given activity, WBS item or staffing
+    role (pass one), walking the chain up from it to offering_activities
+    """
+    query = db.query(OfferingActivity.offering_id).distinct()
+    if activity_id is not None:
+        query = query.filter(OfferingActivity.activity_id == activity_id)
+    else:
+        query = query.join(ActivityWBS, ActivityWBS.activity_id == OfferingActivity.activity_id)
+        if wbs_id is not None:
+            query = query.filter(ActivityWBS.wbs_id == wbs_id)
+        else:
+            query = query.join(WBSStaffing, WBSStaffing.wbs_id == ActivityWBS.wbs_id).filter(
+                WBSStaffing.staffing_id == staffing_id
+            )
+    return [row.offering_id for row in query]
@@ -2,7 +2,10 @@ from sqlalchemy.orm import Session
 from app.models.activity import Activity
 from app.models.staffing import Staffing
 from app.schemas.staffing import StaffingCreate, StaffingUpdate
-from typing import List, Optional
+from typing import Optional
+from app.pagination import Page, PageRequest, paginate
+from app.crud.writes import insert_on_conflict, update_returning
+from app.crud.rollups import affected_offerings, offering_totals
 import uuid
 from app.models.activity import OfferingActivity
 from app.models.activity_wbs import ActivityWBS
@@ -10,9 +13,13 @@ from app.models.wbs_staffing import WBSStaffing
 from app.models.wbs import WBS
 
 
-def get_all_staffing(db: Session) -> List[Staffing]:
-    """Get all staffing master records"""
-    return db.query(Staffing).all()
+# ?sort= keys for get_all_staffing (each key unique and indexed); "country" is unique_country_role_band_staffing
+STAFFING_SORTS = {"country": (Staffing.country, Staffing.role, Staffing.band)}
+
+
+def get_all_staffing(db: Session, page: Optional[PageRequest] = None) -> Page[Staffing]:
+    """Get all staffing master records, or one page of them"""
+    return paginate(db.query(Staffing), page)
 
 
 def get_staffing_by_id(db: Session, staffing_id: str) -> Optional[Staffing]:
@@ -83,22 +90,14 @@ def get_staffing_by_offering(db: Session, offering_id: str):
 
 
 def create_staffing(db: Session, staffing: StaffingCreate) -> Staffing:
-    """Create a new staffing record"""
-    # Check if combination already exists
-    existing = get_staffing_by_criteria(db, staffing.country, staffing.role, staffing.band)
-    if existing:
-        return existing
-    
-    db_staffing = Staffing(
+    """Create a new staffing record, or return the existing one for the same country, role and band"""
+    created = insert_on_conflict(db, Staffing, dict(
         staffing_id=uuid.uuid4(),
         country=staffing.country,
         role=staffing.role,
         band=staffing.band
-    )
-    db.add(db_staffing)
-    db.commit()
-    db.refresh(db_staffing)
-    return db_staffing
+    ), ["country", "role", "band"])
+    return created or get_staffing_by_criteria(db, staffing.country, staffing.role, staffing.band)
 
 
 def update_staffing(
@@ -107,20 +106,12 @@ def update_staffing(
     staffing: StaffingUpdate
 ) -> Optional[Staffing]:
     """Update an existing staffing record"""
-    db_staffing = db.query(Staffing).filter(
-        Staffing.staffing_id == staffing_id
-    ).first()
-    
-    if not db_staffing:
-        return None
-    
     update_data = staffing.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_staffing, field, value)
-    
-    db.commit()
-    db.refresh(db_staffing)
-    return db_staffing
+    updated = update_returning(db, Staffing, update_data, Staffing.staffing_id == staffing_id)
+    if updated and update_data:
+        # The breakdown lists roles by country, role and band
+        offering_totals.invalidate(affected_offerings(db, staffing_id=staffing_id))
+    return updated
 
 
 def delete_staffing(db: Session, staffing_id: str) -> bool:
@@ -132,6 +123,9 @@ def delete_staffing(db: Session, staffing_id: str) -> bool:
     if not db_staffing:
         return False
     
+    # Found before the delete cascades away the WBS assignments
+    offering_ids = affected_offerings(db, staffing_id=staffing_id)
     db.delete(db_staffing)
     db.commit()
+    offering_totals.invalidate(offering_ids)
     return True
\ No newline at end of file
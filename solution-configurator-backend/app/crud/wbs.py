@@ -4,50 +4,52 @@ from uuid import UUID
 from app.models.wbs import WBS
 from app.models.activity_wbs import ActivityWBS
 from app.schemas.wbs import WBSCreate, WBSUpdate
+from app.pagination import Page, PageRequest, paginate
+from app.crud.writes import insert_on_conflict, insert_returning, update_returning
+from app.crud.rollups import affected_offerings, offering_totals
+
+# ?sort= keys for get_all_wbs (each key unique and indexed)
+WBS_SORTS = {"wbs_id": (WBS.wbs_id,)}
 
 
 def create_wbs(db: Session, wbs: WBSCreate) -> WBS:
-    db_wbs = WBS(**wbs.dict())
-    db.add(db_wbs)
-    db.commit()
-    db.refresh(db_wbs)
-    return db_wbs
+    return insert_returning(db, WBS, wbs.dict())
 
 
 def get_wbs(db: Session, wbs_id: UUID) -> Optional[WBS]:
     return db.query(WBS).filter(WBS.wbs_id == wbs_id).first()
 
 
-def get_all_wbs(db: Session, skip: int = 0, limit: int = 100) -> List[WBS]:
-    return db.query(WBS).offset(skip).limit(limit).all()
+def get_all_wbs(db: Session, page: Optional[PageRequest] = None, skip: int = 0) -> Page[WBS]:
+    """All WBS items, or one page of them (skip is the legacy OFFSET paging)"""
+    return paginate(db.query(WBS), page, skip)
 
 
 def update_wbs(db: Session, wbs_id: UUID, wbs_update: WBSUpdate) -> Optional[WBS]:
-    db_wbs = get_wbs(db, wbs_id)
-    if db_wbs:
-        update_data = wbs_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_wbs, field, value)
-        db.commit()
-        db.refresh(db_wbs)
-    return db_wbs
+    update_data = wbs_update.dict(exclude_unset=True)
+    return update_returning(db, WBS, update_data, WBS.wbs_id == wbs_id)
 
 
 def delete_wbs(db: Session, wbs_id: UUID) -> bool:
     db_wbs = get_wbs(db, wbs_id)
     if db_wbs:
+        # Found before the delete cascades away the activity links
+        offering_ids = affected_offerings(db, wbs_id=wbs_id)
         db.delete(db_wbs)
         db.commit()
+        offering_totals.invalidate(offering_ids)
         return True
     return False
 
 
-def add_wbs_to_activity(db: Session, activity_id: UUID, wbs_id: UUID) -> ActivityWBS:
-    db_activity_wbs = ActivityWBS(activity_id=activity_id, wbs_id=wbs_id)
-    db.add(db_activity_wbs)
-    db.commit()
-    db.refresh(db_activity_wbs)
-    return db_activity_wbs
+def add_wbs_to_activity(db: Session, activity_id: UUID, wbs_id: UUID) -> Optional[ActivityWBS]:
+    """Link a WBS to an activity; None if it is already linked"""
+    created = insert_on_conflict(
+        db, ActivityWBS, dict(activity_id=activity_id, wbs_id=wbs_id), ["activity_id", "wbs_id"]
+    )
+    if created:
+        offering_totals.invalidate(affected_offerings(db, activity_id=activity_id))
+    return created
 
 
 def remove_wbs_from_activity(db: Session, activity_id: UUID, wbs_id: UUID) -> bool:
@@ -58,6 +60,7 @@ def remove_wbs_from_activity(db: Session, activity_id: UUID, wbs_id: UUID) -> bo
     if db_activity_wbs:
         db.delete(db_activity_wbs)
         db.commit()
+        offering_totals.invalidate(affected_offerings(db, activity_id=activity_id))
         return True
     return False
 
@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
 from app.models.wbs_staffing import WBSStaffing
+from app.models.staffing import Staffing
 from app.schemas.wbs import WBSStaffingCreate, WBSStaffingUpdate
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from app.crud.writes import insert_on_conflict, insert_returning, update_returning
+from app.crud.rollups import affected_offerings, offering_totals
 
 
 def get_wbs_staffing_by_wbs(db: Session, wbs_id: str) -> List[WBSStaffing]:
@@ -14,6 +17,34 @@ def get_wbs_staffing_by_staffing(db: Session, staffing_id: str) -> List[WBSStaff
     return db.query(WBSStaffing).filter(WBSStaffing.staffing_id == staffing_id).all()
 
 
+def get_staffing_details_for_wbs(db: Session, wbs_id: str) -> List[Dict[str, Any]]:
+    """Get all staffing assigned to a WBS with hours, role, band and country"""
+    results = db.query(
+        WBSStaffing.wbs_id,
+        WBSStaffing.staffing_id,
+        WBSStaffing.hours,
+        Staffing.country,
+        Staffing.role,
+        Staffing.band
+    ).join(
+        Staffing, WBSStaffing.staffing_id == Staffing.staffing_id
+    ).filter(
+        WBSStaffing.wbs_id == wbs_id
+    ).all()
+
+    return [
+        {
+            "wbs_id": str(row.wbs_id),
+            "staffing_id": str(row.staffing_id),
+            "hours": row.hours,
+            "country": row.country,
+            "role": row.role,
+            "band": row.band
+        }
+        for row in results
+    ]
+
+
 def get_wbs_staffing(db: Session, wbs_id: str, staffing_id: str) -> Optional[WBSStaffing]:
     """Get a specific WBS-Staffing relationship"""
     return db.query(WBSStaffing).filter(
@@ -24,11 +55,22 @@ def get_wbs_staffing(db: Session, wbs_id: str, staffing_id: str) -> Optional[WBS
 
 def create_wbs_staffing(db: Session, wbs_staffing: WBSStaffingCreate) -> WBSStaffing:
     """Create a new WBS-Staffing relationship"""
-    db_wbs_staffing = WBSStaffing(**wbs_staffing.dict())
-    db.add(db_wbs_staffing)
-    db.commit()
-    db.refresh(db_wbs_staffing)
-    return db_wbs_staffing
+    created = insert_returning(db, WBSStaffing, wbs_staffing.dict())
+    offering_totals.invalidate(affected_offerings(db, wbs_id=created.wbs_id))
+    return created
+
+
+def assign_staffing_to_wbs(db: Session, wbs_id: str, staffing_id: str, hours: int) -> WBSStaffing:
+    """
+    Assign staffing to a WBS, or update the hours of an existing assignment.
+    Raises IntegrityError (a foreign key violation) if the WBS or the staffing record does not exist.
+    """
+    assigned = insert_on_conflict(
+        db, WBSStaffing, dict(wbs_id=wbs_id, staffing_id=staffing_id, hours=hours),
+        ["wbs_id", "staffing_id"], update_columns=["hours"]
+    )
+    offering_totals.invalidate(affected_offerings(db, wbs_id=wbs_id))
+    return assigned
 
 
 def update_wbs_staffing(
@@ -38,18 +80,15 @@ def update_wbs_staffing(
     wbs_staffing: WBSStaffingUpdate
 ) -> Optional[WBSStaffing]:
     """Update hours for a WBS-Staffing relationship"""
-    db_wbs_staffing = get_wbs_staffing(db, wbs_id, staffing_id)
-    
-    if not db_wbs_staffing:
-        return None
-    
     update_data = wbs_staffing.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_wbs_staffing, field, value)
-    
-    db.commit()
-    db.refresh(db_wbs_staffing)
-    return db_wbs_staffing
+    updated = update_returning(
+        db, WBSStaffing, update_data,
+        WBSStaffing.wbs_id == wbs_id,
+        WBSStaffing.staffing_id == staffing_id
+    )
+    if updated and update_data:
+        offering_totals.invalidate(affected_offerings(db, wbs_id=wbs_id))
+    return updated
 
 
 def delete_wbs_staffing(db: Session, wbs_id: str, staffing_id: str) -> bool:
@@ -61,6 +100,7 @@ def delete_wbs_staffing(db: Session, wbs_id: str, staffing_id: str) -> bool:
     
     db.delete(db_wbs_staffing)
     db.commit()
+    offering_totals.invalidate(affected_offerings(db, wbs_id=wbs_id))
     return True
 
 # Made with Bob
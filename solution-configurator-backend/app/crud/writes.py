@@ -0,0 +1,65 @@
+from typing import Any, Dict, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+
+def insert_returning(db: Session, model: Type[T], values: Dict[str, Any]) -> T:
+    """
+    INSERT one row and commit, returning it as a model instance.
+    Server defaults (created_on, ...) come back in the same statement via
+    RETURNING, so there is no refresh SELECT afterwards.
+    """
+    row = db.scalars(insert(model).values(**values).returning(model)).one()
+    db.commit()
+    return row
+
+
+def update_returning(db: Session, model: Type[T], values: Dict[str, Any], *criteria) -> Optional[T]:
+    """
+    UPDATE the row matching criteria and commit, returning it as a model
+    instance, or None if no row matched. One UPDATE ... RETURNING replaces the
+    load / modify / commit / refresh sequence.
+    """
+    if not values:
+        return db.query(model).filter(*criteria).first()
+    statement = update(model).where(*criteria).values(**values).returning(model)
+    row = db.scalars(
+        statement,
+        execution_options={"synchronize_session": False, "populate_existing": True}
+    ).one_or_none()
+    db.commit()
+    return row
+
+
+def insert_on_conflict(
+    db: Session,
+    model: Type[T],
+    values: Dict[str, Any],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str] = ()
+) -> Optional[T]:
+    """
+    INSERT one row unless one with the same conflict_columns (a unique or
+    primary key) exists, and commit. With update_columns the existing row gets
+    those values instead (an upsert) and is returned; without, the insert is
+    skipped and None is returned. One statement, so concurrent callers cannot
+    race each other into duplicates or unique violations.
+    """
+    statement = pg_insert(model).values(**values)
+    if update_columns:
+        statement = statement.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: statement.excluded[column] for column in update_columns}
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=conflict_columns)
+    row = db.scalars(
+        statement.returning(model),
+        execution_options={"populate_existing": True}
+    ).one_or_none()
+    db.commit()
+    return row
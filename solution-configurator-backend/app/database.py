@@ -1,36 +1,461 @@
-from sqlalchemy import create_engine
+from contextvars import ContextVar
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, raiseload, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+import abc
+import anyio
+import anyio.to_thread
+import hashlib
+import logging
 import os
+import ssl
+import time
+from app.cache import TTLCache
+from app.config import settings
+from app.metrics import metrics
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 SSL_CERT_PATH = os.getenv("SSL_CERT_PATH")
+# verify-full in every deployed environment; "disable" / "prefer" for a local Postgres
+DATABASE_SSLMODE = settings.DATABASE_SSLMODE
+# Serve request handlers from an asyncpg engine instead of the psycopg2 one
+DATABASE_ASYNC = settings.DATABASE_ASYNC
+# Optional read-only replica for catalogue GET handlers
+DATABASE_REPLICA_URL = settings.DATABASE_REPLICA_URL
+# After a write, the caller's reads stay on the primary this long (covers replication lag)
+DB_READ_YOUR_WRITES_SECONDS = settings.DB_READ_YOUR_WRITES_SECONDS
+# Relationship lazy loads while serving a request: "raise" (an error), or "log" (allowed and reported; development)
+DB_LAZY_LOADS = settings.DB_LAZY_LOADS.lower()
+
+# Connection pool, per engine and per uvicorn worker. Each new connection pays a
+# TLS handshake, so connections are kept and reused most-recently-used first.
+DB_POOL_SIZE = settings.DB_POOL_SIZE
+DB_MAX_OVERFLOW = settings.DB_MAX_OVERFLOW
+DB_POOL_TIMEOUT = settings.DB_POOL_TIMEOUT
+DB_POOL_RECYCLE = settings.DB_POOL_RECYCLE
+DB_POOL_PRE_PING = settings.DB_POOL_PRE_PING
+DB_POOL_USE_LIFO = settings.DB_POOL_USE_LIFO
+# Connections opened at startup so the first requests skip the handshake
+DB_POOL_WARM = DB_POOL_SIZE if settings.DB_POOL_WARM is None else settings.DB_POOL_WARM
 
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL not set in environment variables")
 
-if not SSL_CERT_PATH:
-    raise RuntimeError("SSL_CERT_PATH not set in environment variables")
+connect_args = {"sslmode": DATABASE_SSLMODE}
+if DATABASE_SSLMODE in ("verify-ca", "verify-full"):
+    if not SSL_CERT_PATH:
+        raise RuntimeError("SSL_CERT_PATH not set in environment variables")
+    connect_args["sslrootcert"] = SSL_CERT_PATH
+
+
+
+class _CheckoutTimer:
+    """Times every pool checkout (queue wait plus any new connection) and counts timeouts"""
+    metrics_prefix = "db.pool"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.incr(f"{self.metrics_prefix}.timeouts")
+            raise
+        finally:
+            metrics.observe(f"{self.metrics_prefix}.checkout_wait", time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimer, QueuePool):
+    metrics_prefix = "db.pool"
+
+
+class InstrumentedAsyncPool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    metrics_prefix = "db.async_pool"
+
+
+class InstrumentedReplicaQueuePool(_CheckoutTimer, QueuePool):
+    metrics_prefix = "db.replica_pool"
+
+
+class InstrumentedReplicaAsyncPool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    metrics_prefix = "db.async_replica_pool"
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_use_lifo": DB_POOL_USE_LIFO,
+    }
+
+
+def _instrument(sync_engine, prefix: str) -> None:
+    """Export connection counts and pool occupancy for an engine under prefix"""
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.incr(f"{prefix}.connects")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr(f"{prefix}.invalidated")
+
+    def pool_state():
+        pool = sync_engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": DB_MAX_OVERFLOW,
+        }
+
+    metrics.gauge(prefix, pool_state)
+
 
 engine = create_engine(
     DATABASE_URL,
-    connect_args={
-        "sslmode": "verify-full",
-        "sslrootcert": SSL_CERT_PATH
-    },
-    echo=False
+    connect_args=connect_args,
+    poolclass=InstrumentedQueuePool,
+    echo=False,
+    **_pool_options()
 )
+_instrument(engine, InstrumentedQueuePool.metrics_prefix)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sessions live for one request. Objects stay loaded after commit, so the rows a
+# write got back from INSERT/UPDATE ... RETURNING are served without a refresh SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
+# Optional read replica for catalogue reads (see get_read_session); same SSL and pool settings
+replica_engine = None
+ReplicaSessionLocal = None
+if DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        DATABASE_REPLICA_URL,
+        connect_args=connect_args,
+        poolclass=InstrumentedReplicaQueuePool,
+        echo=False,
+        **_pool_options()
+    )
+    _instrument(replica_engine, InstrumentedReplicaQueuePool.metrics_prefix)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=replica_engine)
+
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Non-blocking sessions for async handlers
+#
+# The CRUD modules stay synchronous (they take a Session as first argument).
+# Async handlers call them through DBSession.run, which executes them off the
+# event loop: on the psycopg2 engine via the threadpool, or - with
+# DATABASE_ASYNC=true - on the asyncpg engine via AsyncSession.run_sync.
+# ---------------------------------------------------------------------------
+
+T = TypeVar("T")
+
+# "primary" / "replica" -> asyncpg engine and its session factory, created on first use
+_async_engines = {}
+_async_session_factories = {}
+
+
+def _asyncpg_ssl() -> Any:
+    """Translate DATABASE_SSLMODE into asyncpg's ssl argument"""
+    if DATABASE_SSLMODE in ("verify-ca", "verify-full"):
+        context = ssl.create_default_context(cafile=SSL_CERT_PATH)
+        context.check_hostname = DATABASE_SSLMODE == "verify-full"
+        return context
+    return DATABASE_SSLMODE
+
+
+def get_async_engine(replica: bool = False):
+    """Create the asyncpg engine on first use (asyncpg is only needed when DATABASE_ASYNC is set)"""
+    name = "replica" if replica else "primary"
+    if name not in _async_engines:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        poolclass = InstrumentedReplicaAsyncPool if replica else InstrumentedAsyncPool
+        url = make_url(DATABASE_REPLICA_URL if replica else DATABASE_URL).set(drivername="postgresql+asyncpg")
+        async_engine = create_async_engine(
+            url,
+            connect_args={"ssl": _asyncpg_ssl()},
+            poolclass=poolclass,
+            echo=False,
+            **_pool_options()
+        )
+        _instrument(async_engine.sync_engine, poolclass.metrics_prefix)
+        _async_session_factories[name] = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+        _async_engines[name] = async_engine
+    return _async_engines[name]
+
+
+class DBSession(abc.ABC):
+    """Runs sync CRUD functions for one request without blocking the event loop"""
+
+    @abc.abstractmethod
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call fn(session, *args, **kwargs) and return its result"""
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """Release the session's connection back to its pool"""
+
+
+# Threads for ThreadedDBSession.close, apart from the shared threadpool: with every
+# threadpool worker waiting for a pooled connection, a close queued behind them
+# could never hand one back. Created on first use, as it needs a running loop.
+_close_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def _get_close_limiter() -> anyio.CapacityLimiter:
+    global _close_limiter
+    if _close_limiter is None:
+        _close_limiter = anyio.CapacityLimiter(DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    return _close_limiter
+
+
+class ThreadedDBSession(DBSession):
+    """psycopg2 Session; each call runs in the threadpool"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+    async def close(self) -> None:
+        # The rollback on close is a round trip to the database; keep it off the loop
+        await anyio.to_thread.run_sync(self.session.close, limiter=_get_close_limiter())
+
+
+class AsyncDBSession(DBSession):
+    """asyncpg AsyncSession; each call runs through run_sync on the event loop"""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        return await self.session.run_sync(fn, *args, **kwargs)
+
+    async def close(self) -> None:
+        await self.session.close()
+
+
+def _open_session(replica: bool = False, use_async: bool = DATABASE_ASYNC) -> DBSession:
+    if use_async:
+        get_async_engine(replica)
+        return AsyncDBSession(_async_session_factories["replica" if replica else "primary"]())
+    return ThreadedDBSession(ReplicaSessionLocal() if replica else SessionLocal())
+
+
+async def get_threaded_session() -> AsyncIterator[DBSession]:
+    db = _open_session(use_async=False)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_session() -> AsyncIterator[DBSession]:
+    db = _open_session(use_async=True)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# ---------------------------------------------------------------------------
+# Read/write routing
+#
+# Writes always use the primary (get_session). Catalogue GET handlers take
+# get_read_session, which uses the replica when DATABASE_REPLICA_URL is set.
+# A caller that has just written keeps reading from the primary for
+# DB_READ_YOUR_WRITES_SECONDS, so replication lag never hides their own change.
+# Browser users carry the write time in their session (so it holds across
+# workers); bearer callers are tracked per worker by token.
+# ---------------------------------------------------------------------------
+
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# sha256(bearer token) -> True while its read-your-writes window is open
+_recent_writers = TTLCache(max_entries=10000)
+
+
+def _bearer_key(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token.strip():
+        return hashlib.sha256(token.strip().encode()).hexdigest()
+    return None
+
+
+def _session_user(request: Request) -> Optional[dict]:
+    # request.session raises if no session middleware is installed
+    return request.session.get("user") if "session" in request.scope else None
+
+
+def mark_write(request: Request) -> None:
+    """Open the caller's read-your-writes window"""
+    if DB_READ_YOUR_WRITES_SECONDS <= 0:
+        return
+    key = _bearer_key(request)
+    if key:
+        _recent_writers.set(key, True, DB_READ_YOUR_WRITES_SECONDS)
+    elif _session_user(request):
+        request.session["db_written_at"] = time.time()
+
+
+def wrote_recently(request: Request) -> bool:
+    """True while the caller is inside their read-your-writes window"""
+    key = _bearer_key(request)
+    if key:
+        return _recent_writers.get(key, False)
+    written_at = _session_user(request) and request.session.get("db_written_at")
+    return bool(written_at) and time.time() - written_at < DB_READ_YOUR_WRITES_SECONDS
+
+
+# Session on the primary; the engine is chosen per deployment by DATABASE_ASYNC
+_primary_session = get_async_session if DATABASE_ASYNC else get_threaded_session
+
+
+async def get_session(
+    request: Request,
+    db: DBSession = Depends(_primary_session)
+) -> AsyncIterator[DBSession]:
+    """Primary session for async handlers; a non-GET request opens the caller's read-your-writes window"""
+    if request.method not in _SAFE_METHODS:
+        mark_write(request)
+    yield db
+
+
+async def get_primary_read_session(db: DBSession = Depends(_primary_session)) -> AsyncIterator[DBSession]:
+    """
+    Primary session for reads that must see every committed write, e.g. to fill
+    a cache; unlike get_session, a POST through it opens no read-your-writes window
+    """
+    yield db
+
+
+async def get_read_session(request: Request) -> AsyncIterator[DBSession]:
+    """Session for catalogue reads: the replica if configured, unless the caller wrote recently"""
+    replica = replica_engine is not None and not wrote_recently(request)
+    metrics.incr("db.reads.replica" if replica else "db.reads.primary")
+    db = _open_session(replica=replica)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# ---------------------------------------------------------------------------
+# Relationship loading policy
+#
+# A relationship attribute read on a row loaded without an eager option
+# issues one more query per row. While a request is being served, ORM
+# selects therefore get raiseload("*"): each read path declares the
+# relationships it needs with selectinload / joinedload, and anything else
+# raises instead of querying. The option only reaches rows those selects
+# load (eager-loaded ones included); rows that come from anywhere else, such
+# as INSERT / UPDATE ... RETURNING in app/crud/writes.py, still lazy load, so
+# the lazy load itself is refused too before its SQL runs.
+# With DB_LAZY_LOADS=log lazy loads are allowed but every one is logged with
+# the endpoint that issued it. Scripts and benchmarks outside a request are
+# not affected.
+# ---------------------------------------------------------------------------
+
+# "GET /api/v1/library/{activity_id} (get_activity_detail)" while that request is handled
+_request_endpoint: ContextVar[Optional[str]] = ContextVar("request_endpoint", default=None)
+
+
+async def track_endpoint(request: Request) -> AsyncIterator[None]:
+    """Router dependency marking the request context (async, so the value reaches the handler's task)"""
+    route = request.scope.get("route")
+    endpoint = request.scope.get("endpoint")
+    _request_endpoint.set(
+        f"{request.method} {getattr(route, 'path', request.url.path)} ({getattr(endpoint, '__name__', '?')})"
+    )
+    try:
+        yield
+    finally:
+        # An in-process client (tests, benchmarks) runs the app in its own task
+        _request_endpoint.set(None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _lazy_load_policy(state) -> None:
+    endpoint = _request_endpoint.get()
+    if endpoint is None or not state.is_select:
+        return
+    if state.lazy_loaded_from is not None:
+        prop = state.loader_strategy_path.prop
+        attribute = f"{prop.parent.class_.__name__}.{prop.key}"
+        if DB_LAZY_LOADS == "raise":
+            # A row raiseload did not reach; fail as it would have
+            raise exc.InvalidRequestError(f"'{attribute}' is not available: lazy load in {endpoint}; load it eagerly")
+        metrics.incr("db.lazy_loads")
+        logger.warning(
+            f"Lazy load of {attribute} in {endpoint}: "
+            f"{' '.join(str(state.statement).split())[:300]}"
+        )
+    elif DB_LAZY_LOADS == "raise" and not state.is_relationship_load:
+        state.statement = state.statement.options(raiseload("*", sql_only=True))
+
+
+def warm_pool(count: int = DB_POOL_WARM) -> int:
+    """Open up to count pooled connections per engine ahead of traffic; returns how many were opened"""
+    opened = 0
+    for target in (engine, replica_engine):
+        if target is None:
+            continue
+        connections = []
+        try:
+            for _ in range(min(count, DB_POOL_SIZE)):
+                connections.append(target.connect())
+        except Exception as e:
+            logger.warning(f"Database pool warm-up stopped after {len(connections)} connection(s): {e}")
+        finally:
+            for connection in connections:
+                connection.close()
+        opened += len(connections)
+    return opened
+
+
+async def warm_async_pool(count: int = DB_POOL_WARM) -> int:
+    """warm_pool for the asyncpg engines"""
+    opened = 0
+    for replica in ((False, True) if DATABASE_REPLICA_URL else (False,)):
+        connections = []
+        try:
+            for _ in range(min(count, DB_POOL_SIZE)):
+                connections.append(await get_async_engine(replica).connect())
+        except Exception as e:
+            logger.warning(f"Async database pool warm-up stopped after {len(connections)} connection(s): {e}")
+        finally:
+            for connection in connections:
+                await connection.close()
+        opened += len(connections)
+    return opened
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled asyncpg connections (called on application shutdown)"""
+    for name in list(_async_engines):
+        await _async_engines.pop(name).dispose()
+        _async_session_factories.pop(name, None)
@@ -0,0 +1,66 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+def field_selection(model, schema, presets: Dict[str, Sequence[str]], always: Sequence[str] = ()):
+    """
+    Dependency factory for a sparse-fieldset list endpoint.
+    ?fields= is a preset name (e.g. "summary") or a comma-separated list of the
+    schema's column fields; the dependency returns the selected names (plus
+    `always`), or None when the parameter is absent and full records are wanted.
+    Usage: fields = Depends(field_selection(models.Offering, schemas.Offering, OFFERING_FIELDSETS, ["offering_id"]))
+    """
+    columns = set(inspect(model).columns.keys())
+    allowed = [name for name in schema.model_fields if name in columns]
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Preset ({', '.join(presets)}) or comma-separated fields; omit for full records"
+        )
+    ) -> Optional[List[str]]:
+        if not fields:
+            return None
+        if fields in presets:
+            requested = list(presets[fields])
+        else:
+            requested = [name.strip() for name in fields.split(",") if name.strip()]
+            unknown = [name for name in requested if name not in allowed]
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown field(s): {', '.join(unknown)}; choose from: {', '.join(allowed)}"
+                )
+        return list(dict.fromkeys([*always, *requested]))
+
+    return dependency
+
+
+def load_fields(model, fields: Optional[Iterable[str]], *extra_columns):
+    """
+    Query options loading only the selected columns (and any extra ones the query
+    needs afterwards, e.g. a pagination key); none when every column is wanted.
+    The other columns are never fetched from the database.
+    """
+    if fields is None:
+        return []
+    names = dict.fromkeys([*fields, *(column.key for column in extra_columns)])
+    return [load_only(*(getattr(model, name) for name in names))]
+
+
+def sparse(response: Response, items: List[Any], fields: Optional[List[str]]):
+    """
+    Return items as-is for full records, or serialize just the selected fields.
+    Sparse rows bypass the endpoint's response_model, which would read (and so
+    lazy-load) every column; headers already set on response are carried over.
+    """
+    if fields is None:
+        return items
+    rows = [{name: getattr(item, name) for name in fields} for item in items]
+    headers = {key: value for key, value in response.headers.items() if key.lower() != "content-length"}
+    return JSONResponse(content=jsonable_encoder(rows), headers=headers)
@@ -1,9 +1,15 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 from authlib.integrations.starlette_client import OAuth
 from app.config import settings
 from app.api.v1.api import api_router
+from app.auth.ibm_auth import ibm_auth
+from app.bluegroups_auth import close_async_client
+from app.database import DATABASE_ASYNC, dispose_async_engine, warm_async_pool, warm_pool
+from app.pagination import NEXT_CURSOR_HEADER
+from app.sessions import ServerSideSessionMiddleware, create_session_backend
 import logging
 
 
@@ -24,14 +30,26 @@ app = FastAPI(
 )
 
 # Add Session Middleware (MUST be before CORS for cookies to work)
-app.add_middleware(
-    SessionMiddleware,
-    secret_key=settings.SESSION_SECRET,
-    session_cookie="session",
-    max_age=3600 * 24,  # 24 hours
-    same_site="lax",
-    https_only=False  # Set to True in production with HTTPS
-)
+session_backend = None
+if settings.SESSION_BACKEND == "cookie":
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key=settings.SESSION_SECRET,
+        session_cookie="session",
+        max_age=settings.SESSION_MAX_AGE,
+        same_site="lax",
+        https_only=False  # Set to True in production with HTTPS
+    )
+else:
+    session_backend = create_session_backend(settings.SESSION_BACKEND, settings.REDIS_URL)
+    app.add_middleware(
+        ServerSideSessionMiddleware,
+        backend=session_backend,
+        session_cookie="session",
+        max_age=settings.SESSION_MAX_AGE,
+        same_site="lax",
+        https_only=False  # Set to True in production with HTTPS
+    )
 
 # Configure CORS - IMPORTANT: Must allow credentials for sessions
 app.add_middleware(
@@ -40,7 +58,8 @@ app.add_middleware(
     allow_credentials=True,  # Required for cookies/sessions
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["*"]
+    # Browsers ignore "*" on credentialed requests; list the headers the frontend reads
+    expose_headers=["*", NEXT_CURSOR_HEADER]
 )
 
 # Configure OAuth with Authlib
@@ -68,6 +87,19 @@ async def startup_event():
     logger.info(f"Discovery Endpoint: {settings.IBM_DISCOVERY_ENDPOINT}")
     logger.info("=" * 80)
 
+    # Pay the connection handshakes before the first request does
+    opened = await warm_async_pool() if DATABASE_ASYNC else await run_in_threadpool(warm_pool)
+    logger.info(f"Database pool warmed with {opened} connection(s)")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_async_client()
+    await ibm_auth.aclose()
+    await dispose_async_engine()
+    if session_backend is not None:
+        await session_backend.close()
+
 
 @app.get("/")
 async def root():
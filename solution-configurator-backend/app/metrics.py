@@ -0,0 +1,51 @@
+import threading
+from typing import Any, Callable, Dict
+
+
+class Metrics:
+    """
+    Process-local counters, timers and gauges.
+    Served to administrators on /admin/metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._timers: Dict[str, Dict[str, float]] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increase a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record one duration sample"""
+        with self._lock:
+            timer = self._timers.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            timer["count"] += 1
+            timer["total_seconds"] += seconds
+            timer["max_seconds"] = max(timer["max_seconds"], seconds)
+
+    def gauge(self, name: str, read: Callable[[], Any]) -> None:
+        """Register a callable that reports a current value when metrics are collected"""
+        with self._lock:
+            self._gauges[name] = read
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            timers = {
+                name: {**timer, "avg_seconds": timer["total_seconds"] / timer["count"] if timer["count"] else 0.0}
+                for name, timer in self._timers.items()
+            }
+            gauges = dict(self._gauges)
+
+        return {
+            "counters": counters,
+            "timers": timers,
+            "gauges": {name: read() for name, read in gauges.items()},
+        }
+
+
+metrics = Metrics()
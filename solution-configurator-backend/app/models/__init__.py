@@ -4,7 +4,7 @@ from app.models.product import Product
 from app.models.offering import Offering
 from app.models.activity import Activity, OfferingActivity
 from app.models.staffing import Staffing
-from app.models.pricing import PricingDetail
+from app.models.pricing import PricingDetail, RateCardVersion
 from app.models.wbs import WBS
 from app.models.activity_wbs import ActivityWBS
 from app.models.wbs_staffing import WBSStaffing
@@ -18,6 +18,7 @@ __all__ = [
     "OfferingActivity",
     "Staffing",
     "PricingDetail",
+    "RateCardVersion",
     "WBS",
     "ActivityWBS",
     "WBSStaffing",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, String, Text, Integer, Boolean, DECIMAL, TIMESTAMP
+from sqlalchemy import Column, ForeignKey, Index, String, Text, Integer, Boolean, DECIMAL, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -8,11 +8,15 @@ import uuid
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        # Keyset pagination of the activity library by name
+        Index('ix_activities_activity_name_activity_id', 'activity_name', 'activity_id'),
+    )
     
     activity_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    offering_id = Column(UUID(as_uuid=True), ForeignKey("offerings.offering_id", ondelete="CASCADE"), nullable=True)
-    brand_id = Column(UUID(as_uuid=True), ForeignKey("brands.brand_id", ondelete="CASCADE"), nullable=True)
-    product_id = Column(UUID(as_uuid=True), ForeignKey("products.product_id", ondelete="CASCADE"), nullable=True)
+    offering_id = Column(UUID(as_uuid=True), ForeignKey("offerings.offering_id", ondelete="CASCADE"), nullable=True, index=True)
+    brand_id = Column(UUID(as_uuid=True), ForeignKey("brands.brand_id", ondelete="CASCADE"), nullable=True, index=True)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.product_id", ondelete="CASCADE"), nullable=True, index=True)
     activity_name = Column(String(255), nullable=False)
     category = Column(String(100))
     part_numbers = Column(String(100))
@@ -53,9 +57,12 @@ class Activity(Base):
 class OfferingActivity(Base):
     """Junction table for many-to-many relationship between offerings and activities"""
     __tablename__ = "offering_activities"
+    __table_args__ = (
+        Index('ix_offering_activities_offering_id_sequence', 'offering_id', 'sequence'),
+    )
     
     offering_id = Column(UUID(as_uuid=True), ForeignKey("offerings.offering_id", ondelete="CASCADE"), primary_key=True)
-    activity_id = Column(UUID(as_uuid=True), ForeignKey("activities.activity_id", ondelete="CASCADE"), primary_key=True)
+    activity_id = Column(UUID(as_uuid=True), ForeignKey("activities.activity_id", ondelete="CASCADE"), primary_key=True, index=True)
     sequence = Column(Integer)
     is_mandatory = Column(Boolean, default=True)
     created_on = Column(TIMESTAMP, server_default=func.now())
@@ -10,7 +10,7 @@ class ActivityWBS(Base):
     __tablename__ = "activity_wbs"
     
     activity_id = Column(UUID(as_uuid=True), ForeignKey("activities.activity_id", ondelete="CASCADE"), primary_key=True)
-    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs.wbs_id", ondelete="CASCADE"), primary_key=True)
+    wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs.wbs_id", ondelete="CASCADE"), primary_key=True, index=True)
     created_on = Column(TIMESTAMP, server_default=func.now())
     
     # Relationships
@@ -13,5 +13,5 @@ class Brand(Base):
     description = Column(Text)
 
     # Relationships
-    products = relationship("Product", back_populates="brand", cascade="all, delete-orphan")
-    activities = relationship("Activity", back_populates="brand", cascade="all, delete-orphan")
+    products = relationship("Product", back_populates="brand", cascade="all, delete-orphan", passive_deletes=True)
+    activities = relationship("Activity", back_populates="brand", cascade="all, delete-orphan", passive_deletes=True)
@@ -1,16 +1,32 @@
-from sqlalchemy import DECIMAL, Column, String, Text, ForeignKey, TIMESTAMP
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import DECIMAL, Column, Computed, String, Text, ForeignKey, Index, TIMESTAMP
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, query_expression, relationship
 from sqlalchemy.sql import func
 from app.database import Base
 import uuid
 
 
+# Full-text document of an offering, weighted by field: A (name) ranks highest, D lowest
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(offering_name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(tag_line, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(offering_summary, '') || ' ' || coalesce(offering_tags, '')), 'C') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(scenario, '') || ' ' || coalesce(industry, '')), 'D')"
+)
+
+
 class Offering(Base):
     __tablename__ = "offerings"
+    __table_args__ = (
+        # Keyset pagination of /offerings/search/ by name
+        Index('ix_offerings_offering_name_offering_id', 'offering_name', 'offering_id'),
+        # /offerings/search/?query=: full-text matches. The pg_trgm indexes for substring and
+        # misspelt matches are created only by migration b7d41c9e2f60, as they need the extension
+        Index('ix_offerings_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     offering_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    product_id = Column(UUID(as_uuid=True), ForeignKey("products.product_id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.product_id", ondelete="CASCADE"), nullable=False, index=True)
 
     offering_name = Column(String(255), nullable=False)
     saas_type = Column(String(100))
@@ -51,6 +67,11 @@ class Offering(Base):
     created_on = Column(TIMESTAMP, server_default=func.now())
     updated_on = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
+    # Maintained by Postgres; deferred so it is only read where a query asks for it
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True)))
+    # Relevance of the row to a search, set by search_offerings (see crud.offering)
+    search_rank = query_expression()
+
     # Relationships
     product = relationship("Product", back_populates="offerings")
     activities = relationship(
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DECIMAL, ForeignKey
+from sqlalchemy import BigInteger, CheckConstraint, Column, String, Integer, DECIMAL, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -7,6 +7,13 @@ from app.database import Base
 
 class PricingDetail(Base):
     __tablename__ = "pricing_details"
+    __table_args__ = (
+        # One price per staffing record; covers the pricing/staffing join
+        Index(
+            'uq_pricing_details_staffing_id', 'staffing_id', unique=True,
+            postgresql_include=['pricing_id', 'cost', 'sale_price']
+        ),
+    )
 
     pricing_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     staffing_id = Column(UUID(as_uuid=True), ForeignKey("staffing_details.staffing_id", ondelete="CASCADE"), nullable=False)
@@ -14,4 +21,15 @@ class PricingDetail(Base):
     sale_price = Column(DECIMAL(12, 2))
 
     # Relationships
-    staffing = relationship("Staffing", back_populates="pricing")
\ No newline at end of file
+    staffing = relationship("Staffing", back_populates="pricing")
+
+
+class RateCardVersion(Base):
+    """One row, bumped by database triggers on every staffing_details / pricing_details write"""
+    __tablename__ = "rate_card_version"
+    __table_args__ = (
+        CheckConstraint("id = 1", name="ck_rate_card_version_one_row"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
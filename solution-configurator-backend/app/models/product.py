@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey
+from sqlalchemy import Column, String, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -7,13 +7,17 @@ from app.database import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination of /products/all by name
+        Index('ix_products_product_name_product_id', 'product_name', 'product_id'),
+    )
 
     product_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    brand_id = Column(UUID(as_uuid=True), ForeignKey("brands.brand_id", ondelete="CASCADE"), nullable=False)
+    brand_id = Column(UUID(as_uuid=True), ForeignKey("brands.brand_id", ondelete="CASCADE"), nullable=False, index=True)
     product_name = Column(String(255), nullable=False)
     description = Column(Text)
 
     # Relationships
     brand = relationship("Brand", back_populates="products")
-    offerings = relationship("Offering", back_populates="product", cascade="all, delete-orphan")
-    activities = relationship("Activity", back_populates="product", cascade="all, delete-orphan")
+    offerings = relationship("Offering", back_populates="product", cascade="all, delete-orphan", passive_deletes=True)
+    activities = relationship("Activity", back_populates="product", cascade="all, delete-orphan", passive_deletes=True)
@@ -9,7 +9,7 @@ class WBSStaffing(Base):
     __tablename__ = "wbs_staffing"
     
     wbs_id = Column(UUID(as_uuid=True), ForeignKey("wbs.wbs_id", ondelete="CASCADE"), primary_key=True)
-    staffing_id = Column(UUID(as_uuid=True), ForeignKey("staffing_details.staffing_id", ondelete="CASCADE"), primary_key=True)
+    staffing_id = Column(UUID(as_uuid=True), ForeignKey("staffing_details.staffing_id", ondelete="CASCADE"), primary_key=True, index=True)
     hours = Column(Integer)
     
     # Relationships
@@ -0,0 +1,162 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import tuple_
+
+from app.config import settings
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class PageRequest:
+    """
+    One page of a keyset-paginated list: rows sorted by `columns` (a unique,
+    indexed sort key) and starting after the cursor's key. With an index on
+    exactly those columns each page is one short index range scan, however
+    deep into the list it is. With limit None it is every row, in sort order.
+    """
+
+    def __init__(
+        self,
+        sort: str,
+        columns: Sequence,
+        limit: Optional[int],
+        descending: bool = False,
+        after: Optional[List[Any]] = None
+    ):
+        self.sort = sort
+        self.columns = list(columns)
+        self.limit = limit
+        self.descending = descending
+        self.after = after
+
+    def apply(self, query, skip: int = 0):
+        """Order, filter past the cursor and limit query (one extra row tells whether more follow)"""
+        if self.after is not None:
+            key, after = tuple_(*self.columns), tuple_(*self.after)
+            query = query.filter(key < after if self.descending else key > after)
+        query = query.order_by(*(c.desc() if self.descending else c.asc() for c in self.columns))
+        if skip:
+            query = query.offset(skip)
+        return query if self.limit is None else query.limit(self.limit + 1)
+
+    def page(self, rows: List[T]) -> Page[T]:
+        """Trim the extra row from apply() and build the cursor for the next page"""
+        if self.limit is None or len(rows) <= self.limit:
+            return Page(rows)
+        rows = rows[:self.limit]
+        last = rows[-1]
+        return Page(rows, encode_cursor(self.sort, self.descending, [getattr(last, c.key) for c in self.columns]))
+
+
+def paginate(query, page: Optional[PageRequest], skip: int = 0) -> Page:
+    """Run query as one page, or in full when page is None"""
+    if page is None:
+        return Page(query.offset(skip).all() if skip else query.all())
+    return page.page(page.apply(query, skip).all())
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)   # UUID, Decimal
+
+
+def _load(column, value: Any) -> Any:
+    python_type = column.type.python_type
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(sort: str, descending: bool, values: List[Any]) -> str:
+    raw = json.dumps({"s": sort, "d": descending, "v": [_dump(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, descending: bool, columns: Sequence) -> List[Any]:
+    """Key values stored in cursor; raises ValueError if it is malformed or was issued for another sort"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("malformed cursor") from e
+    if not isinstance(data, dict) or data.get("s") != sort or bool(data.get("d")) != descending:
+        raise ValueError("cursor was issued for a different sort order")
+    values = data.get("v")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("malformed cursor")
+    return [_load(column, value) for column, value in zip(columns, values)]
+
+
+def page_request(
+    sorts: Dict[str, Sequence],
+    default: str,
+    search_default: Optional[str] = None,
+    unpaged: bool = False
+):
+    """
+    Dependency factory for a paginated list endpoint.
+    sorts maps each ?sort= name to its key columns; every key must be unique and
+    match an index column for column. Prefix the name with "-" to sort descending.
+    search_default, if given, replaces default when the request has a ?query=.
+    unpaged keeps a list that predates paging whole for callers that send neither
+    cursor nor limit; it is paged only when they ask for it.
+    Usage: page: PageRequest = Depends(page_request(crud_brand.BRAND_SORTS, "brand_name"))
+    """
+    defaults = f"{default}, or {search_default} with a query" if search_default else default
+    default_limit = "every row unless a cursor is sent" if unpaged else settings.PAGE_SIZE_DEFAULT
+
+    def dependency(
+        request: Request,
+        cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} value from the previous page"),
+        limit: Optional[int] = Query(
+            None, ge=1, le=settings.PAGE_SIZE_MAX, description=f"Page size (default: {default_limit})"
+        ),
+        sort: Optional[str] = Query(
+            None, description=f"One of {', '.join(sorts)}; prefix with - for descending (default: {defaults})"
+        )
+    ) -> PageRequest:
+        if not sort:
+            sort = search_default if search_default and request.query_params.get("query") else default
+        descending = sort.startswith("-")
+        name = sort[1:] if descending else sort
+        if name not in sorts:
+            raise HTTPException(
+                status_code=422, detail=f"Cannot sort by '{sort}'; use one of: {', '.join(sorts)}, optionally prefixed with -"
+            )
+        if limit is None and (cursor or not unpaged):
+            limit = settings.PAGE_SIZE_DEFAULT
+        columns = sorts[name]
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, name, descending, columns)
+            except (ValueError, TypeError) as e:
+                raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+        return PageRequest(name, columns, limit, descending, after)
+
+    return dependency
+
+
+def paged(response: Response, page: Page[T]) -> List[T]:
+    """Return the page's items, passing its next cursor in the X-Next-Cursor header"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
@@ -0,0 +1,113 @@
+from decimal import Decimal
+from typing import Any, Hashable, Iterable, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# hours x cents is summed in int64 unless the totals could pass its range
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def cents(value: Optional[Decimal]) -> int:
+    """A pricing_details amount (DECIMAL(12, 2)) as integer cents; None counts as 0"""
+    if value is None:
+        return 0
+    amount = Decimal(value) * 100
+    if amount != amount.to_integral_value():
+        raise ValueError(f"{value} is not a whole number of cents")
+    return int(amount)
+
+
+class StaffedHours(NamedTuple):
+    """
+    Hours in coordinate form, one entry per staffed (row, role) cell: row[i]
+    staffs hours[i] hours of the role at position[i] of the rate card. A row is
+    whatever is being priced (an activity, an offering); rows is their number.
+    """
+    row: np.ndarray
+    position: np.ndarray
+    hours: np.ndarray
+    rows: int
+
+
+class RateCard:
+    """
+    The rate card (staffing_details with their pricing_details) in arrays:
+    cost and sale_price per hour as int64 cents, indexed by interned staffing_id.
+    Roles are kept in the order given, which is the order breakdowns list them in.
+
+    Hours are priced cell by cell from StaffedHours, so the work grows with the
+    cells staffed rather than with rows x roles. Every amount is an exact number
+    of cents and matches summing hours x rate in Decimal; divide by 100 (as a
+    Python int, e.g. int(total) / 100) for the currency amount.
+    """
+
+    def __init__(self, roles: Iterable[Any]):
+        # roles: rows with staffing_id, country, role, band, pricing_id, cost, sale_price
+        self.roles = list(roles)
+        self.index = {role.staffing_id: n for n, role in enumerate(self.roles)}
+        self.cost = np.array([cents(role.cost) for role in self.roles], dtype=np.int64)
+        self.sale_price = np.array([cents(role.sale_price) for role in self.roles], dtype=np.int64)
+        self.priced = np.array([role.pricing_id is not None for role in self.roles], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def __contains__(self, staffing_id: Hashable) -> bool:
+        return staffing_id in self.index
+
+    def staffed(
+        self, rows: Sequence[int], staffing_ids: Sequence[Hashable], hours: Sequence[int], row_count: int
+    ) -> StaffedHours:
+        """StaffedHours of parallel (row, staffing_id, hours) sequences, e.g. the columns of a query result"""
+        position = np.fromiter((self.index[staffing_id] for staffing_id in staffing_ids), np.intp, len(staffing_ids))
+        staffed = StaffedHours(
+            np.asarray(rows, dtype=np.intp).reshape(-1), position,
+            np.asarray(hours, dtype=np.int64).reshape(-1), row_count
+        )
+        if not len(staffed.row) == len(staffed.position) == len(staffed.hours):
+            raise ValueError("rows, staffing_ids and hours differ in length")
+        if len(staffed.hours) and staffed.hours.min() < 0:
+            raise ValueError("hours must not be negative")
+        return staffed
+
+    def staffed_from_dicts(self, rows: Sequence[Mapping[Hashable, int]]) -> StaffedHours:
+        """StaffedHours of one dict of hours per staffing_id for each row"""
+        row = np.repeat(np.arange(len(rows)), [len(hours_by_role) for hours_by_role in rows])
+        staffing_ids = [staffing_id for hours_by_role in rows for staffing_id in hours_by_role]
+        hours = [hours for hours_by_role in rows for hours in hours_by_role.values()]
+        return self.staffed(row, staffing_ids, hours, len(rows))
+
+    def _amounts(self, staffed: StaffedHours) -> Tuple[np.ndarray, np.ndarray]:
+        """(cost, sale price) in cents of each cell; as Python ints if int64 sums could overflow"""
+        cost, sale_price = self.cost[staffed.position], self.sale_price[staffed.position]
+        hours = staffed.hours
+        largest_rate = max(int(cost.max(initial=0)), int(sale_price.max(initial=0)))
+        if int(hours.sum()) * largest_rate > _INT64_MAX:
+            hours, cost, sale_price = hours.astype(object), cost.astype(object), sale_price.astype(object)
+        return hours * cost, hours * sale_price
+
+    def totals(self, staffed: StaffedHours) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(hours, cost, sale price in cents) of each row"""
+        cost, sale_price = self._amounts(staffed)
+        totals = []
+        for values in (staffed.hours, cost, sale_price):
+            total = np.zeros(staffed.rows, dtype=values.dtype)
+            np.add.at(total, staffed.row, values)
+            totals.append(total)
+        return tuple(totals)
+
+    def line_items(self, staffed: StaffedHours) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (row, position, hours, cost, sale price in cents) per staffed role of each
+        row, cells of the same role added up, ordered by row and then by role
+        """
+        cost, sale_price = self._amounts(staffed)
+        roles = max(len(self), 1)
+        keys, item = np.unique(staffed.row.astype(np.int64) * roles + staffed.position, return_inverse=True)
+        sums = []
+        for values in (staffed.hours, cost, sale_price):
+            total = np.zeros(len(keys), dtype=values.dtype)
+            np.add.at(total, item, values)
+            sums.append(total)
+        row, position = np.divmod(keys, roles)
+        return (row, position, *sums)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, NonNegativeInt
+from typing import Dict, List, Optional
 from decimal import Decimal
 from uuid import UUID
 
@@ -25,4 +25,23 @@ class PricingDetail(PricingDetailBase):
     pricing_id: UUID
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PricingBatchRequest(BaseModel):
+    """Offerings to price in one call (POST /pricing/batch)"""
+    offering_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+    country: Optional[str] = Field(None, description="Count only the staffing roles in this country")
+
+
+class SolutionActivity(BaseModel):
+    activity_id: UUID
+    hours: Dict[UUID, NonNegativeInt] = Field(
+        default_factory=dict,
+        description="Hours per staffing_id, replacing what the activity's WBS items staff of that role"
+    )
+
+
+class SolutionPriceRequest(BaseModel):
+    """Activities selected for a solution, in order (POST /solutions/price)"""
+    activities: List[SolutionActivity] = Field(..., min_length=1, max_length=1000)
+    country: Optional[str] = Field(None, description="Count only the staffing roles in this country")
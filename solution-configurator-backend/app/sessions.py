@@ -0,0 +1,171 @@
+"""
+Server-side session storage.
+
+ServerSideSessionMiddleware is a drop-in replacement for Starlette's
+SessionMiddleware: handlers keep using request.session, but the data lives in
+a SessionBackend and the cookie only carries an opaque random session id.
+"""
+import json
+import secrets
+import time
+from typing import Dict, Literal, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import TTLCache
+
+
+class SessionBackend:
+    """Storage for session payloads keyed by session id"""
+
+    async def load(self, session_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    async def save(self, session_id: str, data: Dict, max_age: int) -> None:
+        raise NotImplementedError
+
+    async def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release connections held by the backend (called on application shutdown)"""
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    In-process store; only suitable for a single worker.
+    Payloads are kept JSON-encoded, like RedisSessionBackend, so a request
+    mutating its session never changes the stored copy behind the middleware's back.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self._sessions = TTLCache(max_entries=max_entries)
+
+    async def load(self, session_id: str) -> Optional[Dict]:
+        raw = self._sessions.get(session_id)
+        return json.loads(raw) if raw else None
+
+    async def save(self, session_id: str, data: Dict, max_age: int) -> None:
+        self._sessions.set(session_id, json.dumps(data), max_age)
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.delete(session_id)
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Store backed by any client with the redis.asyncio get/set/delete interface
+    (a real Redis connection, or app.stubs.redis.FakeRedis in tests).
+    """
+
+    def __init__(self, client, key_prefix: str = "session:"):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    async def load(self, session_id: str) -> Optional[Dict]:
+        raw = await self.client.get(self.key_prefix + session_id)
+        return json.loads(raw) if raw else None
+
+    async def save(self, session_id: str, data: Dict, max_age: int) -> None:
+        await self.client.set(self.key_prefix + session_id, json.dumps(data), ex=max_age)
+
+    async def delete(self, session_id: str) -> None:
+        await self.client.delete(self.key_prefix + session_id)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class ServerSideSessionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: SessionBackend,
+        session_cookie: str = "session",
+        max_age: int = 14 * 24 * 60 * 60,  # 14 days, in seconds
+        path: str = "/",
+        same_site: Literal["lax", "strict", "none"] = "lax",
+        https_only: bool = False,
+    ) -> None:
+        self.app = app
+        self.backend = backend
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.path = path
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:  # Secure flag can be used with HTTPS only
+            self.security_flags += "; secure"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        session_id = connection.cookies.get(self.session_cookie)
+        stored = await self.backend.load(session_id) if session_id else None
+        if stored is None:
+            session_id = None
+            stored = {"data": {}, "saved_at": 0}
+
+        scope["session"] = stored["data"]
+        initial = json.dumps(stored["data"], sort_keys=True)
+        had_user = "user" in stored["data"]
+        state = {"cookie": None}
+
+        async def persist() -> None:
+            session = scope["session"]
+            nonlocal session_id
+            if not session:
+                if session_id:
+                    # The session has been cleared.
+                    await self.backend.delete(session_id)
+                    state["cookie"] = "null; path={path}; expires=Thu, 01 Jan 1970 00:00:00 GMT; ".format(path=self.path)
+                return
+
+            changed = json.dumps(session, sort_keys=True) != initial
+            # Re-save unchanged sessions once they are half way to expiry so active users keep them
+            due = time.time() - stored["saved_at"] > self.max_age / 2
+            if not (changed or due or not session_id):
+                return
+
+            if not session_id or ("user" in session and not had_user):
+                # New session, or a login: issue a fresh id so pre-login ids cannot be fixed
+                if session_id:
+                    await self.backend.delete(session_id)
+                session_id = secrets.token_urlsafe(32)
+
+            await self.backend.save(session_id, {"data": session, "saved_at": time.time()}, self.max_age)
+            state["cookie"] = "{data}; path={path}; Max-Age={max_age}; ".format(
+                data=session_id, path=self.path, max_age=self.max_age
+            )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                await persist()
+                if state["cookie"]:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Set-Cookie",
+                        f"{self.session_cookie}={state['cookie']}{self.security_flags}"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def create_session_backend(kind: str, redis_url: Optional[str] = None) -> SessionBackend:
+    """Build the backend named by settings.SESSION_BACKEND ('memory' or 'redis')"""
+    if kind == "memory":
+        return MemorySessionBackend()
+    if kind == "redis":
+        if not redis_url:
+            raise RuntimeError("REDIS_URL must be set when SESSION_BACKEND is 'redis'")
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("The 'redis' package is required when SESSION_BACKEND is 'redis'")
+        return RedisSessionBackend(redis.from_url(redis_url))
+    raise RuntimeError(f"Unknown SESSION_BACKEND '{kind}'")
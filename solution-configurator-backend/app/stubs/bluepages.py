@@ -0,0 +1,114 @@
+"""
+Local stand-in for the BluePages groups XML API (groupsxml.wss).
+
+Answers the listGroups and inAGroup tasks from an in-memory membership map,
+so BlueGroups checks can be exercised and benchmarked without bluepages.ibm.com.
+
+Run it next to the API:
+    BLUEPAGES_STUB_MEMBERS='{"jane@ibm.com": ["admins"]}' python -m app.stubs.bluepages --port 9200
+    BLUEGROUPS_URL=http://localhost:9200/tools/groups/groupsxml.wss uvicorn app.main:app
+
+Or mount it in-process with httpx.ASGITransport(app=create_app({...})).
+
+Faults can be injected at start-up (--latency, --error-rate) or at runtime with
+PUT /faults {"latency": 3.0, "error_rate": 0.5, "status_code": 503}.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+from typing import Dict, Iterable, List, Optional
+from xml.sax.saxutils import escape
+
+from fastapi import Body, FastAPI, Query
+from pydantic import BaseModel
+from fastapi.responses import Response
+
+GROUPS_PATH = "/tools/groups/groupsxml.wss"
+
+
+def _xml(body: str) -> Response:
+    return Response(content=f'<?xml version="1.0" encoding="UTF-8"?>\n{body}', media_type="text/xml")
+
+
+class Faults(BaseModel):
+    latency: float = 0.0       # seconds added to every response
+    error_rate: float = 0.0    # fraction of requests answered with status_code
+    status_code: int = 503
+
+
+def create_app(
+    members: Optional[Dict[str, Iterable[str]]] = None,
+    faults: Optional[Faults] = None
+) -> FastAPI:
+    """Build the stub app; members maps email -> group names"""
+    app = FastAPI(title="BluePages stub")
+    app.state.members = {
+        email.lower(): set(groups) for email, groups in (members or {}).items()
+    }
+    app.state.faults = faults or Faults()
+    app.state.request_count = 0
+
+    @app.get(GROUPS_PATH)
+    async def groupsxml(
+        task: str = Query(...),
+        email: str = Query(...),
+        group: Optional[str] = Query(None)
+    ):
+        app.state.request_count += 1
+        faults = app.state.faults
+        if faults.latency:
+            await asyncio.sleep(faults.latency)
+        if faults.error_rate and random.random() < faults.error_rate:
+            return Response(content="Injected failure", status_code=faults.status_code)
+
+        groups = app.state.members.get(email.lower(), set())
+
+        if task == "listGroups":
+            items = "".join(f"<group>{escape(name)}</group>" for name in sorted(groups))
+            return _xml(f"<groups><rc>0</rc>{items}</groups>")
+
+        if task == "inAGroup":
+            return _xml(f"<group><rc>{0 if group in groups else 1}</rc></group>")
+
+        return _xml("<error><rc>2</rc><msg>Unsupported task</msg></error>")
+
+    @app.put("/members/{email}")
+    async def set_member_groups(email: str, groups: List[str] = Body(...)):
+        """Replace a user's groups (lets tests change membership at runtime)"""
+        app.state.members[email.lower()] = set(groups)
+        return {"email": email, "groups": sorted(groups)}
+
+    @app.put("/faults")
+    async def set_faults(faults: Faults):
+        app.state.faults = faults
+        return faults
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": app.state.request_count}
+
+    return app
+
+
+def _members_from_env() -> Dict[str, List[str]]:
+    raw = os.getenv("BLUEPAGES_STUB_MEMBERS", "{}")
+    if os.path.isfile(raw):
+        with open(raw) as f:
+            return json.load(f)
+    return json.loads(raw)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the local BluePages stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    args = parser.parse_args()
+
+    faults = Faults(latency=args.latency, error_rate=args.error_rate)
+    uvicorn.run(create_app(_members_from_env(), faults), host=args.host, port=args.port)
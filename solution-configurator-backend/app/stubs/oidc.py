@@ -0,0 +1,213 @@
+"""
+Local stand-in for the IBM AppID (W3) OpenID Connect provider.
+
+Publishes a discovery document and a JWKS for a key generated at start-up, and
+signs RS256 tokens that IBMAuth.verify_token and the Authlib login flow accept.
+The authorization endpoint logs in whoever is named by login_hint (or the
+default user) without showing a page, so the whole /login -> /auth/callback
+round trip works offline.
+
+Run it next to the API:
+    python -m app.stubs.oidc --port 9100 --client-id local-client
+    IBM_CLIENT_ID=local-client \
+    IBM_DISCOVERY_ENDPOINT=http://localhost:9100/oauth/.well-known/openid-configuration \
+    uvicorn app.main:app
+
+Service callers and benchmarks can mint bearer tokens directly with
+POST /tokens {"email": "jane@ibm.com"}, or in-process with app.state.issue_token.
+"""
+import argparse
+import asyncio
+import base64
+import secrets
+import time
+from typing import Dict, Optional
+from urllib.parse import urlencode, urlparse
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Form, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse
+from jose import JWTError, jwt
+from pydantic import BaseModel
+
+DEFAULT_ISSUER = "http://127.0.0.1:9100/oauth"
+
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+class TokenRequest(BaseModel):
+    email: str
+    name: Optional[str] = None
+    ttl: int = 3600
+
+
+def create_app(
+    issuer: str = DEFAULT_ISSUER,
+    client_id: str = "local-client",
+    default_email: str = "admin@example.com",
+    latency: float = 0.0
+) -> FastAPI:
+    """
+    Build the stub app. issuer is the public base URL (its path is the route prefix);
+    latency adds a delay to every provider endpoint.
+    """
+    app = FastAPI(title="OIDC stub")
+    prefix = urlparse(issuer).path.rstrip("/")
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    kid = secrets.token_hex(8)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    public_numbers = key.public_key().public_numbers()
+    jwks = {
+        "keys": [{
+            "kty": "RSA",
+            "kid": kid,
+            "use": "sig",
+            "alg": "RS256",
+            "n": _b64url_uint(public_numbers.n),
+            "e": _b64url_uint(public_numbers.e),
+        }]
+    }
+
+    app.state.latency = latency
+    app.state.request_count = 0
+    codes: Dict[str, Dict] = {}
+
+    def issue_token(email: str, name: Optional[str] = None, ttl: int = 3600, **extra) -> str:
+        """Sign a token for email the way AppID would"""
+        now = int(time.time())
+        local_part = email.split("@")[0]
+        claims = {
+            "iss": issuer,
+            "aud": client_id,
+            "sub": email,
+            "email": email,
+            "name": name or local_part,
+            "given_name": local_part,
+            "family_name": "",
+            "iat": now,
+            "exp": now + ttl,
+            **extra,
+        }
+        return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": kid})
+
+    app.state.issue_token = issue_token
+
+    def _claims_from_bearer(request: Request) -> Dict:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer":
+            raise HTTPException(status_code=401, detail="Missing bearer token")
+        try:
+            return jwt.decode(token, jwks, algorithms=["RS256"], audience=client_id, issuer=issuer)
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+    @app.middleware("http")
+    async def slow_down(request: Request, call_next):
+        app.state.request_count += 1
+        if app.state.latency:
+            await asyncio.sleep(app.state.latency)
+        return await call_next(request)
+
+    @app.get(f"{prefix}/.well-known/openid-configuration")
+    async def discovery():
+        return {
+            "issuer": issuer,
+            "authorization_endpoint": f"{issuer}/authorization",
+            "token_endpoint": f"{issuer}/token",
+            "userinfo_endpoint": f"{issuer}/userinfo",
+            "introspection_endpoint": f"{issuer}/introspect",
+            "jwks_uri": f"{issuer}/publickeys",
+            "response_types_supported": ["code"],
+            "subject_types_supported": ["public"],
+            "id_token_signing_alg_values_supported": ["RS256"],
+        }
+
+    @app.get(f"{prefix}/publickeys")
+    async def publickeys():
+        return jwks
+
+    @app.get(f"{prefix}/authorization")
+    async def authorization(
+        redirect_uri: str = Query(...),
+        state: Optional[str] = Query(None),
+        nonce: Optional[str] = Query(None),
+        login_hint: Optional[str] = Query(None)
+    ):
+        code = secrets.token_urlsafe(16)
+        codes[code] = {"email": login_hint or default_email, "nonce": nonce}
+        params = {"code": code}
+        if state:
+            params["state"] = state
+        separator = "&" if "?" in redirect_uri else "?"
+        return RedirectResponse(f"{redirect_uri}{separator}{urlencode(params)}")
+
+    @app.post(f"{prefix}/token")
+    async def token(code: str = Form(...)):
+        login = codes.pop(code, None)
+        if login is None:
+            raise HTTPException(status_code=400, detail="invalid_grant")
+        extra = {"nonce": login["nonce"]} if login["nonce"] else {}
+        return {
+            "access_token": issue_token(login["email"]),
+            "id_token": issue_token(login["email"], **extra),
+            "token_type": "Bearer",
+            "expires_in": 3600,
+        }
+
+    @app.get(f"{prefix}/userinfo")
+    async def userinfo(request: Request):
+        claims = _claims_from_bearer(request)
+        return {k: claims[k] for k in ("sub", "email", "name", "given_name", "family_name")}
+
+    @app.post(f"{prefix}/introspect")
+    async def introspect(token: str = Form(...)):
+        try:
+            claims = jwt.decode(token, jwks, algorithms=["RS256"], audience=client_id, issuer=issuer)
+        except JWTError:
+            return {"active": False}
+        return {"active": True, **claims}
+
+    @app.post("/tokens")
+    async def mint_token(body: TokenRequest):
+        """Stub-only: sign a bearer token without going through a login"""
+        return {"access_token": issue_token(body.email, body.name, body.ttl), "token_type": "Bearer"}
+
+    @app.put("/latency")
+    async def set_latency(seconds: float = Query(..., ge=0)):
+        app.state.latency = seconds
+        return {"latency": seconds}
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": app.state.request_count}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the local OIDC provider stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--issuer", help="public base URL (default http://<host>:<port>/oauth)")
+    parser.add_argument("--client-id", default="local-client")
+    parser.add_argument("--default-email", default="admin@example.com")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+
+    issuer = args.issuer or f"http://{args.host}:{args.port}/oauth"
+    uvicorn.run(
+        create_app(issuer, args.client_id, args.default_email, args.latency),
+        host=args.host,
+        port=args.port
+    )
@@ -0,0 +1,42 @@
+"""
+In-memory stand-in for the subset of redis.asyncio.Redis used by
+app.sessions.RedisSessionBackend (get / set with ex / delete).
+
+    backend = RedisSessionBackend(FakeRedis())
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+
+class FakeRedis:
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self.commands = 0
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.commands += 1
+        return self._live(key)
+
+    async def set(self, key: str, value, ex: Optional[int] = None) -> bool:
+        self.commands += 1
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        self._data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self.commands += 1
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def aclose(self) -> None:
+        pass
@@ -0,0 +1,113 @@
+"""
+How much of each endpoint's latency is spent in get_current_active_user + require_admin?
+
+Runs the API in-process against the local OIDC and BluePages stubs
+(app.stubs.oidc / app.stubs.bluepages), so no IBM service is needed. Every
+endpoint is hit with the same load twice: once with the real auth dependencies
+(bearer token -> JWT verification -> BlueGroups role lookup) and once with both
+dependencies overridden by a constant user. The difference is the auth overhead.
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.auth_overhead --requests 2000 --concurrency 10 --groups-latency 0.05
+
+--cold empties the verified-token and group caches before every request to show
+the cost of a first request per user. Keep --concurrency below the database pool
+size (15 connections by default): the handlers query synchronously on the event
+loop, so a request waiting for a pooled connection stalls every other request.
+"""
+import argparse
+import asyncio
+
+import httpx
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+from benchmarks.common import ADMIN_EMAIL, OIDC_ISSUER, run_load, summarize
+from app import bluegroups_auth
+from app.auth.dependencies import get_current_active_user
+from app.auth.ibm_auth import ibm_auth
+from app.auth.permissions import require_admin
+from app.config import settings
+from app.main import app
+from app.stubs import bluepages, oidc
+
+DEFAULT_ENDPOINTS = [
+    "/api/v1/admin/metrics",   # require_admin, no database work
+    "/api/v1/me",
+    "/api/v1/brands",
+    "/api/v1/countries",
+    "/api/v1/admin/stats",
+]
+
+
+def _clear_auth_caches() -> None:
+    ibm_auth._verified_tokens.clear()
+    bluegroups_auth._groups_cache.clear()
+
+
+async def main(args) -> None:
+    oidc_app = oidc.create_app(OIDC_ISSUER, settings.IBM_CLIENT_ID, ADMIN_EMAIL, args.idp_latency)
+    bluepages_app = bluepages.create_app(
+        {ADMIN_EMAIL: [settings.ADMIN_BLUEGROUP]},
+        bluepages.Faults(latency=args.groups_latency)
+    )
+
+    # Route the outbound identity calls to the in-process stubs
+    ibm_auth._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=oidc_app))
+    bluegroups_auth._async_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=bluepages_app))
+
+    user = {"sub": ADMIN_EMAIL, "email": ADMIN_EMAIL, "name": "Bench Admin"}
+
+    async def constant_user():
+        return user
+
+    headers = {"Authorization": f"Bearer {oidc_app.state.issue_token(ADMIN_EMAIL)}"}
+
+    print(
+        f"{args.requests} requests/endpoint, concurrency {args.concurrency}, "
+        f"IdP latency {args.idp_latency * 1000:.0f}ms, BlueGroups latency {args.groups_latency * 1000:.0f}ms"
+        f"{', cold caches' if args.cold else ''}"
+    )
+    print(f"{'endpoint':<28}{'mode':<8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}{'errors':>8}")
+
+    # Report handler errors (e.g. a missing table) as failed requests instead of raising
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        for path in args.endpoints:
+            results = {}
+            for mode in ("auth", "no-auth"):
+                app.dependency_overrides.clear()
+                if mode == "no-auth":
+                    app.dependency_overrides[get_current_active_user] = constant_user
+                    app.dependency_overrides[require_admin] = constant_user
+
+                # Warm-up pass fills the discovery/JWKS/token/group caches (and DB pool)
+                await run_load(client, path, min(args.requests, 20), 1, headers)
+                latencies, failures, elapsed = await run_load(
+                    client, path, args.requests, args.concurrency, headers,
+                    _clear_auth_caches if args.cold and mode == "auth" else None
+                )
+                summary = results[mode] = summarize(latencies)
+                print(
+                    f"{path:<28}{mode:<8}{summary['mean']:>8.2f}ms{summary['p50']:>7.2f}ms"
+                    f"{summary['p95']:>7.2f}ms{summary['p99']:>7.2f}ms{args.requests / elapsed:>9.0f}{failures:>8}"
+                )
+
+            overhead = results["auth"]["mean"] - results["no-auth"]["mean"]
+            share = overhead / results["auth"]["mean"] * 100 if results["auth"]["mean"] else 0.0
+            print(f"{'':<28}auth overhead {overhead:.2f}ms/request ({share:.0f}% of mean latency)")
+
+    app.dependency_overrides.clear()
+    await ibm_auth.aclose()
+    await bluegroups_auth.close_async_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("endpoints", nargs="*", default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--idp-latency", type=float, default=0.0, help="seconds added by the OIDC stub")
+    parser.add_argument("--groups-latency", type=float, default=0.0, help="seconds added by the BluePages stub")
+    parser.add_argument("--cold", action="store_true", help="empty the auth caches before every request")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,176 @@
+"""
+POST /pricing/batch against one /totalHoursAndPrices call per offering.
+
+Builds offerings for the largest size, each linked to 10 activities from a shared pool
+(every activity has two WBS items staffed by three roles). For each size
+it prices that many offerings three ways through the API in-process:
+  per-offering  one GET /totalHoursAndPrices per offering, cache cold
+  batch cold    one POST /pricing/batch, cache cold
+  batch warm    the same POST again, every offering cached
+It reports the latency of each (median of --runs) and the SQL statements it
+sent, and checks that the batch returns what the single calls return.
+Authentication is replaced by a constant user. Exits non-zero on a mismatch.
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.batch_pricing --sizes 1 50 500 --runs 5
+
+Rows it creates are tagged "batch-" and removed afterwards; the pricing it
+uses comes from the benchmark catalogue (see db_concurrency), seeded if missing.
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import statistics
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable, List, Tuple
+
+import httpx
+from sqlalchemy import event
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+from benchmarks.common import ADMIN_EMAIL
+from app.auth.dependencies import get_current_active_user
+from app.crud.rollups import offering_totals
+from app.database import (
+    SessionLocal, engine, get_async_engine, get_async_session, get_primary_read_session, get_threaded_session
+)
+from app.main import app
+from app.models import Activity, ActivityWBS, Brand, Offering, OfferingActivity, Product, Staffing, WBS, WBSStaffing
+from benchmarks.db_concurrency import seed
+
+
+def build(offerings: int, activities: int = 100) -> List[str]:
+    """Offerings sharing a pool of staffed activities; returns their ids"""
+    rng = random.Random(0)
+    db = SessionLocal()
+    try:
+        roles = db.query(Staffing.staffing_id).filter(Staffing.country == "bench-country").all()
+        brand = Brand(brand_id=uuid.uuid4(), brand_name=f"batch-brand-{uuid.uuid4().hex[:8]}")
+        product = Product(product_id=uuid.uuid4(), brand_id=brand.brand_id, product_name="batch-product")
+        db.add(brand)
+        db.flush()
+        db.add(product)
+        pool = [uuid.uuid4() for _ in range(activities)]
+        db.add_all(Activity(activity_id=a, activity_name="batch-activity", brand_id=brand.brand_id) for a in pool)
+        db.flush()
+        for a in pool:
+            for _ in range(2):
+                wbs = WBS(wbs_id=uuid.uuid4(), wbs_description="batch-wbs", wbs_weeks=2)
+                db.add(wbs)
+                db.flush()
+                db.add(ActivityWBS(activity_id=a, wbs_id=wbs.wbs_id))
+                db.add_all(
+                    WBSStaffing(wbs_id=wbs.wbs_id, staffing_id=role.staffing_id, hours=rng.choice((4, 8, 16, 40)))
+                    for role in rng.sample(roles, 3)
+                )
+        offering_ids = [uuid.uuid4() for _ in range(offerings)]
+        db.add_all(
+            Offering(offering_id=o, product_id=product.product_id, offering_name="batch-offering")
+            for o in offering_ids
+        )
+        db.flush()
+        for o in offering_ids:
+            db.add_all(
+                OfferingActivity(offering_id=o, activity_id=a, sequence=n)
+                for n, a in enumerate(rng.sample(pool, 10))
+            )
+        db.commit()
+        return [str(o) for o in offering_ids]
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.query(WBS).filter(WBS.wbs_description == "batch-wbs").delete(synchronize_session=False)
+        db.query(Activity).filter(Activity.activity_name == "batch-activity").delete(synchronize_session=False)
+        db.query(Brand).filter(Brand.brand_name.like("batch-brand-%")).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def measure(call: Callable[[], Awaitable], runs: int, cold: bool) -> Tuple[float, float]:
+    """(median seconds, statements per call) of call(), clearing the cache first if cold"""
+    statements = itertools.count()
+
+    def before_cursor_execute(*args):
+        next(statements)
+
+    engines = [engine, get_async_engine().sync_engine]
+    for e in engines:
+        event.listen(e, "before_cursor_execute", before_cursor_execute)
+    timings = []
+    try:
+        for _ in range(runs):
+            if cold:
+                offering_totals.clear()
+            started = time.perf_counter()
+            await call()
+            timings.append(time.perf_counter() - started)
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", before_cursor_execute)
+    return statistics.median(timings), next(statements) / runs
+
+
+async def main(args) -> int:
+    seed()
+    offering_ids = build(max(args.sizes))
+    user = {"sub": ADMIN_EMAIL, "email": ADMIN_EMAIL, "name": "Bench Admin"}
+
+    async def constant_user():
+        return user
+
+    app.dependency_overrides[get_current_active_user] = constant_user
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    ok = True
+    print(f"{'offerings':>9}  {'session':<10}{'path':<15}{'median':>10}{'stmts':>8}")
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=300) as client:
+            for mode, dependency in (("psycopg2", get_threaded_session), ("asyncpg", get_async_session)):
+                app.dependency_overrides[get_primary_read_session] = dependency
+                for size in args.sizes:
+                    ids = offering_ids[:size]
+
+                    async def single():
+                        responses = [await client.get(f"/api/v1/totalHoursAndPrices/{o}") for o in ids]
+                        for response in responses:
+                            response.raise_for_status()
+                        return [response.json() for response in responses]
+
+                    async def batch():
+                        response = await client.post("/api/v1/pricing/batch", json={"offering_ids": ids})
+                        response.raise_for_status()
+                        return response.json()
+
+                    offering_totals.clear()
+                    batched = await batch()
+                    offering_totals.clear()
+                    if batched != await single():
+                        ok = False
+                        print(f"  FAIL batch and single results differ for {size} offerings")
+                    for path, call, cold in (("per-offering", single, True), ("batch cold", batch, True), ("batch warm", batch, False)):
+                        await call()   # warm up
+                        median, per_call = await measure(call, args.runs, cold)
+                        print(f"{size:>9}  {mode:<10}{path:<15}{median * 1000:>8.1f}ms{per_call:>8.0f}")
+    finally:
+        app.dependency_overrides.clear()
+        offering_totals.clear()
+        cleanup()
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 500], help="offerings priced per call")
+    parser.add_argument("--runs", type=int, default=5, help="timed calls per path and size")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,79 @@
+"""
+Shared setup for the benchmark scripts.
+
+Import this module before anything from app: Settings are read at import time,
+so it fills in the identity settings (pointing at the local stubs) that a
+benchmark run does not otherwise need.
+"""
+import asyncio
+import os
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+OIDC_ISSUER = "http://oidc.stub/oauth"
+BLUEPAGES_URL = "http://bluepages.stub/tools/groups/groupsxml.wss"
+ADMIN_EMAIL = "bench.admin@example.com"
+
+for name, value in {
+    "IBM_CLIENT_ID": "bench-client",
+    "IBM_TENANT_ID": "bench",
+    "IBM_CLIENT_SECRET": "bench",
+    "IBM_OAUTH_SERVER_URL": OIDC_ISSUER,
+    "IBM_DISCOVERY_ENDPOINT": f"{OIDC_ISSUER}/.well-known/openid-configuration",
+    "BLUEGROUPS_URL": BLUEPAGES_URL,
+    "FRONTEND_URL": "http://localhost:3000",
+    "SESSION_SECRET": "bench",
+    "ADMIN_BLUEGROUP": "bench-admins",
+    "SOLUTION_ARCHITECT_BLUEGROUP": "bench-architects",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """mean / p50 / p95 / p99 in milliseconds"""
+    return {
+        "mean": statistics.mean(latencies) * 1000,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    path: str,
+    requests: int,
+    concurrency: int,
+    headers: Dict = None,
+    before_request=None
+) -> Tuple[List[float], int, float]:
+    """
+    GET path `requests` times with at most `concurrency` in flight.
+    Returns (latencies in seconds, number of failed responses, elapsed seconds).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            if before_request:
+                before_request()
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, failures, time.perf_counter() - started
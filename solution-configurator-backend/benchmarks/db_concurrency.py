@@ -0,0 +1,135 @@
+"""
+Throughput and tail latency of the database-backed endpoints, psycopg2 vs asyncpg.
+
+Runs the API in-process and hits each endpoint at several concurrency levels,
+once with the threaded psycopg2 session (DATABASE_ASYNC=false) and once with the
+asyncpg session (DATABASE_ASYNC=true). Authentication is replaced by a constant
+user so only the request path and the database are measured.
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.db_concurrency --seed --requests 2000 --concurrency 50 100 200
+
+--seed inserts a small catalogue (tagged "bench-") to query; --cleanup removes it.
+"""
+import argparse
+import asyncio
+import uuid
+
+import httpx
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+from benchmarks.common import ADMIN_EMAIL, run_load, summarize
+from app.auth.dependencies import get_current_active_user
+from app.auth.permissions import require_admin
+from app.database import (
+    SessionLocal, get_async_session, get_read_session, get_session, get_threaded_session
+)
+from app.main import app
+from app.models import (
+    Activity, ActivityWBS, Brand, Offering, OfferingActivity,
+    PricingDetail, Product, Staffing, WBS, WBSStaffing
+)
+
+BENCH_BRAND = "bench-brand"
+
+
+def seed(offerings: int = 20, activities_per_offering: int = 10) -> str:
+    """Insert a catalogue to query and return the product_id (reuses an earlier seed)"""
+    db = SessionLocal()
+    try:
+        brand = db.query(Brand).filter(Brand.brand_name == BENCH_BRAND).first()
+        if brand:
+            return str(db.query(Product).filter(Product.brand_id == brand.brand_id).first().product_id)
+
+        brand = Brand(brand_id=uuid.uuid4(), brand_name=BENCH_BRAND)
+        product = Product(product_id=uuid.uuid4(), brand_id=brand.brand_id, product_name="bench-product")
+        db.add_all([brand, product])
+
+        staffing = []
+        for band in range(6, 11):
+            for role in ("Consultant", "Architect", "Project Manager"):
+                row = Staffing(staffing_id=uuid.uuid4(), country="bench-country", role=role, band=band)
+                staffing.append(row)
+                db.add(row)
+                db.add(PricingDetail(pricing_id=uuid.uuid4(), staffing_id=row.staffing_id, cost=100 + band, sale_price=150 + band))
+
+        for o in range(offerings):
+            offering = Offering(offering_id=uuid.uuid4(), product_id=product.product_id, offering_name=f"bench-offering-{o}")
+            db.add(offering)
+            for a in range(activities_per_offering):
+                activity = Activity(activity_id=uuid.uuid4(), activity_name=f"bench-activity-{o}-{a}", brand_id=brand.brand_id)
+                wbs = WBS(wbs_id=uuid.uuid4(), wbs_description=f"bench-wbs-{o}-{a}", wbs_weeks=2)
+                db.add_all([activity, wbs])
+                db.add(OfferingActivity(offering_id=offering.offering_id, activity_id=activity.activity_id, sequence=a))
+                db.add(ActivityWBS(activity_id=activity.activity_id, wbs_id=wbs.wbs_id))
+                for row in staffing[a % 5::5]:
+                    db.add(WBSStaffing(wbs_id=wbs.wbs_id, staffing_id=row.staffing_id, hours=8))
+        db.commit()
+        return str(product.product_id)
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.query(WBS).filter(WBS.wbs_description.like("bench-wbs-%")).delete(synchronize_session=False)
+        db.query(Activity).filter(Activity.activity_name.like("bench-activity-%")).delete(synchronize_session=False)
+        db.query(Staffing).filter(Staffing.country == "bench-country").delete(synchronize_session=False)
+        db.query(Brand).filter(Brand.brand_name == BENCH_BRAND).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def main(args) -> None:
+    if args.cleanup:
+        cleanup()
+        return
+
+    endpoints = args.endpoints
+    if not endpoints:
+        product_id = seed() if args.seed else None
+        endpoints = ["/api/v1/staffing/all", "/api/v1/pricing/all", "/api/v1/wbs/"]
+        if product_id:
+            endpoints.insert(0, f"/api/v1/offerings?product_id={product_id}")
+
+    user = {"sub": ADMIN_EMAIL, "email": ADMIN_EMAIL, "name": "Bench Admin"}
+
+    async def constant_user():
+        return user
+
+    app.dependency_overrides[get_current_active_user] = constant_user
+    app.dependency_overrides[require_admin] = constant_user
+
+    print(f"{args.requests} requests per run")
+    print(f"{'endpoint':<44}{'session':<10}{'clients':>8}{'req/s':>9}{'p50':>10}{'p99':>10}{'errors':>8}")
+
+    # Report handler errors as failed requests instead of raising
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=120) as client:
+        for path in endpoints:
+            for mode, dependency in (("psycopg2", get_threaded_session), ("asyncpg", get_async_session)):
+                app.dependency_overrides[get_session] = dependency
+                app.dependency_overrides[get_read_session] = dependency
+                await run_load(client, path, 50, 10)   # warm up the connection pool
+                for concurrency in args.concurrency:
+                    latencies, failures, elapsed = await run_load(client, path, args.requests, concurrency)
+                    summary = summarize(latencies)
+                    print(
+                        f"{path[:43]:<44}{mode:<10}{concurrency:>8}{args.requests / elapsed:>9.0f}"
+                        f"{summary['p50']:>8.1f}ms{summary['p99']:>8.1f}ms{failures:>8}"
+                    )
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("endpoints", nargs="*", help="paths to hit (default: a set of catalogue reads)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--seed", action="store_true", help="insert a benchmark catalogue first")
+    parser.add_argument("--cleanup", action="store_true", help="remove the benchmark catalogue and exit")
+    asyncio.run(main(parser.parse_args()))
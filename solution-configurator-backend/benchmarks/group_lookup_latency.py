@@ -0,0 +1,170 @@
+"""
+p99 latency of unrelated endpoints while BlueGroups lookups are slow.
+
+Serves the API and the BluePages stub (app.stubs.bluepages, with
+--groups-latency added to every answer) over real HTTP on local ports, each on
+its own event loop, then drives two loads at once against the API: admin
+requests on --admin-path (require_admin, so one group lookup each) and, every
+--probe-interval, a request to an unrelated --probe-path. Each is run:
+
+  blocking  require_admin replaced by the old check, the blocking
+            is_user_in_group called on the event loop
+  async     the real require_admin (get_user_groups_async on the pooled client)
+
+both with the group cache warm (cached: every lookup answered in process) and
+emptied before every admin request (cold: every lookup goes to BluePages).
+While a blocking lookup is on the wire the whole worker stalls, so the probe's
+p99 climbs past the BluePages latency; on the async path it should stay flat.
+Exits non-zero if the async path's cold probe p99 is no better than the blocking one.
+
+Also times get_user_groups_async itself on a warm cache. Authentication is
+replaced by a constant user, and no database is needed:
+    python -m benchmarks.group_lookup_latency --requests 300 --concurrency 10 --groups-latency 0.05
+"""
+import argparse
+import asyncio
+import logging
+import socket
+import sys
+import threading
+import time
+from typing import List, Tuple
+
+import httpx
+import uvicorn
+from fastapi import Depends, HTTPException, status
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+from benchmarks.common import ADMIN_EMAIL, percentile, run_load, summarize
+from app import bluegroups_auth
+from app.auth.dependencies import get_current_active_user
+from app.auth.permissions import ADMIN_GROUP, require_admin
+from app.config import settings
+from app.main import app
+from app.stubs import bluepages
+
+
+def serve(asgi_app) -> Tuple[uvicorn.Server, str]:
+    """
+    Run asgi_app on a free local port in a background thread; returns the server
+    and its base URL. Lifespan events are skipped, so the API does not warm a
+    database pool it will not use.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(
+        asgi_app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"
+    ))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def blocking_require_admin(current_user: dict = Depends(get_current_active_user)):
+    """require_admin as it was: a blocking BluePages round trip on the event loop"""
+    if not bluegroups_auth.is_user_in_group(current_user["email"], ADMIN_GROUP):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Administrator access required.")
+    return current_user
+
+
+async def probe(client: httpx.AsyncClient, path: str, interval: float, done: asyncio.Event) -> tuple:
+    """(latencies in seconds, failed responses) of GETs sent interval apart until done is set"""
+    latencies, failures = [], 0
+    while not done.is_set():
+        await asyncio.sleep(interval)
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        failures += response.status_code >= 400
+    return latencies, failures
+
+
+async def cached_lookup_latencies(requests: int) -> List[float]:
+    """Seconds per get_user_groups_async call answered from a warm cache"""
+    bluegroups_auth._remember(ADMIN_EMAIL, frozenset([ADMIN_GROUP]))
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await bluegroups_auth.get_user_groups_async(ADMIN_EMAIL)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def main(args) -> int:
+    stub, stub_url = serve(bluepages.create_app(
+        {ADMIN_EMAIL: [ADMIN_GROUP]}, bluepages.Faults(latency=args.groups_latency)
+    ))
+    settings.BLUEGROUPS_URL = stub_url + bluepages.GROUPS_PATH
+    api, api_url = serve(app)
+    user = {"sub": ADMIN_EMAIL, "email": ADMIN_EMAIL, "name": "Bench Admin"}
+
+    async def constant_user():
+        return user
+
+    for name in ("httpx", "app"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    print(
+        f"{args.requests} requests per path, concurrency {args.concurrency}, "
+        f"BlueGroups latency {args.groups_latency * 1000:.0f}ms"
+    )
+    print(f"{'mode':<10}{'cache':<8}{'path':<24}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}")
+
+    failures = 0
+    probe_p99 = {}
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=60) as client:
+        for mode in ("blocking", "async"):
+            for cache in ("cached", "cold"):
+                app.dependency_overrides.clear()
+                app.dependency_overrides[get_current_active_user] = constant_user
+                if mode == "blocking":
+                    app.dependency_overrides[require_admin] = blocking_require_admin
+                bluegroups_auth._groups_cache.clear()
+                await client.get(args.admin_path)  # fills the group cache
+
+                clear = bluegroups_auth._groups_cache.clear if cache == "cold" else None
+                done = asyncio.Event()
+                probing = asyncio.ensure_future(probe(client, args.probe_path, args.probe_interval, done))
+                admin = await run_load(client, args.admin_path, args.requests, args.concurrency, before_request=clear)
+                done.set()
+                probes = await probing
+                for path, (latencies, errors) in ((args.admin_path, admin[:2]), (args.probe_path, probes)):
+                    summary = summarize(latencies)
+                    failures += errors
+                    print(
+                        f"{mode:<10}{cache:<8}{path:<24}{summary['p50']:>7.2f}ms"
+                        f"{summary['p95']:>7.2f}ms{summary['p99']:>7.2f}ms{errors:>8}"
+                    )
+                probe_p99[mode, cache] = summarize(probes[0])["p99"]
+
+    app.dependency_overrides.clear()
+    bluegroups_auth._groups_cache.clear()
+    lookups = await cached_lookup_latencies(args.requests * 10)
+    print(
+        f"get_user_groups_async, warm cache: p50 {percentile(lookups, 50) * 1e6:.1f}us "
+        f"p99 {percentile(lookups, 99) * 1e6:.1f}us over {len(lookups)} calls"
+    )
+
+    # The pooled BlueGroups client belongs to the API's loop; stopping the server is enough
+    api.should_exit = stub.should_exit = True
+
+    # Slow lookups stall the probe on the blocking path; the async path must do better
+    stalled = probe_p99["async", "cold"] >= probe_p99["blocking", "cold"]
+    if failures or stalled:
+        print(f"FAIL {failures} failed request(s)" + (", probe p99 stalled behind lookups" if stalled else ""))
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--groups-latency", type=float, default=0.05, help="seconds added by the BluePages stub")
+    parser.add_argument("--admin-path", default="/api/v1/admin/metrics", help="endpoint behind require_admin")
+    parser.add_argument("--probe-path", default="/health", help="endpoint with no group check")
+    parser.add_argument("--probe-interval", type=float, default=0.005, help="seconds between probe requests")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,174 @@
+"""
+Check that the hot catalogue and pricing queries are served by indexes.
+
+Runs the real CRUD functions, captures the SQL they send, and EXPLAINs each
+statement with sequential scans disabled. Postgres then falls back to a
+sequential scan only where no usable index exists, so any Seq Scan node in a
+plan marks a missing index, whatever the table sizes. Keyset pages of the
+list endpoints must also come out of an index in order. They are EXPLAINed
+with sorting disabled too, so a Sort node left in the plan means no index
+matches the sort key: every row past the cursor would be read and sorted,
+and page latency would grow with the table. Exits non-zero on either.
+tests/test_index_usage.py runs the same checks under pytest.
+
+Run from solution-configurator-backend against a database migrated to head:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.index_usage --seed
+"""
+import argparse
+import json
+import sys
+import uuid
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import event, text
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+import benchmarks.common  # noqa: F401
+from app.crud import activity as crud_activity
+from app.crud import brand as crud_brand
+from app.crud import country as crud_country
+from app.crud import offering as crud_offering
+from app.crud import pricing as crud_pricing
+from app.crud import product as crud_product
+from app.crud import staffing as crud_staffing
+from app.database import SessionLocal, engine
+from app.models import Offering
+from app.pagination import PageRequest
+from benchmarks.db_concurrency import seed
+
+SEARCH_CHECK = "/offerings/search/?query="
+
+
+def _capture(fn: Callable, *args) -> List[Tuple[str, Dict]]:
+    """Run fn(session, *args) and return the SELECT statements it executed"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn(db, *args)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        db.close()
+    return statements
+
+
+def _plan_nodes(plan: Dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def explain(statement: str, parameters, ordered: bool = False) -> List[Dict]:
+    """Plan nodes for statement, with sequential scans (and, if ordered, sorts) disabled"""
+    with engine.connect() as connection:
+        connection.execute(text("SET enable_seqscan = off"))
+        if ordered:
+            connection.execute(text("SET enable_sort = off"))
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        connection.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_plan_nodes(plan[0]["Plan"]))
+
+
+def _deep_page(sorts: Dict, sort: str) -> PageRequest:
+    """A page request whose cursor sits before every row, so the keyset filter is in the plan"""
+    lowest = {str: "", int: -2 ** 31, uuid.UUID: uuid.UUID(int=0)}
+    columns = sorts[sort]
+    return PageRequest(sort, columns, 100, after=[lowest[c.type.python_type] for c in columns])
+
+
+def checks(offering_id: str) -> List[Tuple[str, Callable, tuple, bool]]:
+    """(name, function, arguments, whether rows must come out of an index already sorted) of each hot query"""
+    return [
+        ("get_staffing_by_offering", crud_staffing.get_staffing_by_offering, (offering_id,), False),
+        ("get_activities_by_offering", crud_activity.get_activities_by_offering, (offering_id,), False),
+        ("/pricing/all", crud_pricing.get_all_pricing_with_staffing, (), False),
+        ("/brands page", crud_brand.get_brands, (_deep_page(crud_brand.BRAND_SORTS, "brand_name"),), True),
+        ("/countries page", crud_country.get_countries, (_deep_page(crud_country.COUNTRY_SORTS, "country_name"),), True),
+        ("/products/all page", crud_product.get_all_products, (_deep_page(crud_product.PRODUCT_SORTS, "product_name"),), True),
+        (
+            "/offerings/search/ page", lambda db, page: crud_offering.search_offerings(db, page=page),
+            (_deep_page(crud_offering.OFFERING_SORTS, "offering_name"),), True
+        ),
+        # Without pg_trgm the substring matches cannot use an index, so callers skip the search
+        (
+            SEARCH_CHECK, lambda db: crud_offering.search_offerings(db, query="migration assessment"),
+            (), False
+        ),
+        ("/staffing/all page", crud_staffing.get_all_staffing, (_deep_page(crud_staffing.STAFFING_SORTS, "country"),), True),
+        ("/pricing/all page", crud_pricing.get_all_pricing_with_staffing, (_deep_page(crud_pricing.PRICING_SORTS, "country"),), True),
+        ("/library page", crud_activity.get_all_activities, (_deep_page(crud_activity.ACTIVITY_SORTS, "activity_name"),), True),
+    ]
+
+
+def has_trigrams() -> bool:
+    db = SessionLocal()
+    try:
+        return crud_offering._has_trigrams(db)
+    finally:
+        db.close()
+
+
+def plans(fn: Callable, fn_args: tuple, ordered: bool) -> List[Tuple[List[str], List[str], bool]]:
+    """(indexes used, tables scanned sequentially, whether rows are sorted after reading) of each statement fn runs"""
+    result = []
+    for statement, parameters in _capture(fn, *fn_args):
+        nodes = explain(statement, parameters, ordered)
+        indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+        scans = sorted({node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"})
+        sorted_ = ordered and any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes)
+        result.append((indexes, scans, sorted_))
+    return result
+
+
+def main(args) -> int:
+    offering_id = args.offering_id
+    if not offering_id:
+        product_id = seed() if args.seed else None
+        db = SessionLocal()
+        try:
+            query = db.query(Offering.offering_id)
+            if product_id:
+                query = query.filter(Offering.product_id == product_id)
+            offering = query.first()
+        finally:
+            db.close()
+        if offering is None:
+            print("No offering to query; pass --seed or --offering-id")
+            return 2
+        offering_id = str(offering.offering_id)
+
+    trigrams = has_trigrams()
+    failed = False
+    for name, fn, fn_args, ordered in checks(offering_id):
+        if name == SEARCH_CHECK and not trigrams:
+            print(f"{'skip':<6}{name:<30}pg_trgm is not installed: substring matches scan offerings")
+            continue
+        for indexes, scans, sorted_ in plans(fn, fn_args, ordered):
+            status = "FAIL" if scans or sorted_ else "ok"
+            failed = failed or status == "FAIL"
+            print(f"{status:<6}{name:<30}indexes: {', '.join(indexes) or '-'}")
+            if scans:
+                print(f"{'':<36}sequential scan on: {', '.join(scans)}")
+            if sorted_:
+                print(f"{'':<36}page is sorted after reading: no index matches the sort key")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--offering-id", help="offering to query (default: the first one)")
+    parser.add_argument("--seed", action="store_true", help="insert the benchmark catalogue first")
+    sys.exit(main(parser.parse_args()))
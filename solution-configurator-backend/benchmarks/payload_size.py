@@ -0,0 +1,156 @@
+"""
+Response and database bytes of the catalogue lists, full records vs sparse fieldsets.
+
+Runs the API in-process, walks each list endpoint to the last page once for
+full records and once per ?fields= selection, and reports the JSON bytes sent
+to the client, the number of columns selected and the bytes the database sent
+back for those SELECTs (each captured statement is re-run as
+sum(octet_length(row::text)), which is the text-protocol size psycopg2 receives).
+Authentication is replaced by a constant user.
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.payload_size --seed --text-bytes 1500
+
+--seed inserts the benchmark catalogue (see db_concurrency) and fills the long
+text columns of its offerings and activities with --text-bytes of prose each,
+roughly what a written-up catalogue entry holds.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+from sqlalchemy import Text, event, text
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+from benchmarks.common import ADMIN_EMAIL
+from app.auth.dependencies import get_current_active_user
+from app.database import SessionLocal, engine, get_read_session, get_threaded_session
+from app.main import app
+from app.models import Activity, Offering
+from app.pagination import NEXT_CURSOR_HEADER
+from benchmarks.db_concurrency import seed
+
+WORDS = (
+    "client platform migration workload assessment roadmap integration security "
+    "governance automation hybrid cloud data analytics outcome delivery workshop "
+    "architecture operating model adoption value stakeholder modernization"
+).split()
+
+
+def fill_text(text_bytes: int) -> None:
+    """Give the benchmark offerings and activities text-heavy descriptions"""
+    rng = random.Random(0)
+
+    def prose() -> str:
+        words = []
+        while sum(len(w) + 1 for w in words) < text_bytes:
+            words.append(rng.choice(WORDS))
+        return " ".join(words)[:text_bytes]
+
+    db = SessionLocal()
+    try:
+        for model, name_column in ((Offering, Offering.offering_name), (Activity, Activity.activity_name)):
+            columns = [c.key for c in model.__table__.columns if isinstance(c.type, Text)]
+            for row in db.query(model).filter(name_column.like("bench-%")):
+                for column in columns:
+                    setattr(row, column, prose())
+        db.commit()
+    finally:
+        db.close()
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE offerings, activities"))
+
+
+def _db_bytes(statements: List[Tuple[str, Dict]]) -> Tuple[int, int]:
+    """(columns selected by the widest statement, bytes the database returned for all of them)"""
+    columns, total = 0, 0
+    with engine.connect() as connection:
+        cursor = connection.connection.cursor()
+        try:
+            for statement, parameters in statements:
+                cursor.execute(f"SELECT * FROM ({statement}) t LIMIT 0", parameters)
+                columns = max(columns, len(cursor.description))
+                cursor.execute(f"SELECT coalesce(sum(octet_length(t::text)), 0) FROM ({statement}) t", parameters)
+                total += cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        connection.rollback()
+    return columns, total
+
+
+async def walk(client: httpx.AsyncClient, path: str, params: Dict) -> Tuple[int, int, float, List[Tuple[str, Dict]]]:
+    """Fetch every page of path: (rows, response bytes, seconds, SELECTs sent)"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    rows, size, cursor = 0, 0, None
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    started = time.perf_counter()
+    try:
+        while True:
+            response = await client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+            response.raise_for_status()
+            rows += len(response.json())
+            size += len(response.content)
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                break
+    finally:
+        elapsed = time.perf_counter() - started
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return rows, size, elapsed, statements
+
+
+async def main(args) -> None:
+    product_id = seed() if args.seed else args.product_id
+    if args.seed:
+        fill_text(args.text_bytes)
+
+    cases = [
+        ("/api/v1/library", {}, [None, "summary", "activity_name,category,description,duration_weeks,effort_hours"]),
+        ("/api/v1/offerings/search/", {}, [None, "summary"]),
+    ]
+    if product_id:
+        cases.insert(0, ("/api/v1/offerings", {"product_id": product_id}, [None, "summary"]))
+
+    user = {"sub": ADMIN_EMAIL, "email": ADMIN_EMAIL, "name": "Bench Admin"}
+
+    async def constant_user():
+        return user
+
+    app.dependency_overrides[get_current_active_user] = constant_user
+    app.dependency_overrides[get_read_session] = get_threaded_session
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(f"{'endpoint':<28}{'fields':<22}{'rows':>6}{'response':>12}{'columns':>9}{'db bytes':>12}{'ms':>8}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=120) as client:
+        for path, params, selections in cases:
+            for fields in selections:
+                query = {**params, "limit": args.limit, **({"fields": fields} if fields else {})}
+                await walk(client, path, query)   # warm up
+                rows, size, elapsed, statements = await walk(client, path, query)
+                columns, db_bytes = _db_bytes(statements)
+                label = (fields or "(full)")[:21]
+                print(
+                    f"{path[7:34]:<28}{label:<22}{rows:>6}{size:>12,}{columns:>9}{db_bytes:>12,}{elapsed * 1000:>8.1f}"
+                )
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--product-id", help="product whose offerings to list (default: the seeded one)")
+    parser.add_argument("--seed", action="store_true", help="insert the benchmark catalogue first")
+    parser.add_argument("--text-bytes", type=int, default=1500, help="bytes per text column when seeding")
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    asyncio.run(main(parser.parse_args()))
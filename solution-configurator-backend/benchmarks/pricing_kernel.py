@@ -0,0 +1,112 @@
+"""
+The RateCard pricing kernel against pricing hours x rate in Decimal.
+
+A --roles role card and --activities activities staffing --per-activity roles
+each, given as the (activity, staffing_id, hours) columns the pricing queries
+return. Both sides compute the same thing: hours, cost and sale price of each
+activity, and a line item per activity and role. The kernel's time includes
+turning the columns into StaffedHours; the card is built once, as
+get_rate_card keeps it. Exits non-zero unless the kernel agrees with Decimal
+and is faster. Its correctness checks are in tests/test_rate_card.py.
+
+No database is needed:
+    python -m benchmarks.pricing_kernel --activities 10000 --roles 2000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import namedtuple
+from decimal import Decimal
+from typing import Callable, Tuple
+
+from app.rate_card import RateCard
+
+Role = namedtuple("Role", "staffing_id country role band pricing_id cost sale_price")
+
+
+def timed(call: Callable, runs: int) -> Tuple[float, object]:
+    timings, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main(args) -> int:
+    rng = random.Random(args.seed)
+    card = [
+        Role(uuid.uuid4(), "kernel-country", "Kernel", band, uuid.uuid4(),
+             Decimal(rng.randint(0, 99_999)).scaleb(-2), Decimal(rng.randint(0, 99_999)).scaleb(-2))
+        for band in range(args.roles)
+    ]
+    rows, staffing_ids, hours = [], [], []
+    for activity in range(args.activities):
+        for n in rng.sample(range(args.roles), args.per_activity):
+            rows.append(activity)
+            staffing_ids.append(card[n].staffing_id)
+            hours.append(rng.choice((4, 8, 16, 40)))
+
+    def decimal_loop():
+        rates = {role.staffing_id: role for role in card}
+        totals = [[0, Decimal(0), Decimal(0)] for _ in range(args.activities)]
+        items = {}
+        for row, staffing_id, role_hours in zip(rows, staffing_ids, hours):
+            role = rates[staffing_id]
+            cost, sale_price = role_hours * (role.cost or 0), role_hours * (role.sale_price or 0)
+            total = totals[row]
+            total[0] += role_hours
+            total[1] += cost
+            total[2] += sale_price
+            item = items.setdefault((row, staffing_id), [0, Decimal(0), Decimal(0)])
+            item[0] += role_hours
+            item[1] += cost
+            item[2] += sale_price
+        return totals, items
+
+    kernel = RateCard(card)
+
+    def kernel_pricing():
+        staffed = kernel.staffed(rows, staffing_ids, hours, args.activities)
+        return staffed, kernel.totals(staffed), kernel.line_items(staffed)
+
+    build_time, _ = timed(lambda: RateCard(card), args.runs)
+    kernel_time, (staffed, (_, cost, sale_price), line_items) = timed(kernel_pricing, args.runs)
+    decimal_time, (expected, expected_items) = timed(decimal_loop, args.runs)
+
+    staffed_bytes = sum(column.nbytes for column in staffed[:3])
+    print(f"{args.activities} activities x {args.roles} roles, {args.per_activity} staffed per activity, median of {args.runs}")
+    print(f"{'kernel: build card (once)':<30}{build_time * 1000:>10.1f}ms")
+    print(f"{'kernel: price':<30}{kernel_time * 1000:>10.1f}ms   ({staffed_bytes / 2 ** 20:.1f} MiB of hours)")
+    print(f"{'Decimal loop':<30}{decimal_time * 1000:>10.1f}ms")
+    print(f"kernel speedup: {decimal_time / kernel_time:.1f}x")
+
+    failures = []
+    if [(c * 100, s * 100) for _, c, s in expected] != [(Decimal(c), Decimal(s)) for c, s in zip(cost.tolist(), sale_price.tolist())]:
+        failures.append("kernel totals differ from the Decimal loop")
+    row, position, item_hours, item_cost, item_sale_price = (column.tolist() for column in line_items)
+    got_items = {
+        (r, card[p].staffing_id): [h, Decimal(c), Decimal(sp)]
+        for r, p, h, c, sp in zip(row, position, item_hours, item_cost, item_sale_price)
+    }
+    if got_items != {key: [h, c * 100, sp * 100] for key, (h, c, sp) in expected_items.items()}:
+        failures.append("kernel line items differ from the Decimal loop")
+    if kernel_time >= decimal_time:
+        failures.append("the kernel is no faster than the Decimal loop")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("PASS" if not failures else "FAIL")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--activities", type=int, default=10000)
+    parser.add_argument("--roles", type=int, default=2000, help="roles in the rate card")
+    parser.add_argument("--per-activity", type=int, default=6, help="roles staffed per activity")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(main(parser.parse_args()))
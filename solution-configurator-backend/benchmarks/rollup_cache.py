@@ -0,0 +1,276 @@
+"""
+Consistency and hit rate of the offering totals cache under random writes.
+
+Builds a small catalogue whose offerings share activities, WBS items and
+staffing roles, then applies random writes through the CRUD functions: links
+and unlinks of offering_activities and activity_wbs, WBS staffing hours and
+pricing changes. Each write and read uses its own session, as a request does.
+
+Phase 1 runs the writes one at a time. After each one, every offering's cached
+totals must equal a fresh get_offering_totals.
+Phase 2 runs writer and reader threads concurrently (the readers ask for the
+totals of random offerings), then checks every offering once they stop.
+
+Reports the cache hit rate, recomputes and invalidations of each phase, and
+exits non-zero on any mismatch.
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.rollup_cache --writes 300 --seconds 10 --threads 4
+
+Rows it creates are tagged "cache-" and removed afterwards.
+tests/test_rollup_cache.py runs both phases, smaller, under pytest.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+import benchmarks.common  # noqa: F401
+from app.crud import activity as crud_activity
+from app.crud import pricing as crud_pricing
+from app.crud import wbs as crud_wbs
+from app.crud import wbs_staffing as crud_wbs_staffing
+from app.crud.rollups import offering_totals
+from app.database import SessionLocal
+from app.models import (
+    Activity, ActivityWBS, Brand, Offering, OfferingActivity, PricingDetail, Product, Staffing, WBS, WBSStaffing
+)
+from app.schemas.activity import OfferingActivityCreate
+from app.schemas.pricing import PricingDetailCreate, PricingDetailUpdate
+
+COUNTRY = "cache-country"
+
+
+class Catalogue:
+    def __init__(
+        self, offerings: List[uuid.UUID], activities: List[uuid.UUID], wbs: List[uuid.UUID], staffing: List[uuid.UUID]
+    ):
+        self.offerings = offerings
+        self.activities = activities
+        self.wbs = wbs
+        self.staffing = staffing
+
+
+def setup(rng: random.Random, offerings: int = 8, activities: int = 16, wbs: int = 24, roles: int = 6) -> Catalogue:
+    """Offerings sharing activities, activities sharing WBS items, WBS items sharing roles"""
+    db = SessionLocal()
+    try:
+        brand = Brand(brand_id=uuid.uuid4(), brand_name=f"cache-brand-{uuid.uuid4().hex[:8]}")
+        product = Product(product_id=uuid.uuid4(), brand_id=brand.brand_id, product_name="cache-product")
+        db.add(brand)
+        db.flush()
+        db.add(product)
+        db.flush()
+        catalogue = Catalogue(
+            [uuid.uuid4() for _ in range(offerings)], [uuid.uuid4() for _ in range(activities)],
+            [uuid.uuid4() for _ in range(wbs)], [uuid.uuid4() for _ in range(roles)]
+        )
+        db.add_all(
+            Offering(offering_id=o, product_id=product.product_id, offering_name="cache-offering")
+            for o in catalogue.offerings
+        )
+        db.add_all(
+            Activity(activity_id=a, activity_name="cache-activity", brand_id=brand.brand_id)
+            for a in catalogue.activities
+        )
+        db.add_all(WBS(wbs_id=w, wbs_description="cache-wbs", wbs_weeks=1) for w in catalogue.wbs)
+        db.add_all(
+            Staffing(staffing_id=s, country=COUNTRY, role="Cache", band=band)
+            for band, s in enumerate(catalogue.staffing)
+        )
+        db.flush()
+        # The last role stays unpriced
+        db.add_all(
+            PricingDetail(pricing_id=uuid.uuid4(), staffing_id=s, cost=100 + n, sale_price=Decimal("150.25") + n)
+            for n, s in enumerate(catalogue.staffing[:-1])
+        )
+        for o in catalogue.offerings:
+            for sequence, a in enumerate(rng.sample(catalogue.activities, 4)):
+                db.add(OfferingActivity(offering_id=o, activity_id=a, sequence=sequence))
+        for a in catalogue.activities:
+            db.add_all(ActivityWBS(activity_id=a, wbs_id=w) for w in rng.sample(catalogue.wbs, 3))
+        for w in catalogue.wbs:
+            db.add_all(
+                WBSStaffing(wbs_id=w, staffing_id=s, hours=rng.randint(1, 40))
+                for s in rng.sample(catalogue.staffing, 2)
+            )
+        db.commit()
+        return catalogue
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.query(WBS).filter(WBS.wbs_description == "cache-wbs").delete(synchronize_session=False)
+        db.query(Activity).filter(Activity.activity_name == "cache-activity").delete(synchronize_session=False)
+        db.query(Staffing).filter(Staffing.country == COUNTRY).delete(synchronize_session=False)
+        db.query(Brand).filter(Brand.brand_name.like("cache-brand-%")).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def writes(catalogue: Catalogue) -> List[Callable]:
+    """Random CRUD writes; each takes (session, rng)"""
+    def pricing_of(db, staffing_id):
+        return crud_pricing.get_pricing_by_staffing_id(db, staffing_id)
+
+    def link(db, rng):
+        crud_activity.link_activity_to_offering(db, OfferingActivityCreate(
+            offering_id=rng.choice(catalogue.offerings), activity_id=rng.choice(catalogue.activities), sequence=9
+        ))
+
+    def unlink(db, rng):
+        crud_activity.unlink_activity_from_offering(
+            db, rng.choice(catalogue.offerings), rng.choice(catalogue.activities)
+        )
+
+    def add_wbs(db, rng):
+        crud_wbs.add_wbs_to_activity(db, rng.choice(catalogue.activities), rng.choice(catalogue.wbs))
+
+    def remove_wbs(db, rng):
+        crud_wbs.remove_wbs_from_activity(db, rng.choice(catalogue.activities), rng.choice(catalogue.wbs))
+
+    def assign(db, rng):
+        crud_wbs_staffing.assign_staffing_to_wbs(
+            db, rng.choice(catalogue.wbs), rng.choice(catalogue.staffing), rng.randint(1, 40)
+        )
+
+    def unassign(db, rng):
+        crud_wbs_staffing.delete_wbs_staffing(db, rng.choice(catalogue.wbs), rng.choice(catalogue.staffing))
+
+    def reprice(db, rng):
+        pricing = pricing_of(db, rng.choice(catalogue.staffing))
+        if pricing:
+            crud_pricing.update_pricing(db, pricing.pricing_id, PricingDetailUpdate(
+                sale_price=Decimal(rng.randint(10000, 30000)) / 100
+            ))
+
+    def price_or_unprice(db, rng):
+        staffing_id = rng.choice(catalogue.staffing)
+        pricing = pricing_of(db, staffing_id)
+        if pricing:
+            crud_pricing.delete_pricing(db, pricing.pricing_id)
+        else:
+            crud_pricing.create_pricing(db, PricingDetailCreate(
+                staffing_id=staffing_id, cost=Decimal("99.99"), sale_price=Decimal("149.99")
+            ))
+
+    return [link, unlink, add_wbs, remove_wbs, assign, unassign, reprice, price_or_unprice]
+
+
+def in_session(fn: Callable, *args):
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+def mismatches(catalogue: Catalogue) -> List[str]:
+    """Offerings whose cached totals differ from a fresh computation"""
+    return [
+        str(o) for o in catalogue.offerings
+        if in_session(crud_pricing.get_cached_offering_totals, o)
+        != in_session(crud_pricing.get_offering_totals, o)
+    ]
+
+
+def report(phase: str, before: Dict, reads: int) -> None:
+    after = offering_totals.stats()
+    hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+    print(
+        f"{phase:<12}{reads:>8}{hits / max(hits + misses, 1):>10.1%}"
+        f"{after['recomputes'] - before['recomputes']:>12}{after['invalidations'] - before['invalidations']:>15}"
+    )
+
+
+def sequential(catalogue: Catalogue, operations: List[Callable], rng: random.Random, count: int) -> List[str]:
+    """Apply count random writes one at a time; the mismatches found after each, described"""
+    failures = []
+    for n in range(count):
+        operation = rng.choice(operations)
+        in_session(operation, rng)
+        wrong = mismatches(catalogue)
+        if wrong:
+            failures.append(f"after write {n} ({operation.__name__}): {', '.join(wrong)}")
+    return failures
+
+
+def concurrent(
+    catalogue: Catalogue, operations: List[Callable], seconds: float, readers: int, writers: int,
+    write_interval: float, seed: int
+) -> int:
+    """Run writer and reader threads for the given time; returns the number of reads"""
+    stop = time.monotonic() + seconds
+    reads = [0] * readers
+
+    def writer(thread_seed: int):
+        thread_rng = random.Random(thread_seed)
+        while time.monotonic() < stop:
+            in_session(thread_rng.choice(operations), thread_rng)
+            time.sleep(write_interval)
+
+    def reader(n: int):
+        thread_rng = random.Random(seed + 1000 + n)
+        while time.monotonic() < stop:
+            in_session(crud_pricing.get_cached_offering_totals, thread_rng.choice(catalogue.offerings))
+            reads[n] += 1
+
+    threads = [threading.Thread(target=writer, args=(seed + n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(reads)
+
+
+def main(args) -> int:
+    rng = random.Random(args.seed)
+    catalogue = setup(rng)
+    offering_totals.clear()
+    operations = writes(catalogue)
+    print(f"{'phase':<12}{'reads':>8}{'hit rate':>10}{'recomputes':>12}{'invalidations':>15}")
+    try:
+        # Phase 1: one write at a time, every offering checked after each
+        before = offering_totals.stats()
+        failures = sequential(catalogue, operations, rng, args.writes)
+        report("sequential", before, args.writes * len(catalogue.offerings))
+
+        # Phase 2: writers and readers at once, checked when they stop
+        before = offering_totals.stats()
+        reads = concurrent(
+            catalogue, operations, args.seconds, args.threads, args.writers, args.write_interval, args.seed
+        )
+        report("concurrent", before, reads)
+        wrong = mismatches(catalogue)
+        if wrong:
+            failures.append(f"after the concurrent phase: {', '.join(wrong)}")
+    finally:
+        cleanup()
+        offering_totals.clear()
+
+    for failure in failures:
+        print(f"FAIL stale totals {failure}")
+    print("PASS" if not failures else "FAIL")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writes", type=int, default=300, help="writes in the sequential phase")
+    parser.add_argument("--seconds", type=float, default=10, help="length of the concurrent phase")
+    parser.add_argument("--threads", type=int, default=4, help="reader threads in the concurrent phase")
+    parser.add_argument("--writers", type=int, default=2, help="writer threads in the concurrent phase")
+    parser.add_argument("--write-interval", type=float, default=0.01, help="pause between a writer's writes (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(main(parser.parse_args()))
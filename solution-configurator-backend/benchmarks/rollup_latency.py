@@ -0,0 +1,183 @@
+"""
+Latency of the /totalHoursAndPrices/{offering_id} pricing rollup on large offerings.
+
+Builds offerings with --activities activities each (every activity with two
+WBS items staffed by three roles) and times the rollup two ways: the one-statement
+crud.pricing.get_offering_totals, and the per-row path it replaced (staffing
+of the offering, then one pricing lookup per staffing row, summed in Python).
+Both must agree on the totals. Reports p50/p95 latency and SQL statements per
+call, then the endpoint's latency through the API in-process on each session
+type; after its first call the endpoint serves the totals from the offering
+totals cache. Authentication is replaced by a constant user.
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.rollup_latency --activities 50 100 200 --runs 200
+
+Rows it creates are tagged "rollup-" and removed afterwards; the pricing it
+uses comes from the benchmark catalogue (see db_concurrency), seeded if missing.
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import sys
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import event
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+from benchmarks.common import ADMIN_EMAIL, run_load, summarize
+from app.auth.dependencies import get_current_active_user
+from app.crud import pricing as crud_pricing
+from app.crud import staffing as crud_staffing
+from app.database import SessionLocal, engine, get_async_session, get_primary_read_session, get_threaded_session
+from app.main import app
+from app.models import Activity, ActivityWBS, Brand, Offering, OfferingActivity, Product, Staffing, WBS, WBSStaffing
+from benchmarks.db_concurrency import seed
+
+
+def build_offering(activities: int) -> uuid.UUID:
+    """An offering with the given number of staffed activities; returns its offering_id"""
+    db = SessionLocal()
+    try:
+        priced = db.query(Staffing).filter(Staffing.country == "bench-country").all()
+        unpriced = Staffing(staffing_id=uuid.uuid4(), country="rollup-country", role="Unpriced", band=activities)
+        brand = Brand(brand_id=uuid.uuid4(), brand_name=f"rollup-brand-{uuid.uuid4().hex[:8]}")
+        product = Product(product_id=uuid.uuid4(), brand_id=brand.brand_id, product_name="rollup-product")
+        offering = Offering(offering_id=uuid.uuid4(), product_id=product.product_id, offering_name="rollup-offering")
+        db.add_all([brand, unpriced])
+        db.flush()
+        db.add(product)
+        db.flush()
+        db.add(offering)
+        roles = itertools.cycle(priced + [unpriced])
+        for a in range(activities):
+            activity = Activity(activity_id=uuid.uuid4(), activity_name=f"rollup-activity-{a}", brand_id=brand.brand_id)
+            db.add(activity)
+            db.flush()
+            db.add(OfferingActivity(offering_id=offering.offering_id, activity_id=activity.activity_id, sequence=a))
+            for w in range(2):
+                wbs = WBS(wbs_id=uuid.uuid4(), wbs_description=f"rollup-wbs-{a}-{w}", wbs_weeks=2)
+                db.add(wbs)
+                db.flush()
+                db.add(ActivityWBS(activity_id=activity.activity_id, wbs_id=wbs.wbs_id))
+                for hours, role in zip((8, 16, 4), [next(roles) for _ in range(3)]):
+                    db.add(WBSStaffing(wbs_id=wbs.wbs_id, staffing_id=role.staffing_id, hours=hours))
+        db.commit()
+        return offering.offering_id
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.query(WBS).filter(WBS.wbs_description.like("rollup-wbs-%")).delete(synchronize_session=False)
+        db.query(Activity).filter(Activity.activity_name.like("rollup-activity-%")).delete(synchronize_session=False)
+        db.query(Staffing).filter(Staffing.country == "rollup-country").delete(synchronize_session=False)
+        db.query(Brand).filter(Brand.brand_name.like("rollup-brand-%")).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def per_row_totals(db, offering_id: uuid.UUID) -> Dict[str, Any]:
+    """The replaced path: the offering's staffing rows, then one pricing lookup each"""
+    total_hours, total_cost, total_sale_price = 0, Decimal(0), Decimal(0)
+    for staffing in crud_staffing.get_staffing_by_offering(db, offering_id):
+        pricing = crud_pricing.get_pricing_by_staffing_id(db, staffing["staffing_id"])
+        hours = staffing["hours"] or 0
+        total_hours += hours
+        if pricing:
+            total_cost += (pricing.cost or Decimal(0)) * hours
+            total_sale_price += (pricing.sale_price or Decimal(0)) * hours
+    return {"total_hours": total_hours, "total_cost": float(total_cost), "total_sale_price": float(total_sale_price)}
+
+
+def time_calls(fn: Callable, offering_id: uuid.UUID, runs: int) -> Tuple[List[float], float, Dict[str, Any]]:
+    """(latencies, statements per call, last result) of fn(session, offering_id), one session per call"""
+    statements = itertools.count()
+
+    def before_cursor_execute(*args):
+        next(statements)
+
+    latencies, result = [], None
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for _ in range(runs):
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                result = fn(db, offering_id)
+                latencies.append(time.perf_counter() - started)
+            finally:
+                db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return latencies, next(statements) / runs, result
+
+
+async def endpoint_latency(offering_ids: Dict[int, uuid.UUID], runs: int) -> None:
+    user = {"sub": ADMIN_EMAIL, "email": ADMIN_EMAIL, "name": "Bench Admin"}
+
+    async def constant_user():
+        return user
+
+    app.dependency_overrides[get_current_active_user] = constant_user
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    print(f"\n{'endpoint, activities':<28}{'session':<10}{'p50':>10}{'p95':>10}{'errors':>8}")
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=120) as client:
+            for mode, dependency in (("psycopg2", get_threaded_session), ("asyncpg", get_async_session)):
+                app.dependency_overrides[get_primary_read_session] = dependency
+                for activities, offering_id in offering_ids.items():
+                    path = f"/api/v1/totalHoursAndPrices/{offering_id}"
+                    await run_load(client, path, 10, 1)   # warm up
+                    latencies, failures, _ = await run_load(client, path, runs, 1)
+                    summary = summarize(latencies)
+                    print(
+                        f"{'/totalHoursAndPrices':<21}{activities:>7}{mode:>10}"
+                        f"{summary['p50']:>8.1f}ms{summary['p95']:>8.1f}ms{failures:>8}"
+                    )
+    finally:
+        app.dependency_overrides.clear()
+
+
+def main(args) -> int:
+    seed()
+    offering_ids = {activities: build_offering(activities) for activities in args.activities}
+    ok = True
+    try:
+        print(f"{args.runs} calls per run")
+        print(f"{'path':<16}{'activities':>11}{'p50':>10}{'p95':>10}{'stmts':>8}{'total_sale_price':>18}")
+        for activities, offering_id in offering_ids.items():
+            results = {}
+            for name, fn in (("per-row", per_row_totals), ("rollup", crud_pricing.get_offering_totals)):
+                time_calls(fn, offering_id, min(args.runs, 10))   # warm up
+                latencies, per_call, result = time_calls(fn, offering_id, args.runs)
+                results[name] = tuple(result[k] for k in ("total_hours", "total_cost", "total_sale_price"))
+                summary = summarize(latencies)
+                print(
+                    f"{name:<16}{activities:>11}{summary['p50']:>8.1f}ms{summary['p95']:>8.1f}ms"
+                    f"{per_call:>8.0f}{result['total_sale_price']:>18,.2f}"
+                )
+            if results["per-row"] != results["rollup"]:
+                ok = False
+                print(f"  FAIL totals differ: per-row {results['per-row']}, rollup {results['rollup']}")
+        asyncio.run(endpoint_latency(offering_ids, args.runs))
+    finally:
+        cleanup()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--activities", type=int, nargs="+", default=[50, 100, 200], help="activities per offering")
+    parser.add_argument("--runs", type=int, default=200, help="calls timed per path and offering")
+    sys.exit(main(parser.parse_args()))
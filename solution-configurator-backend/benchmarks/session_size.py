@@ -0,0 +1,130 @@
+"""
+Request cookie size and per-request middleware time of each session store.
+
+Logs in once with a session shaped like the one /auth/callback stores (user
+profile with identities, role claim, ~1.2 KB access token), then sends
+--requests requests with the session cookie to a handler that reads the user.
+Each store is run in-process:
+
+  cookie  Starlette's SessionMiddleware (SESSION_BACKEND=cookie): the signed
+          payload travels in the cookie
+  memory  ServerSideSessionMiddleware on MemorySessionBackend
+  redis   ServerSideSessionMiddleware on RedisSessionBackend over
+          app.stubs.redis.FakeRedis (a real Redis adds one GET round trip)
+
+Middleware time is the mean request time less that of the same handler with
+no session middleware. Exits non-zero if a server-side store's cookie is not
+smaller than the cookie store's. No database is needed:
+    python -m benchmarks.session_size --requests 5000
+"""
+import argparse
+import asyncio
+import base64
+import secrets
+import statistics
+import sys
+import time
+from typing import Optional
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.sessions import MemorySessionBackend, RedisSessionBackend, ServerSideSessionMiddleware
+from app.stubs.redis import FakeRedis
+
+EMAIL = "bench.user@example.com"
+
+
+def _segment(size: int) -> str:
+    return base64.urlsafe_b64encode(secrets.token_bytes(size)).decode().rstrip("=")
+
+
+def logged_in_session() -> dict:
+    """The session /auth/callback stores for a user, with a JWT-sized access token"""
+    return {
+        "user": {
+            "sub": secrets.token_hex(16),
+            "name": "Bench User",
+            "email": EMAIL,
+            "given_name": "Bench",
+            "family_name": "User",
+            "identities": [{"provider": "ibmid", "id": secrets.token_hex(12), "idpUserInfo": {"email": EMAIL}}],
+        },
+        "roles": {"email": EMAIL, "is_admin": False, "is_solution_architect": True, "resolved_at": time.time()},
+        "token": {
+            "access_token": ".".join((_segment(60), _segment(780), _segment(256))),
+            "token_type": "Bearer",
+            "expires_at": int(time.time()) + 3600,
+        },
+    }
+
+
+def create_app(middleware: Optional[Middleware]) -> Starlette:
+    session = logged_in_session()
+
+    async def login(request: Request):
+        if "session" in request.scope:
+            request.session.update(session)
+        return JSONResponse({})
+
+    async def me(request: Request):
+        user = request.scope.get("session", session)["user"]
+        return JSONResponse({"email": user["email"]})
+
+    return Starlette(
+        routes=[Route("/login", login, methods=["POST"]), Route("/me", me)],
+        middleware=[middleware] if middleware else []
+    )
+
+
+async def measure(app: Starlette, requests: int) -> tuple:
+    """(request Cookie header bytes, mean seconds per request) of a logged-in client"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        await client.post("/login")
+        cookie = "; ".join(f"{name}={value}" for name, value in client.cookies.items())
+        headers = {"Cookie": cookie} if cookie else {}
+        client.cookies.clear()
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/me", headers=headers)
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"/me returned {response.status_code}")
+    return len(cookie), statistics.mean(timings)
+
+
+async def main(args) -> int:
+    stores = {
+        "none": None,
+        "cookie": Middleware(SessionMiddleware, secret_key="bench", session_cookie="session"),
+        "memory": Middleware(ServerSideSessionMiddleware, backend=MemorySessionBackend()),
+        "redis": Middleware(ServerSideSessionMiddleware, backend=RedisSessionBackend(FakeRedis())),
+    }
+    results = {name: await measure(create_app(middleware), args.requests) for name, middleware in stores.items()}
+
+    baseline = results["none"][1]
+    print(f"{args.requests} requests per store with a logged-in session")
+    print(f"{'store':<10}{'cookie header':>16}{'middleware/request':>22}")
+    for name in ("cookie", "memory", "redis"):
+        size, mean = results[name]
+        print(f"{name:<10}{size:>10} bytes{(mean - baseline) * 1e6:>19.0f}us")
+
+    larger = [name for name in ("memory", "redis") if results[name][0] >= results["cookie"][0]]
+    if larger:
+        print(f"FAIL cookie not smaller with: {', '.join(larger)}")
+        return 1
+    print("PASS")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    sys.exit(asyncio.run(main(parser.parse_args())))
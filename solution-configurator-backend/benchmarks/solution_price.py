@@ -0,0 +1,245 @@
+"""
+POST /solutions/price against pricing the same selection row by row.
+
+Builds a pool of activities (each with two WBS items staffed by three roles,
+one role of them unpriced) and, for each selection size, a random ordered
+selection from it with a few hours overrides. Checks that the endpoint agrees
+with a per-row Decimal reference (the activity's WBS staffing, then one pricing
+lookup per role) for every activity and for the combined totals, that it rejects
+an unknown activity, and that a pricing write retires the memoized price.
+Reports the latency (median of --runs) and SQL statements of a cold call
+(memo cleared) and a memoized one on each session type. Authentication is
+replaced by a constant user. Exits non-zero on a mismatch.
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.solution_price --sizes 10 100 500 --runs 5
+
+Rows it creates are tagged "solution-" and removed afterwards; the pricing it
+uses comes from the benchmark catalogue (see db_concurrency), seeded if missing.
+tests/test_solution_price.py runs the same checks, smaller, under pytest.
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import event
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+from benchmarks.common import ADMIN_EMAIL
+from app.auth.dependencies import get_current_active_user
+from app.crud import pricing as crud_pricing
+from app.crud.rollups import solution_prices
+from app.database import (
+    SessionLocal, engine, get_async_engine, get_async_session, get_primary_read_session, get_threaded_session
+)
+from app.main import app
+from app.models import Activity, ActivityWBS, Brand, Staffing, WBS, WBSStaffing
+from app.schemas.pricing import PricingDetailUpdate, SolutionPriceRequest
+from benchmarks.db_concurrency import seed
+
+
+def build(activities: int) -> Tuple[List[str], List[str]]:
+    """A pool of staffed activities; returns their ids and the staffing roles they use"""
+    rng = random.Random(0)
+    db = SessionLocal()
+    try:
+        roles = [row.staffing_id for row in db.query(Staffing.staffing_id).filter(Staffing.country == "bench-country")]
+        unpriced = Staffing(staffing_id=uuid.uuid4(), country="solution-country", role="Unpriced", band=1)
+        brand = Brand(brand_id=uuid.uuid4(), brand_name=f"solution-brand-{uuid.uuid4().hex[:8]}")
+        db.add_all([brand, unpriced])
+        db.flush()
+        roles.append(unpriced.staffing_id)
+        pool = [uuid.uuid4() for _ in range(activities)]
+        db.add_all(Activity(activity_id=a, activity_name="solution-activity", brand_id=brand.brand_id) for a in pool)
+        db.flush()
+        for a in pool:
+            for _ in range(2):
+                wbs = WBS(wbs_id=uuid.uuid4(), wbs_description="solution-wbs", wbs_weeks=2)
+                db.add(wbs)
+                db.flush()
+                db.add(ActivityWBS(activity_id=a, wbs_id=wbs.wbs_id))
+                db.add_all(
+                    WBSStaffing(wbs_id=wbs.wbs_id, staffing_id=role, hours=rng.choice((4, 8, 16, 40)))
+                    for role in rng.sample(roles, 3)
+                )
+        db.commit()
+        return [str(a) for a in pool], [str(r) for r in roles]
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.query(WBS).filter(WBS.wbs_description == "solution-wbs").delete(synchronize_session=False)
+        db.query(Activity).filter(Activity.activity_name == "solution-activity").delete(synchronize_session=False)
+        db.query(Staffing).filter(Staffing.country == "solution-country").delete(synchronize_session=False)
+        db.query(Brand).filter(Brand.brand_name.like("solution-brand-%")).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def selection(rng: random.Random, pool: List[str], roles: List[str], size: int) -> Dict[str, Any]:
+    """size activities from the pool in random order, about one in five with an hours override"""
+    return {"activities": [
+        {"activity_id": a, "hours": {rng.choice(roles): rng.choice((0, 2, 24))}} if rng.random() < 0.2
+        else {"activity_id": a}
+        for a in rng.sample(pool, size)
+    ]}
+
+
+def reference(db, body: Dict[str, Any]) -> List[Tuple]:
+    """(hours, cost, sale price) of each activity and then of the selection, priced row by row in Decimal"""
+    totals, combined = [], defaultdict(int)
+    for activity in body["activities"]:
+        hours_by_role = defaultdict(int)
+        for link in db.query(ActivityWBS).filter(ActivityWBS.activity_id == activity["activity_id"]):
+            for staffing in db.query(WBSStaffing).filter(WBSStaffing.wbs_id == link.wbs_id):
+                hours_by_role[str(staffing.staffing_id)] += staffing.hours or 0
+        hours_by_role.update(activity.get("hours", {}))
+        for role, hours in hours_by_role.items():
+            combined[role] += hours
+        totals.append(hours_by_role)
+    priced = []
+    for hours_by_role in totals + [combined]:
+        hours, cost, sale_price = 0, Decimal(0), Decimal(0)
+        for role, role_hours in hours_by_role.items():
+            pricing = crud_pricing.get_pricing_by_staffing_id(db, role)
+            hours += role_hours
+            if pricing:
+                cost += role_hours * (pricing.cost or 0)
+                sale_price += role_hours * (pricing.sale_price or 0)
+        priced.append((hours, float(cost), float(sale_price)))
+    return priced
+
+
+def totals_of(result: Dict[str, Any]) -> List[Tuple]:
+    return [
+        (totals["total_hours"], totals["total_cost"], totals["total_sale_price"])
+        for totals in result["activities"] + [result]
+    ]
+
+
+async def measure(call: Callable[[], Awaitable], runs: int, cold: bool) -> Tuple[float, float]:
+    """(median seconds, statements per call) of call(), clearing the memo first if cold"""
+    statements = itertools.count()
+
+    def before_cursor_execute(*args):
+        next(statements)
+
+    engines = [engine, get_async_engine().sync_engine]
+    for e in engines:
+        event.listen(e, "before_cursor_execute", before_cursor_execute)
+    timings = []
+    try:
+        for _ in range(runs):
+            if cold:
+                solution_prices.clear()
+            started = time.perf_counter()
+            await call()
+            timings.append(time.perf_counter() - started)
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", before_cursor_execute)
+    return statistics.median(timings), next(statements) / runs
+
+
+def reprice(staffing_id: str, delta: Decimal) -> None:
+    db = SessionLocal()
+    try:
+        pricing = crud_pricing.get_pricing_by_staffing_id(db, staffing_id)
+        crud_pricing.update_pricing(db, pricing.pricing_id, PricingDetailUpdate(sale_price=pricing.sale_price + delta))
+    finally:
+        db.close()
+
+
+async def main(args) -> int:
+    rng = random.Random(args.seed)
+    seed()
+    pool, roles = build(max(args.sizes))
+    user = {"sub": ADMIN_EMAIL, "email": ADMIN_EMAIL, "name": "Bench Admin"}
+
+    async def constant_user():
+        return user
+
+    app.dependency_overrides[get_current_active_user] = constant_user
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    failures = []
+    print(f"{'activities':>10}  {'session':<10}{'call':<10}{'median':>10}{'stmts':>8}")
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=300) as client:
+
+            async def price(body):
+                response = await client.post("/api/v1/solutions/price", json=body)
+                response.raise_for_status()
+                return response.json()
+
+            for mode, dependency in (("psycopg2", get_threaded_session), ("asyncpg", get_async_session)):
+                app.dependency_overrides[get_primary_read_session] = dependency
+                for size in args.sizes:
+                    body = selection(rng, pool, roles, size)
+                    solution_prices.clear()
+                    db = SessionLocal()
+                    try:
+                        expected = reference(db, body)
+                    finally:
+                        db.close()
+                    if totals_of(await price(body)) != expected:
+                        failures.append(f"{mode}, {size} activities: totals differ from the per-row reference")
+                    for name, cold in (("cold", True), ("memoized", False)):
+                        await price(body)   # warm up
+                        median, per_call = await measure(lambda: price(body), args.runs, cold)
+                        print(f"{size:>10}  {mode:<10}{name:<10}{median * 1000:>8.1f}ms{per_call:>8.0f}")
+
+            # A pricing write retires the memoized price
+            body = selection(rng, pool, roles, min(args.sizes))
+            staffing_id = roles[0]
+            body["activities"][0]["hours"] = {staffing_id: 10}
+            before = await price(body)
+            reprice(staffing_id, Decimal(1))
+            try:
+                after = await price(body)
+                db = SessionLocal()
+                try:
+                    fresh = crud_pricing.get_solution_price(db, SolutionPriceRequest(**body))
+                finally:
+                    db.close()
+                if after == before or totals_of(after) != totals_of(fresh):
+                    failures.append("a memoized price survived a pricing write")
+            finally:
+                reprice(staffing_id, Decimal(-1))
+
+            response = await client.post(
+                "/api/v1/solutions/price", json={"activities": [{"activity_id": str(uuid.uuid4())}]}
+            )
+            if response.status_code != 404:
+                failures.append(f"unknown activity answered {response.status_code}, not 404")
+    finally:
+        app.dependency_overrides.clear()
+        solution_prices.clear()
+        cleanup()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("PASS" if not failures else "FAIL")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="activities per selection")
+    parser.add_argument("--runs", type=int, default=5, help="timed calls per size")
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,207 @@
+"""
+Concurrent stress test of the create-or-conflict write paths.
+
+Runs the API in-process and fires many identical requests at once at each of
+POST /staffing, /pricing, /link, /wbs-staffing/ and /wbs/activity/{id}/wbs/{id}.
+They are sent both with the threaded psycopg2 session and with the asyncpg
+session. Each path must leave exactly one row behind. Every request must
+succeed or get the path's conflict response; a 5xx (an IntegrityError
+escaping) fails the run. Exits non-zero on any failure.
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.upsert_stress --requests 50 --rounds 5
+
+Rows it creates are tagged "stress-" and removed afterwards.
+tests/test_upsert_concurrency.py runs a smaller round of it under pytest.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import uuid
+from collections import Counter
+from typing import Dict, Tuple
+
+import httpx
+from sqlalchemy import func
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+from benchmarks.common import ADMIN_EMAIL
+from app.auth.dependencies import get_current_active_user
+from app.auth.permissions import require_admin, require_solution_architect
+from app.database import SessionLocal, get_async_session, get_read_session, get_session, get_threaded_session
+from app.main import app
+from app.models import (
+    Activity, ActivityWBS, Brand, Offering, OfferingActivity, PricingDetail, Product, Staffing, WBS, WBSStaffing
+)
+
+COUNTRY = "stress-country"
+
+SESSIONS = {"psycopg2": get_threaded_session, "asyncpg": get_async_session}
+
+
+def setup():
+    """A brand, product, offering, activity and WBS to link; returns their ids"""
+    db = SessionLocal()
+    try:
+        brand = Brand(brand_id=uuid.uuid4(), brand_name=f"stress-brand-{uuid.uuid4().hex[:8]}")
+        product = Product(product_id=uuid.uuid4(), brand_id=brand.brand_id, product_name="stress-product")
+        offering = Offering(offering_id=uuid.uuid4(), product_id=product.product_id, offering_name="stress-offering")
+        activity = Activity(activity_id=uuid.uuid4(), activity_name="stress-activity", brand_id=brand.brand_id)
+        wbs = WBS(wbs_id=uuid.uuid4(), wbs_description="stress-wbs", wbs_weeks=1)
+        db.add(brand)
+        db.flush()
+        db.add_all([product, activity, wbs])
+        db.flush()
+        db.add(offering)
+        db.commit()
+        return brand.brand_id, offering.offering_id, activity.activity_id, wbs.wbs_id
+    finally:
+        db.close()
+
+
+def cleanup(brand_id) -> None:
+    db = SessionLocal()
+    try:
+        db.query(WBS).filter(WBS.wbs_description == "stress-wbs").delete(synchronize_session=False)
+        db.query(Activity).filter(Activity.activity_name == "stress-activity").delete(synchronize_session=False)
+        db.query(Staffing).filter(Staffing.country == COUNTRY).delete(synchronize_session=False)
+        db.query(Offering).filter(Offering.offering_name == "stress-offering").delete(synchronize_session=False)
+        db.query(Product).filter(Product.product_name == "stress-product").delete(synchronize_session=False)
+        db.query(Brand).filter(Brand.brand_id == brand_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def row_counts(band: int, offering_id, activity_id, wbs_id) -> dict:
+    db = SessionLocal()
+    try:
+        staffing = db.query(Staffing).filter(
+            Staffing.country == COUNTRY, Staffing.role == "Stress", Staffing.band == band
+        ).all()
+        staffing_ids = [s.staffing_id for s in staffing]
+        count = lambda query: query.with_entities(func.count()).scalar()
+        return {
+            "staffing": len(staffing),
+            "pricing": count(db.query(PricingDetail).filter(PricingDetail.staffing_id.in_(staffing_ids))),
+            "link": count(db.query(OfferingActivity).filter(
+                OfferingActivity.offering_id == offering_id, OfferingActivity.activity_id == activity_id
+            )),
+            "wbs-staffing": count(db.query(WBSStaffing).filter(
+                WBSStaffing.wbs_id == wbs_id, WBSStaffing.staffing_id.in_(staffing_ids)
+            )),
+            "activity-wbs": count(db.query(ActivityWBS).filter(
+                ActivityWBS.activity_id == activity_id, ActivityWBS.wbs_id == wbs_id
+            )),
+        }
+    finally:
+        db.close()
+
+
+async def burst(client, requests: int, method: str, path: str, **kwargs) -> Counter:
+    responses = await asyncio.gather(*(client.request(method, path, **kwargs) for _ in range(requests)))
+    return Counter(r.status_code for r in responses)
+
+
+# Per path: (status codes allowed, how many requests may create the row; None if any may)
+EXPECTED = {
+    "staffing": ({201}, None),
+    "pricing": ({201, 409}, 1),
+    "link": ({201, 409}, 1),
+    "wbs-staffing": ({200}, None),
+    "activity-wbs": ({200, 409}, 1),
+}
+
+
+async def round_(client, requests: int, band: int, offering_id, activity_id, wbs_id) -> Dict[str, Tuple[Counter, int, bool]]:
+    """One burst per write path for a fresh staffing band: {path: (response statuses, rows left, passed)}"""
+    results = {}
+    results["staffing"] = await burst(
+        client, requests, "POST", "/api/v1/staffing", json={"country": COUNTRY, "role": "Stress", "band": band}
+    )
+    response = await client.post("/api/v1/staffing", json={"country": COUNTRY, "role": "Stress", "band": band})
+    staffing_id = response.json()["staffing_id"]
+    results["pricing"] = await burst(
+        client, requests, "POST", "/api/v1/pricing", json={"staffing_id": staffing_id, "cost": 100, "sale_price": 150}
+    )
+    results["link"] = await burst(
+        client, requests, "POST", "/api/v1/link",
+        json={"offering_id": str(offering_id), "activity_id": str(activity_id), "sequence": 1}
+    )
+    results["wbs-staffing"] = await burst(
+        client, requests, "POST", "/api/v1/wbs-staffing/",
+        params={"wbs_id": str(wbs_id), "staffing_id": staffing_id, "hours": 8}
+    )
+    results["activity-wbs"] = await burst(
+        client, requests, "POST", f"/api/v1/wbs/activity/{activity_id}/wbs/{wbs_id}"
+    )
+
+    counts = row_counts(band, offering_id, activity_id, wbs_id)
+    checked = {}
+    for name, statuses in results.items():
+        allowed, creators = EXPECTED[name]
+        created = statuses[201] + statuses[200] if creators else None
+        passed = set(statuses) <= allowed and counts[name] == 1 and (creators is None or created == creators)
+        checked[name] = (statuses, counts[name], passed)
+
+    # The next round links afresh
+    db = SessionLocal()
+    try:
+        db.query(OfferingActivity).filter(OfferingActivity.offering_id == offering_id).delete()
+        db.query(ActivityWBS).filter(ActivityWBS.activity_id == activity_id).delete()
+        db.commit()
+    finally:
+        db.close()
+    return checked
+
+
+def use_admin(app_) -> None:
+    """Replace authentication with a constant administrator"""
+    user = {"sub": ADMIN_EMAIL, "email": ADMIN_EMAIL, "name": "Stress Admin"}
+
+    async def constant_user():
+        return user
+
+    for dependency in (get_current_active_user, require_admin, require_solution_architect):
+        app_.dependency_overrides[dependency] = constant_user
+
+
+def use_session(app_, dependency) -> None:
+    app_.dependency_overrides[get_session] = dependency
+    app_.dependency_overrides[get_read_session] = dependency
+
+
+async def main(args) -> int:
+    use_admin(app)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    brand_id, offering_id, activity_id, wbs_id = setup()
+    ok = True
+    band = 0
+    try:
+        # Report handler errors as 500 responses instead of raising
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=120) as client:
+            for mode, dependency in SESSIONS.items():
+                use_session(app, dependency)
+                for _ in range(args.rounds):
+                    band += 1
+                    print(f"{mode}, {args.requests} concurrent requests, band {band}")
+                    results = await round_(client, args.requests, band, offering_id, activity_id, wbs_id)
+                    for name, (statuses, rows, passed) in results.items():
+                        ok = ok and passed
+                        print(f"  {'ok' if passed else 'FAIL':<6}{name:<14}rows: {rows}  responses: {dict(statuses)}")
+    finally:
+        cleanup(brand_id)
+        app.dependency_overrides.clear()
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50, help="identical requests sent at once per path")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds per session type")
+    sys.exit(asyncio.run(main(parser.parse_args())))
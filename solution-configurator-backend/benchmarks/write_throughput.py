@@ -0,0 +1,139 @@
+"""
+Writes per second of the offering, activity and pricing updates.
+
+Calls the CRUD update functions (one UPDATE ... RETURNING each) from a pool
+of threads, each with its own session, and compares them with the previous
+write path: load the row, set attributes, commit, then refresh. Reports
+writes/sec and the SQL statements sent per write (BEGIN/COMMIT excluded).
+
+Run from solution-configurator-backend against a database with the schema applied:
+    DATABASE_URL=postgresql://localhost/solution DATABASE_SSLMODE=disable \
+        python -m benchmarks.write_throughput --seed --writes 2000 --concurrency 1 8
+"""
+import argparse
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from sqlalchemy import event
+
+# benchmarks.common goes first: it sets the settings app reads at import time
+import benchmarks.common  # noqa: F401
+from app.crud import activity as crud_activity
+from app.crud import offering as crud_offering
+from app.crud import pricing as crud_pricing
+from app.database import SessionLocal, engine
+from app.models import Activity, Offering, PricingDetail, Staffing
+from app.schemas.activity import ActivityUpdate
+from app.schemas.offering import OfferingUpdate
+from app.schemas.pricing import PricingDetailUpdate
+from benchmarks.db_concurrency import seed
+
+
+def refresh_update(db, model, key_column, key, values):
+    """The previous write path: SELECT, modify, commit, refresh"""
+    row = db.query(model).filter(key_column == key).first()
+    for field, value in values.items():
+        setattr(row, field, value)
+    db.commit()
+    db.refresh(row)
+    return row
+
+
+def cases(offering_ids, activity_ids, pricing_ids) -> List[Tuple[str, Callable, Callable]]:
+    """(name, returning write, previous write); each write takes (session, i)"""
+    return [
+        (
+            "offering",
+            lambda db, i: crud_offering.update_offering(
+                db, offering_ids[i % len(offering_ids)], OfferingUpdate(duration=f"{i % 12 + 1} weeks")
+            ),
+            lambda db, i: refresh_update(
+                db, Offering, Offering.offering_id, offering_ids[i % len(offering_ids)],
+                {"duration": f"{i % 12 + 1} weeks"}
+            ),
+        ),
+        (
+            "activity",
+            lambda db, i: crud_activity.update_activity(
+                db, activity_ids[i % len(activity_ids)], ActivityUpdate(effort_hours=i % 80 + 1)
+            ),
+            lambda db, i: refresh_update(
+                db, Activity, Activity.activity_id, activity_ids[i % len(activity_ids)],
+                {"effort_hours": i % 80 + 1}
+            ),
+        ),
+        (
+            "pricing",
+            lambda db, i: crud_pricing.update_pricing(
+                db, pricing_ids[i % len(pricing_ids)], PricingDetailUpdate(sale_price=150 + i % 50)
+            ),
+            lambda db, i: refresh_update(
+                db, PricingDetail, PricingDetail.pricing_id, pricing_ids[i % len(pricing_ids)],
+                {"sale_price": 150 + i % 50}
+            ),
+        ),
+    ]
+
+
+def run(write: Callable, writes: int, concurrency: int) -> Tuple[float, float]:
+    """(writes/sec, statements per write); each thread writes through its own session"""
+    counter = itertools.count()
+    statements = itertools.count()
+
+    def before_cursor_execute(*args):
+        next(statements)
+
+    def worker(share: int):
+        db = SessionLocal()
+        try:
+            for _ in range(share):
+                write(db, next(counter))
+        finally:
+            db.close()
+
+    shares = [writes // concurrency + (1 if n < writes % concurrency else 0) for n in range(concurrency)]
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(worker, shares))
+    finally:
+        elapsed = time.perf_counter() - started
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return writes / elapsed, next(statements) / writes
+
+
+def main(args) -> None:
+    if args.seed:
+        seed()
+    db = SessionLocal()
+    try:
+        offering_ids = [r[0] for r in db.query(Offering.offering_id).filter(Offering.offering_name.like("bench-%"))]
+        activity_ids = [r[0] for r in db.query(Activity.activity_id).filter(Activity.activity_name.like("bench-%"))]
+        pricing_ids = [
+            r[0] for r in db.query(PricingDetail.pricing_id).join(Staffing).filter(Staffing.country == "bench-country")
+        ]
+    finally:
+        db.close()
+    if not (offering_ids and activity_ids and pricing_ids):
+        print("No benchmark catalogue to update; pass --seed")
+        return
+
+    print(f"{args.writes} writes per run")
+    print(f"{'update':<10}{'path':<20}{'threads':>8}{'writes/s':>10}{'stmts/write':>13}")
+    for name, returning, previous in cases(offering_ids, activity_ids, pricing_ids):
+        for path, write in (("commit + refresh", previous), ("RETURNING", returning)):
+            run(write, min(args.writes, 100), 1)   # warm up the connection pool
+            for concurrency in args.concurrency:
+                rate, per_write = run(write, args.writes, concurrency)
+                print(f"{name:<10}{path:<20}{concurrency:>8}{rate:>10.0f}{per_write:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--seed", action="store_true", help="insert the benchmark catalogue first")
+    main(parser.parse_args())
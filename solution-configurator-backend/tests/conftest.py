@@ -0,0 +1,49 @@
+"""
+Shared test setup.
+
+Settings are read when app is first imported, so the identity and database
+settings a unit test does not use are filled in here before any test module
+imports app. Nothing connects at import time: engines open connections lazily.
+
+Tests that need Postgres take the postgres fixture and run against
+DATABASE_URL migrated to head; without one they are skipped.
+"""
+import os
+
+import pytest
+
+for name, value in {
+    "DATABASE_URL": "postgresql://test@localhost/test",
+    "DATABASE_SSLMODE": "disable",
+    "IBM_CLIENT_ID": "test-client",
+    "IBM_TENANT_ID": "test",
+    "IBM_CLIENT_SECRET": "test",
+    "IBM_OAUTH_SERVER_URL": "http://oidc.test/oauth",
+    "IBM_DISCOVERY_ENDPOINT": "http://oidc.test/oauth/.well-known/openid-configuration",
+    "BLUEGROUPS_URL": "http://bluepages.test/tools/groups/groupsxml.wss",
+    "FRONTEND_URL": "http://localhost:3000",
+    "SESSION_SECRET": "test",
+    "ADMIN_BLUEGROUP": "test-admins",
+    "SOLUTION_ARCHITECT_BLUEGROUP": "test-architects",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture(scope="session")
+def postgres():
+    """
+    The engine of DATABASE_URL, for tests that need Postgres migrated to head.
+    Skips the test when the database cannot be reached or has no schema.
+    """
+    from sqlalchemy import inspect
+    from sqlalchemy.exc import OperationalError
+    from app.database import engine
+
+    try:
+        with engine.connect() as connection:
+            migrated = inspect(connection).has_table("alembic_version")
+    except OperationalError as e:
+        pytest.skip(f"Postgres is not available at DATABASE_URL: {e.orig}")
+    if not migrated:
+        pytest.skip("DATABASE_URL is not migrated: run alembic upgrade head")
+    return engine
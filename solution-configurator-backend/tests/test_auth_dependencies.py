@@ -0,0 +1,168 @@
+"""
+Permission dependencies resolve group membership at most once per request,
+however many of them an endpoint stacks.
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from starlette.middleware.sessions import SessionMiddleware
+
+from app import bluegroups_auth
+from app.auth import dependencies
+from app.auth.dependencies import get_current_active_user, require_groups
+from app.auth.permissions import ADMIN_GROUP, SOLUTION_ARCHITECT_GROUP, require_admin, require_solution_architect
+
+EMAIL = "jane@example.com"
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Group lists passed to lookup_groups by the permission dependencies; Jane is an admin"""
+    calls = []
+
+    async def lookup_groups(email, group_names):
+        calls.append((email, list(group_names)))
+        return {group: group == ADMIN_GROUP for group in group_names}
+
+    monkeypatch.setattr(dependencies, "lookup_groups", lookup_groups)
+    return calls
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    async def constant_user():
+        return {"sub": EMAIL, "email": EMAIL, "name": "Jane"}
+
+    @app.get("/stacked")
+    async def stacked(
+        admin: dict = Depends(require_admin),
+        architect: dict = Depends(require_solution_architect),
+        member: dict = Depends(require_groups(ADMIN_GROUP, SOLUTION_ARCHITECT_GROUP)),
+        auditors: dict = Depends(require_groups("test-auditors", ADMIN_GROUP)),
+    ):
+        return {"email": admin["email"]}
+
+    @app.get("/groups-first")
+    async def groups_first(
+        member: dict = Depends(require_groups("test-auditors", ADMIN_GROUP)),
+        admin: dict = Depends(require_admin),
+    ):
+        return {}
+
+    @app.get("/denied")
+    async def denied(
+        admin: dict = Depends(require_admin),
+        architects: dict = Depends(require_groups(SOLUTION_ARCHITECT_GROUP)),
+    ):
+        return {}
+
+    app.dependency_overrides[get_current_active_user] = constant_user
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    return TestClient(app)
+
+
+class TestStackedPermissionDependencies:
+    """Stacked require_admin / require_groups dependencies share one membership lookup"""
+
+    def test_one_lookup_per_request(self, client, lookups):
+        response = client.get("/stacked")
+        assert response.status_code == 200
+        assert response.json() == {"email": EMAIL}
+        assert len(lookups) == 1
+        assert {ADMIN_GROUP, SOLUTION_ARCHITECT_GROUP, "test-auditors"} <= set(lookups[0][1])
+
+    def test_one_lookup_whichever_dependency_asks_first(self, client, lookups):
+        assert client.get("/groups-first").status_code == 200
+        assert len(lookups) == 1
+
+    def test_one_lookup_per_request_across_requests(self, client, lookups):
+        for _ in range(3):
+            assert client.get("/stacked").status_code == 200
+        assert len(lookups) == 3
+
+    def test_denial_takes_one_lookup(self, client, lookups):
+        assert client.get("/denied").status_code == 403
+        assert len(lookups) == 1
+
+    def test_failed_lookup_denies_without_retrying(self, client, monkeypatch):
+        calls = []
+
+        async def lookup_groups(email, group_names):
+            calls.append(email)
+            return {group: None for group in group_names}
+
+        monkeypatch.setattr(dependencies, "lookup_groups", lookup_groups)
+        assert client.get("/stacked").status_code == 403
+        assert calls == [EMAIL]
+
+
+class TestGroupListCache:
+    """One BlueGroups call answers every group for a user until the cached list expires"""
+
+    def test_cached_list_serves_later_requests(self, client, monkeypatch):
+        fetches = []
+
+        async def fetch_user_groups(email):
+            fetches.append(email)
+            groups = frozenset([ADMIN_GROUP])
+            bluegroups_auth._remember(email, groups)
+            return groups
+
+        monkeypatch.setattr(bluegroups_auth, "_fetch_user_groups", fetch_user_groups)
+        bluegroups_auth._groups_cache.clear()
+        try:
+            for _ in range(3):
+                assert client.get("/stacked").status_code == 200
+        finally:
+            bluegroups_auth._groups_cache.clear()
+        assert fetches == [EMAIL]
+
+    def test_lists_granting_no_access_expire_sooner(self, monkeypatch):
+        monkeypatch.setattr(bluegroups_auth.settings, "BLUEGROUPS_CACHE_POSITIVE_TTL", 300)
+        monkeypatch.setattr(bluegroups_auth.settings, "BLUEGROUPS_CACHE_NEGATIVE_TTL", 60)
+        bluegroups_auth._groups_cache.clear()
+        try:
+            bluegroups_auth._remember("admin@example.com", frozenset([ADMIN_GROUP, "test-unrelated"]))
+            bluegroups_auth._remember("other@example.com", frozenset(["test-unrelated"]))
+            bluegroups_auth._remember("nobody@example.com", frozenset())
+            expires = {key: expires_at for key, (_, expires_at) in bluegroups_auth._groups_cache._data.items()}
+        finally:
+            bluegroups_auth._groups_cache.clear()
+        # Someone in unrelated groups only is re-checked as soon as someone in none
+        assert expires["other@example.com"] - expires["nobody@example.com"] < 1
+        assert expires["admin@example.com"] - expires["other@example.com"] > 200
+
+
+class TestConcurrentLookups:
+    """Concurrent lookups for one user share a request, on whichever event loop they run"""
+
+    def test_each_loop_shares_its_own_lookup(self, monkeypatch):
+        fetches = []
+        started = threading.Barrier(2)
+
+        async def fetch_user_groups(email):
+            fetches.append(threading.get_ident())
+            await asyncio.sleep(0.2)
+            return frozenset([ADMIN_GROUP])
+
+        async def three_checks():
+            checks = [bluegroups_auth.get_user_groups_async(EMAIL) for _ in range(3)]
+            started.wait()
+            return await asyncio.gather(*checks)
+
+        results = []
+        monkeypatch.setattr(bluegroups_auth, "_fetch_user_groups", fetch_user_groups)
+        bluegroups_auth._groups_cache.clear()
+        other_loop = threading.Thread(target=lambda: results.append(asyncio.run(three_checks())))
+        other_loop.start()
+        results.append(asyncio.run(three_checks()))
+        other_loop.join()
+
+        assert results == [[frozenset([ADMIN_GROUP])] * 3] * 2
+        # One request per loop: neither loop awaited the other's future
+        assert len(fetches) == 2 and len(set(fetches)) == 2
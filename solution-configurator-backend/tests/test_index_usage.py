@@ -0,0 +1,40 @@
+"""
+The hot catalogue and pricing queries are served by indexes: EXPLAINed with
+sequential scans disabled, their plans have no Seq Scan, and keyset pages come
+out of an index already sorted. See benchmarks/index_usage.py, which runs the
+same checks from the command line.
+
+Plans do not depend on what the tables hold once sequential scans are off, so
+this needs only the schema: it runs against DATABASE_URL migrated to head and
+is skipped without it.
+"""
+import uuid
+
+import pytest
+
+from benchmarks import index_usage
+
+
+class TestIndexUsage:
+    """Each hot query's plan against the migrated schema"""
+
+    def test_hot_queries_use_indexes(self, postgres):
+        failures = []
+        for name, fn, fn_args, ordered in index_usage.checks(str(uuid.uuid4())):
+            if name == index_usage.SEARCH_CHECK:
+                continue
+            statements = index_usage.plans(fn, fn_args, ordered)
+            assert statements, f"{name} ran no SELECT"
+            for indexes, scans, sorted_ in statements:
+                if scans:
+                    failures.append(f"{name}: sequential scan on {', '.join(scans)}")
+                if sorted_:
+                    failures.append(f"{name}: page sorted after reading (indexes: {', '.join(indexes) or '-'})")
+        assert failures == []
+
+    def test_search_uses_trigram_indexes(self, postgres):
+        if not index_usage.has_trigrams():
+            pytest.skip("pg_trgm is not installed: substring matches scan offerings")
+        [(name, fn, fn_args, ordered)] = [c for c in index_usage.checks(str(uuid.uuid4())) if c[0] == index_usage.SEARCH_CHECK]
+        for indexes, scans, _ in index_usage.plans(fn, fn_args, ordered):
+            assert scans == [], f"{name}: sequential scan on {', '.join(scans)}"
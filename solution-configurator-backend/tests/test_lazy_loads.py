@@ -0,0 +1,82 @@
+"""
+While a request is served, a relationship lazy load raises (DB_LAZY_LOADS=raise)
+or is logged (DB_LAZY_LOADS=log), whichever way the row was loaded; outside a
+request it just loads.
+
+Runs against an in-memory SQLite database of staffing and pricing rows.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import joinedload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import database
+from app.crud.writes import insert_returning
+from app.database import Base
+from app.metrics import metrics
+from app.models.pricing import PricingDetail
+from app.models.staffing import Staffing
+from app.models.wbs import WBS
+from app.models.wbs_staffing import WBSStaffing
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(
+        engine, tables=[Staffing.__table__, PricingDetail.__table__, WBS.__table__, WBSStaffing.__table__]
+    )
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    staffing = Staffing(staffing_id=uuid.uuid4(), country="test-country", role="Tester", band=7)
+    session.add_all([staffing, PricingDetail(pricing_id=uuid.uuid4(), staffing_id=staffing.staffing_id, cost=1)])
+    session.commit()
+    session.close()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def in_request():
+    token = database._request_endpoint.set("GET /test (test)")
+    yield
+    database._request_endpoint.reset(token)
+
+
+def loads(db) -> dict:
+    """How each kind of row reads a relationship it was not loaded with: the row count, or the exception"""
+    def read(fn):
+        try:
+            return len(fn())
+        except exc.InvalidRequestError as e:
+            return type(e)
+
+    result = {
+        "selected": read(lambda: db.query(Staffing).one().pricing),
+        "eager-loaded": read(lambda: db.query(PricingDetail).options(
+            joinedload(PricingDetail.staffing)
+        ).one().staffing.wbs_staffing),
+        "returned": read(lambda: insert_returning(db, Staffing, dict(
+            staffing_id=uuid.uuid4(), country="test-country", role="Tester", band=8
+        )).pricing),
+    }
+    db.close()
+    return result
+
+
+class TestLazyLoadPolicy:
+    """Each kind of row, in and outside a request"""
+
+    def test_raise_in_a_request(self, db, in_request):
+        assert loads(db) == dict.fromkeys(["selected", "eager-loaded", "returned"], exc.InvalidRequestError)
+
+    def test_log_in_a_request(self, db, in_request, monkeypatch):
+        monkeypatch.setattr(database, "DB_LAZY_LOADS", "log")
+        before = metrics.snapshot()["counters"].get("db.lazy_loads", 0)
+        assert loads(db) == {"selected": 1, "eager-loaded": 0, "returned": 0}
+        assert metrics.snapshot()["counters"]["db.lazy_loads"] == before + 3
+
+    def test_outside_a_request(self, db):
+        assert loads(db) == {"selected": 1, "eager-loaded": 0, "returned": 0}
@@ -0,0 +1,40 @@
+"""
+/totalHoursAndPrices/{offering_id} takes a UUID: a malformed id is rejected
+with 422 before any query runs, and a well-formed one that matches no
+offering has zero totals.
+
+The malformed-id check needs no database; the other runs against
+DATABASE_URL migrated to head and is skipped without one.
+"""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from benchmarks import upsert_stress
+
+
+@pytest.fixture
+def client():
+    upsert_stress.use_admin(app)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestOfferingTotalsPath:
+    """The offering_id path parameter"""
+
+    @pytest.mark.parametrize("offering_id", ["not-a-uuid", "1234", f"{uuid.uuid4()}x"])
+    def test_malformed_id_is_unprocessable(self, client, offering_id):
+        response = client.get(f"/api/v1/totalHoursAndPrices/{offering_id}")
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["path", "offering_id"]
+
+    def test_unknown_id_has_no_totals(self, client, postgres):
+        offering_id = uuid.uuid4()
+        response = client.get(f"/api/v1/totalHoursAndPrices/{offering_id}")
+        assert response.status_code == 200
+        assert response.json() == {
+            "offering_id": str(offering_id), "total_hours": 0, "total_cost": 0, "total_sale_price": 0, "breakdown": []
+        }
@@ -0,0 +1,95 @@
+"""
+page_request turns ?cursor=, ?limit= and ?sort= into a PageRequest, and
+lists that predate paging stay whole for callers that do not ask for a page.
+
+The lists are of an in-memory SQLite table of countries.
+"""
+import pytest
+from fastapi import Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.crud.country import COUNTRY_SORTS, get_countries
+from app.models.country import Country
+from app.pagination import PageRequest, page_request, paged
+
+COUNTRIES = 5
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Country.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all(Country(country_name=f"country-{n}") for n in range(COUNTRIES))
+        db.commit()
+    monkeypatch.setattr(settings, "PAGE_SIZE_DEFAULT", 2)
+    app = FastAPI()
+
+    @app.get("/paged")
+    def paged_list(response: Response, page: PageRequest = Depends(page_request(COUNTRY_SORTS, "country_name"))):
+        with Session() as db:
+            return [c.country_name for c in paged(response, get_countries(db, page))]
+
+    @app.get("/unpaged")
+    def unpaged_list(
+        response: Response, page: PageRequest = Depends(page_request(COUNTRY_SORTS, "country_name", unpaged=True))
+    ):
+        with Session() as db:
+            return [c.country_name for c in paged(response, get_countries(db, page))]
+
+    yield TestClient(app)
+    engine.dispose()
+
+
+def walk(client: TestClient, path: str, **params) -> list:
+    """Every item of a list, following X-Next-Cursor"""
+    items, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        items += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items
+
+
+class TestSort:
+    """?sort= takes a name from the endpoint's sorts, optionally prefixed with a single -"""
+
+    def test_ascending_and_descending(self, client):
+        names = [f"country-{n}" for n in range(COUNTRIES)]
+        assert walk(client, "/paged", sort="country_name") == names
+        assert walk(client, "/paged", sort="-country_name") == names[::-1]
+
+    @pytest.mark.parametrize("sort", ["--country_name", "+country_name", "country_name-", "-", "population"])
+    def test_anything_else_is_rejected(self, client, sort):
+        response = client.get("/paged", params={"sort": sort})
+        assert response.status_code == 422
+        assert sort in response.json()["detail"]
+
+
+class TestUnpaged:
+    """A list that predates paging is whole unless the caller pages it"""
+
+    def test_whole_without_cursor_or_limit(self, client):
+        response = client.get("/unpaged", params={"sort": "-country_name"})
+        assert response.json() == [f"country-{n}" for n in reversed(range(COUNTRIES))]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_paged_when_asked(self, client):
+        response = client.get("/unpaged", params={"limit": 2})
+        assert len(response.json()) == 2
+        # Later pages follow the cursor at the default page size
+        cursor = response.headers["X-Next-Cursor"]
+        assert client.get("/unpaged", params={"cursor": cursor}).json() == ["country-2", "country-3"]
+        assert walk(client, "/unpaged", limit=2) == [f"country-{n}" for n in range(COUNTRIES)]
+
+    def test_other_lists_page_by_default(self, client):
+        response = client.get("/paged")
+        assert len(response.json()) == settings.PAGE_SIZE_DEFAULT
+        assert "X-Next-Cursor" in response.headers
@@ -0,0 +1,226 @@
+"""
+The RateCard pricing kernel prices hours exactly as summing hours x rate in
+Decimal does, and get_rate_card picks up price changes it was not told about.
+
+The kernel checks run random rate cards (rates up to DECIMAL(12, 2), some
+roles unpriced or priced at cost only) and random staffed cells, from a fixed
+seed. get_rate_card runs against an in-memory SQLite database, and its version
+triggers against DATABASE_URL migrated to head (skipped without one).
+"""
+import random
+import uuid
+from collections import namedtuple
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud import pricing as crud_pricing
+from app.database import Base, SessionLocal
+from app.models.pricing import PricingDetail, RateCardVersion
+from app.models.staffing import Staffing
+from app.rate_card import RateCard
+from app.schemas.pricing import PricingDetailUpdate
+
+Role = namedtuple("Role", "staffing_id country role band pricing_id cost sale_price")
+
+LARGEST_RATE = 999_999_999_999  # cents, the DECIMAL(12, 2) maximum
+
+
+def random_rate(rng: random.Random, largest: int) -> Optional[Decimal]:
+    return None if rng.random() < 0.1 else Decimal(rng.randint(0, largest)).scaleb(-2)
+
+
+def random_card(rng: random.Random, roles: int, largest: int = LARGEST_RATE) -> List[Role]:
+    """roles rows shaped like the rate card query; about one in ten unpriced"""
+    card = []
+    for band in range(roles):
+        priced = rng.random() >= 0.1
+        card.append(Role(
+            uuid.uuid4(), "test-country", "Tester", band, uuid.uuid4() if priced else None,
+            random_rate(rng, largest) if priced else None, random_rate(rng, largest) if priced else None
+        ))
+    return card
+
+
+def random_cells(rng: random.Random, card: List[Role], rows: int, cells: int) -> tuple:
+    """(row, staffing_id, hours) columns of random cells, some of them repeating a (row, role)"""
+    picked = [(rng.randrange(rows), rng.choice(card).staffing_id) for _ in range(cells)]
+    hours = [rng.choice((0, 1, 4, 8, 16, 40, rng.randint(1, 2000))) for _ in picked]
+    return [row for row, _ in picked], [staffing_id for _, staffing_id in picked], hours
+
+
+def decimal_line_items(card: List[Role], rows, staffing_ids, hours) -> dict:
+    """Reference: {(row, staffing_id): [hours, cost, sale price]}, summing hours x rate in Decimal"""
+    rates = {role.staffing_id: role for role in card}
+    items = {}
+    for row, staffing_id, role_hours in zip(rows, staffing_ids, hours):
+        role = rates[staffing_id]
+        item = items.setdefault((row, staffing_id), [0, Decimal(0), Decimal(0)])
+        item[0] += role_hours
+        item[1] += role_hours * (role.cost or 0)
+        item[2] += role_hours * (role.sale_price or 0)
+    return items
+
+
+@pytest.fixture
+def rng():
+    return random.Random(25)
+
+
+class TestKernel:
+    """RateCard against the Decimal reference"""
+
+    def test_line_items_match_decimal(self, rng):
+        for _ in range(300):
+            card = random_card(rng, rng.randint(1, 40))
+            rows = rng.randint(1, 30)
+            columns = random_cells(rng, card, rows, rng.randint(0, 120))
+            kernel = RateCard(card)
+
+            row, position, hours, cost, sale_price = kernel.line_items(kernel.staffed(*columns, rows))
+            got = {
+                (r, card[p].staffing_id): [h, Decimal(c), Decimal(s)]
+                for r, p, h, c, s in zip(row.tolist(), position.tolist(), hours.tolist(), cost.tolist(), sale_price.tolist())
+            }
+            expected = {key: [h, c * 100, s * 100] for key, (h, c, s) in decimal_line_items(card, *columns).items()}
+            assert got == expected
+            # By row, then in card order
+            assert list(zip(row.tolist(), position.tolist())) == sorted(zip(row.tolist(), position.tolist()))
+
+    def test_totals_match_decimal(self, rng):
+        for _ in range(300):
+            card = random_card(rng, rng.randint(1, 40))
+            rows = rng.randint(1, 30)
+            columns = random_cells(rng, card, rows, rng.randint(0, 120))
+            kernel = RateCard(card)
+
+            total_hours, cost, sale_price = kernel.totals(kernel.staffed(*columns, rows))
+            expected = [[0, Decimal(0), Decimal(0)] for _ in range(rows)]
+            for (row, _), (h, c, s) in decimal_line_items(card, *columns).items():
+                expected[row] = [expected[row][0] + h, expected[row][1] + c, expected[row][2] + s]
+            got = list(zip(total_hours.tolist(), cost.tolist(), sale_price.tolist()))
+            assert [(h, c * 100, s * 100) for h, c, s in expected] == [(h, Decimal(c), Decimal(s)) for h, c, s in got]
+            # Currency amounts as the API returns them
+            assert [(float(c), float(s)) for _, c, s in expected] == [(int(c) / 100, int(s) / 100) for _, c, s in got]
+
+    def test_dicts_price_like_columns(self, rng):
+        card = random_card(rng, 20)
+        kernel = RateCard(card)
+        selected = [{role.staffing_id: rng.randint(0, 100) for role in rng.sample(card, 5)} for _ in range(10)]
+        columns = (
+            [row for row, hours_by_role in enumerate(selected) for _ in hours_by_role],
+            [staffing_id for hours_by_role in selected for staffing_id in hours_by_role],
+            [hours for hours_by_role in selected for hours in hours_by_role.values()],
+        )
+        from_dicts = kernel.totals(kernel.staffed_from_dicts(selected))
+        from_columns = kernel.totals(kernel.staffed(*columns, len(selected)))
+        assert [total.tolist() for total in from_dicts] == [total.tolist() for total in from_columns]
+
+    def test_totals_past_int64_stay_exact(self):
+        kernel = RateCard([Role(1, "", "", 0, 1, Decimal("9999999999.99"), None)])
+        _, cost, sale_price = kernel.totals(kernel.staffed([0, 0], [1, 1], [10 ** 7, 10 ** 7], 1))
+        assert cost.tolist() == [2 * 10 ** 7 * 999_999_999_999]
+        assert sale_price.tolist() == [0]
+
+    def test_nothing_staffed(self):
+        kernel = RateCard(random_card(random.Random(0), 3))
+        assert [total.tolist() for total in kernel.totals(kernel.staffed([], [], [], 2))] == [[0, 0]] * 3
+        assert [column.tolist() for column in kernel.line_items(kernel.staffed([], [], [], 2))] == [[]] * 5
+        empty = RateCard([])
+        assert [total.tolist() for total in empty.totals(empty.staffed([], [], [], 1))] == [[0]] * 3
+
+    def test_rejects_what_it_cannot_price(self):
+        role = Role(uuid.uuid4(), "", "", 0, uuid.uuid4(), Decimal("1.00"), None)
+        kernel = RateCard([role])
+        with pytest.raises(ValueError):
+            RateCard([role._replace(cost=Decimal("0.001"))])
+        with pytest.raises(ValueError):
+            kernel.staffed([0], [role.staffing_id], [-1], 1)
+        with pytest.raises(KeyError):
+            kernel.staffed([0], [uuid.uuid4()], [1], 1)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Staffing.__table__, PricingDetail.__table__, RateCardVersion.__table__])
+    session = sessionmaker(bind=engine)()
+    # SQLite has no triggers to bump the version; tests bump it themselves
+    session.add(RateCardVersion(id=1, version=0))
+    session.commit()
+    monkeypatch.setattr(crud_pricing, "_rate_card", (None, None))
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestGetRateCard:
+    """When get_rate_card reloads"""
+
+    @pytest.fixture
+    def role(self, db):
+        staffing = Staffing(staffing_id=uuid.uuid4(), country="test-country", role="Tester", band=7)
+        pricing = PricingDetail(pricing_id=uuid.uuid4(), staffing_id=staffing.staffing_id, cost=10, sale_price=20)
+        db.add_all([staffing, pricing])
+        db.commit()
+        return staffing, pricing
+
+    def sale_price(self, db, staffing_id) -> int:
+        card = crud_pricing.get_rate_card(db)
+        return int(card.sale_price[card.index[staffing_id]])
+
+    def test_reused_until_the_version_changes(self, db, role):
+        staffing, pricing = role
+        assert self.sale_price(db, staffing.staffing_id) == 2000
+        pricing.sale_price = Decimal("99.90")
+        db.commit()
+        assert self.sale_price(db, staffing.staffing_id) == 2000
+        # What the triggers do on Postgres, whichever worker wrote the price
+        db.query(RateCardVersion).update({RateCardVersion.version: RateCardVersion.version + 1})
+        db.commit()
+        assert self.sale_price(db, staffing.staffing_id) == 9990
+
+    def test_reloaded_for_a_new_role(self, db, role):
+        crud_pricing.get_rate_card(db)
+        added = Staffing(staffing_id=uuid.uuid4(), country="test-country", role="Tester", band=8)
+        db.add(added)
+        db.commit()
+        assert added.staffing_id in crud_pricing.get_rate_card(db, [added.staffing_id])
+
+    def test_roles_in_breakdown_order(self, db, role):
+        for country, band in (("b-country", 1), ("a-country", 9), ("a-country", 2)):
+            db.add(Staffing(staffing_id=uuid.uuid4(), country=country, role="Tester", band=band))
+        db.commit()
+        roles = crud_pricing.get_rate_card(db).roles
+        assert [(r.country, r.band) for r in roles] == sorted((r.country, r.band) for r in roles)
+
+
+class TestRateCardVersion:
+    """The rate_card_version triggers, against DATABASE_URL migrated to head"""
+
+    def test_another_workers_write_is_picked_up(self, postgres, monkeypatch):
+        monkeypatch.setattr(crud_pricing, "_rate_card", (None, None))
+        worker, other_worker = SessionLocal(), SessionLocal()
+        staffing = Staffing(staffing_id=uuid.uuid4(), country="test-rate-card", role="Tester", band=7)
+        pricing = PricingDetail(pricing_id=uuid.uuid4(), staffing_id=staffing.staffing_id, cost=10, sale_price=20)
+        try:
+            other_worker.add(staffing)
+            other_worker.flush()
+            other_worker.add(pricing)
+            other_worker.commit()
+            card = crud_pricing.get_rate_card(worker)
+            assert int(card.sale_price[card.index[staffing.staffing_id]]) == 2000
+            worker.commit()
+
+            crud_pricing.update_pricing(other_worker, pricing.pricing_id, PricingDetailUpdate(sale_price=Decimal("99.90")))
+            card = crud_pricing.get_rate_card(worker)
+            assert int(card.sale_price[card.index[staffing.staffing_id]]) == 9990
+        finally:
+            worker.close()
+            other_worker.query(Staffing).filter(Staffing.country == "test-rate-card").delete()
+            other_worker.commit()
+            other_worker.close()
@@ -0,0 +1,109 @@
+"""
+get_read_session sends catalogue reads to the replica, except for callers
+inside their read-your-writes window, and to the primary when no replica is set.
+
+The primary and the replica are two in-memory SQLite databases, each holding
+a marker row naming it, so every response says which one served it.
+"""
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.middleware.sessions import SessionMiddleware
+
+from app import database
+from app.database import DBSession, get_read_session, get_session
+
+
+def _marker(session) -> str:
+    return session.execute(text("SELECT name FROM marker")).scalar_one()
+
+
+def _simulated_engine(name: str):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE marker (name TEXT)"))
+        connection.execute(text("INSERT INTO marker VALUES (:name)"), {"name": name})
+    return engine
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Point the primary and replica session factories at the simulated databases"""
+    primary, replica = _simulated_engine("primary"), _simulated_engine("replica")
+    factory = dict(autocommit=False, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=primary, **factory))
+    monkeypatch.setattr(database, "ReplicaSessionLocal", sessionmaker(bind=replica, **factory))
+    monkeypatch.setattr(database, "replica_engine", replica)
+    database._recent_writers.clear()
+    yield
+    database._recent_writers.clear()
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def client(engines):
+    app = FastAPI()
+
+    @app.get("/read")
+    async def read(db: DBSession = Depends(get_read_session)):
+        return {"served_by": await db.run(_marker)}
+
+    @app.post("/write")
+    async def write(db: DBSession = Depends(get_session)):
+        return {"served_by": await db.run(_marker)}
+
+    @app.post("/login")
+    async def login(request: Request):
+        request.session["user"] = {"email": "jane@example.com"}
+        return {}
+
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    return TestClient(app)
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestReadRouting:
+    """Which database serves a read"""
+
+    def test_reads_go_to_the_replica(self, client):
+        assert client.get("/read", headers=bearer("reader")).json() == {"served_by": "replica"}
+        assert client.get("/read").json() == {"served_by": "replica"}
+
+    def test_writes_go_to_the_primary(self, client):
+        assert client.post("/write", headers=bearer("writer")).json() == {"served_by": "primary"}
+
+    def test_reads_after_a_write_go_to_the_primary(self, client):
+        client.post("/write", headers=bearer("writer"))
+        assert client.get("/read", headers=bearer("writer")).json() == {"served_by": "primary"}
+        # The window belongs to the caller that wrote
+        assert client.get("/read", headers=bearer("reader")).json() == {"served_by": "replica"}
+
+    def test_session_users_read_their_writes(self, client):
+        client.post("/login")
+        assert client.get("/read").json() == {"served_by": "replica"}
+        client.post("/write")
+        assert client.get("/read").json() == {"served_by": "primary"}
+
+    def test_reads_return_to_the_replica_after_the_window(self, client, monkeypatch):
+        monkeypatch.setattr(database, "DB_READ_YOUR_WRITES_SECONDS", 0.05)
+        client.post("/write", headers=bearer("writer"))
+        assert client.get("/read", headers=bearer("writer")).json() == {"served_by": "primary"}
+        time.sleep(0.1)
+        assert client.get("/read", headers=bearer("writer")).json() == {"served_by": "replica"}
+
+    def test_reads_fall_back_to_the_primary_without_a_replica(self, client, monkeypatch):
+        monkeypatch.setattr(database, "replica_engine", None)
+        monkeypatch.setattr(database, "ReplicaSessionLocal", None)
+        assert client.get("/read", headers=bearer("reader")).json() == {"served_by": "primary"}
+        assert client.get("/read").json() == {"served_by": "primary"}
@@ -0,0 +1,55 @@
+"""
+The offering totals cache never serves totals a committed write has changed:
+after each kind of CRUD write (offering and WBS links, staffing hours,
+pricing), every offering's cached totals equal a fresh get_offering_totals,
+and still do after writers and readers have run at once. See
+benchmarks/rollup_cache.py for the full-size run.
+
+Runs against DATABASE_URL migrated to head and is skipped without a database.
+"""
+import random
+
+import pytest
+
+from app.crud.rollups import offering_totals
+from benchmarks import rollup_cache
+
+WRITES = 12
+
+
+@pytest.fixture
+def catalogue(postgres):
+    """Offerings sharing activities, WBS items and roles, with their totals cached; removed afterwards"""
+    offering_totals.clear()
+    catalogue = rollup_cache.setup(random.Random(0))
+    try:
+        assert rollup_cache.mismatches(catalogue) == []
+        yield catalogue
+    finally:
+        rollup_cache.cleanup()
+        offering_totals.clear()
+
+
+def operations(catalogue):
+    return {operation.__name__: operation for operation in rollup_cache.writes(catalogue)}
+
+
+class TestRollupCacheInvalidation:
+    """Cached totals against fresh ones after writes"""
+
+    @pytest.mark.parametrize("name", list(operations(rollup_cache.Catalogue([], [], [], []))))
+    def test_each_write(self, catalogue, name):
+        before = offering_totals.stats()
+        failures = rollup_cache.sequential(catalogue, [operations(catalogue)[name]], random.Random(name), WRITES)
+        after = offering_totals.stats()
+        assert failures == []
+        # The writes changed totals the cache held
+        assert after["invalidations"] > before["invalidations"]
+
+    def test_concurrent_writers_and_readers(self, catalogue):
+        reads = rollup_cache.concurrent(
+            catalogue, list(operations(catalogue).values()), seconds=1, readers=2, writers=2,
+            write_interval=0.01, seed=0
+        )
+        assert reads > 0
+        assert rollup_cache.mismatches(catalogue) == []
@@ -0,0 +1,147 @@
+"""
+POST /solutions/price agrees with pricing the same selection row by row in
+Decimal, for every activity and for the combined totals, including totals
+past the int64 range the RateCard kernel otherwise sums in. A pricing write
+retires the memoized price and an unknown activity is a 404. See
+benchmarks/solution_price.py for the full-size run with latencies.
+
+Runs the API in-process against DATABASE_URL migrated to head, with both the
+psycopg2 and the asyncpg session, and is skipped without a database.
+"""
+import asyncio
+import random
+import uuid
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.crud import pricing as crud_pricing
+from app.crud.rollups import solution_prices
+from app.database import SessionLocal, dispose_async_engine, get_primary_read_session
+from app.main import app
+from app.models import PricingDetail, Staffing
+from app.schemas.pricing import SolutionPriceRequest
+from benchmarks import solution_price, upsert_stress
+from benchmarks.db_concurrency import seed
+
+ACTIVITIES = 40
+
+sessions = pytest.mark.parametrize("mode", list(upsert_stress.SESSIONS))
+
+
+@pytest.fixture
+def pool(postgres):
+    """(activity ids, staffing ids) of staffed activities to select from, removed afterwards"""
+    seed()
+    solution_prices.clear()
+    try:
+        yield solution_price.build(ACTIVITIES)
+    finally:
+        solution_price.cleanup()
+        solution_prices.clear()
+
+
+@pytest.fixture
+def api():
+    upsert_stress.use_admin(app)
+    yield app
+    app.dependency_overrides.clear()
+
+
+def run(api, mode: str, requests):
+    """requests(price) under the given session type, on a loop of its own; price(body) returns the response"""
+    api.dependency_overrides[get_primary_read_session] = upsert_stress.SESSIONS[mode]
+
+    async def main():
+        transport = httpx.ASGITransport(app=api, raise_app_exceptions=False)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=60) as client:
+                return await requests(lambda body: client.post("/api/v1/solutions/price", json=body))
+        finally:
+            # asyncpg connections belong to this loop
+            await dispose_async_engine()
+
+    return asyncio.run(main())
+
+
+def reference(body):
+    db = SessionLocal()
+    try:
+        return solution_price.reference(db, body)
+    finally:
+        db.close()
+
+
+def priced_role(rate: Decimal) -> str:
+    """A staffing role costing and selling at rate per hour; removed with the pool"""
+    db = SessionLocal()
+    try:
+        role = Staffing(staffing_id=uuid.uuid4(), country="solution-country", role="Priced", band=2)
+        db.add(role)
+        db.flush()
+        db.add(PricingDetail(pricing_id=uuid.uuid4(), staffing_id=role.staffing_id, cost=rate, sale_price=rate))
+        db.commit()
+        return str(role.staffing_id)
+    finally:
+        db.close()
+
+
+async def price_all(price, bodies):
+    results = []
+    for body in bodies:
+        response = await price(body)
+        assert response.status_code == 200
+        results.append(solution_price.totals_of(response.json()))
+    return results
+
+
+class TestSolutionPrice:
+    """The endpoint against the per-row Decimal reference"""
+
+    @sessions
+    def test_matches_the_reference(self, api, pool, mode):
+        activities, roles = pool
+        rng = random.Random(24)
+        bodies = [solution_price.selection(rng, activities, roles, size) for size in (1, 10, ACTIVITIES)]
+        assert run(api, mode, lambda price: price_all(price, bodies)) == [reference(body) for body in bodies]
+
+    @sessions
+    def test_totals_past_int64_match_the_reference(self, api, pool, mode):
+        activities, _ = pool
+        role = priced_role(Decimal("9999999999.99"))   # the DECIMAL(12, 2) maximum
+        # 10 ** 7 hours at the largest rate passes int64 in cents for each activity
+        body = {"activities": [{"activity_id": a, "hours": {role: 10 ** 7}} for a in activities[:2]]}
+        assert run(api, mode, lambda price: price_all(price, [body])) == [reference(body)]
+
+    @sessions
+    def test_pricing_write_retires_the_memoized_price(self, api, pool, mode):
+        activities, roles = pool
+        body = solution_price.selection(random.Random(24), activities, roles, 5)
+        body["activities"][0]["hours"] = {roles[0]: 10}
+
+        def priced_now():
+            db = SessionLocal()
+            try:
+                return crud_pricing.get_solution_price(db, SolutionPriceRequest(**body))
+            finally:
+                db.close()
+
+        async def requests(price):
+            before = (await price(body)).json()
+            solution_price.reprice(roles[0], Decimal(1))
+            try:
+                return before, (await price(body)).json(), priced_now()
+            finally:
+                solution_price.reprice(roles[0], Decimal(-1))
+
+        before, after, fresh = run(api, mode, requests)
+        assert after != before
+        assert solution_price.totals_of(after) == solution_price.totals_of(fresh)
+
+    @sessions
+    def test_unknown_activity_is_not_found(self, api, pool, mode):
+        async def requests(price):
+            return (await price({"activities": [{"activity_id": str(uuid.uuid4())}]})).status_code
+
+        assert run(api, mode, requests) == 404
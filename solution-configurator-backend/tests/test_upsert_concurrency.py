@@ -0,0 +1,89 @@
+"""
+The create-or-conflict write paths hold up under identical concurrent requests:
+each leaves exactly one row and answers every request with success or its
+conflict response, never a 5xx. A link or assignment to a parent that does not
+exist is a 404. See benchmarks/upsert_stress.py for the full-size run.
+
+Runs the API in-process against DATABASE_URL migrated to head, with both the
+psycopg2 and the asyncpg session, and is skipped without a database.
+"""
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from app.database import dispose_async_engine
+from app.main import app
+from benchmarks import upsert_stress
+
+REQUESTS = 20
+
+sessions = pytest.mark.parametrize("mode", list(upsert_stress.SESSIONS))
+
+
+@pytest.fixture
+def catalogue(postgres):
+    """(brand_id, offering_id, activity_id, wbs_id) of a catalogue to write to, removed afterwards"""
+    ids = upsert_stress.setup()
+    yield ids
+    upsert_stress.cleanup(ids[0])
+
+
+@pytest.fixture
+def api():
+    upsert_stress.use_admin(app)
+    yield app
+    app.dependency_overrides.clear()
+
+
+def run(api, mode: str, requests):
+    """requests(client) under the given session type, on a loop of its own"""
+    upsert_stress.use_session(api, upsert_stress.SESSIONS[mode])
+
+    async def main():
+        # Report handler errors as 500 responses instead of raising
+        transport = httpx.ASGITransport(app=api, raise_app_exceptions=False)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=60) as client:
+                return await requests(client)
+        finally:
+            # asyncpg connections belong to this loop
+            await dispose_async_engine()
+
+    return asyncio.run(main())
+
+
+class TestConcurrentUpserts:
+    """Identical requests sent at once to each write path"""
+
+    @sessions
+    def test_one_row_per_path(self, api, catalogue, mode):
+        _, offering_id, activity_id, wbs_id = catalogue
+        results = run(api, mode, lambda client: upsert_stress.round_(
+            client, REQUESTS, 1, offering_id, activity_id, wbs_id
+        ))
+        failed = {name: (dict(statuses), rows) for name, (statuses, rows, passed) in results.items() if not passed}
+        assert failed == {}
+
+    @sessions
+    def test_missing_parent_is_not_found(self, api, catalogue, mode):
+        _, _, activity_id, wbs_id = catalogue
+
+        async def requests(client):
+            staffing = await client.post(
+                "/api/v1/staffing", json={"country": upsert_stress.COUNTRY, "role": "Stress", "band": 1}
+            )
+            staffing_id = staffing.json()["staffing_id"]
+            return [
+                await client.post(
+                    "/api/v1/wbs-staffing/", params={"wbs_id": str(uuid.uuid4()), "staffing_id": staffing_id, "hours": 8}
+                ),
+                await client.post(
+                    "/api/v1/wbs-staffing/", params={"wbs_id": str(wbs_id), "staffing_id": str(uuid.uuid4()), "hours": 8}
+                ),
+                await client.post(f"/api/v1/wbs/activity/{uuid.uuid4()}/wbs/{wbs_id}"),
+                await client.post(f"/api/v1/wbs/activity/{activity_id}/wbs/{uuid.uuid4()}"),
+            ]
+
+        assert [response.status_code for response in run(api, mode, requests)] == [404] * 4